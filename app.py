@@ -1,42 +1,20 @@
 import pandas as pd
 import streamlit as st 
 from dotenv import load_dotenv
-from src.cloud_io import MongoIO
-from src.constants import SESSION_PRODUCT_KEY
-from src.scrapper.scrape import ScrapeReviews
+from src.cloud_io import get_mongo_io
+from src.constants import SESSION_PRODUCT_KEY, MAX_SCRAPE_WORKERS, FETCH_ENGINES
+from src.telemetry import get_metrics, start_metrics_server
 
 # Load environment variables from .env file
 load_dotenv()
+# Prometheus metrics of the app process when METRICS_PORT is set
+start_metrics_server()
 
-# Initialize MongoDB connection with error handling
-try:
-    mongo_con = MongoIO()
-    if hasattr(mongo_con, 'offline_mode') and mongo_con.offline_mode:
-        st.warning("⚠️ Running in offline mode. Data will be saved locally but not to MongoDB.")
-        st.info("You can still scrape reviews, but they will only be stored locally.")
-except Exception as e:
-    st.error(f"MongoDB Connection Error: {e}")
-    st.info("The application will continue in offline mode with limited functionality.")
-    # Create a dummy MongoIO instance for offline mode
-    class DummyMongoIO:
-        def __init__(self):
-            self.offline_mode = True
-            
-        def store_reviews(self, product_name, reviews):
-            # Save to local CSV file as fallback
-            try:
-                import os
-                backup_dir = os.path.join(os.getcwd(), "data_backup")
-                os.makedirs(backup_dir, exist_ok=True)
-                backup_file = os.path.join(backup_dir, f"{product_name}.csv")
-                reviews.to_csv(backup_file, index=False)
-                st.success(f"Reviews saved locally to {backup_file}")
-                return True
-            except Exception as local_e:
-                st.error(f"Error saving reviews locally: {local_e}")
-                return False
-    
-    mongo_con = DummyMongoIO()
+# The MongoDB client connects lazily, offline everything goes to the local store
+mongo_con = get_mongo_io()
+if not mongo_con.is_online():
+    st.warning("⚠️ Running in offline mode. Data will be saved locally but not to MongoDB.")
+    st.info("You can still scrape reviews, but they will only be stored locally.")
 
 st.set_page_config(
     "myntra-review-scrapper"
@@ -52,47 +30,150 @@ if "data" not in st.session_state:
 
 
 
+def stage_table(activity: dict) -> pd.DataFrame:
+    """Time spent per scrape stage, from MetricsRegistry.since."""
+    rows = [(stage, totals["count"], totals["seconds"], totals["seconds"] / totals["count"])
+            for stage, totals in activity["stages"].items()]
+    table = pd.DataFrame(rows, columns=["Stage", "Calls", "Seconds", "Seconds per call"])
+    return table.sort_values("Seconds", ascending=False).reset_index(drop=True)
+
+
 def form_input():
     product = st.text_input("Search Products")
     # Only set the product name in session state if it's not empty
     if product and product.strip():
         st.session_state[SESSION_PRODUCT_KEY] = product
+        # One catalog lookup, shows whether the product was scraped before
+        entry = mongo_con.get_catalog_entry(product)
+        if entry:
+            rating = f", rated {entry['avg_rating']:.1f} on average" if entry["avg_rating"] is not None else ""
+            st.caption(f"{entry['review_count']} reviews stored, last scraped "
+                       f"{entry['last_scraped']:%d %b %Y %H:%M} UTC{rating}")
     
     no_of_products = st.number_input("No of products to search",
                                      step=1,
                                      min_value=1)
 
+    max_workers = st.number_input("Parallel browser workers",
+                                  step=1,
+                                  min_value=1,
+                                  max_value=MAX_SCRAPE_WORKERS)
+
+    fetch_engine = st.selectbox("Page loading", FETCH_ENGINES,
+                                help="'auto' uses plain HTTP requests when a page does not "
+                                     "need JavaScript and falls back to the browser otherwise")
+
+    use_cache = st.checkbox("Use cached pages", value=True,
+                            help="Reuse pages fetched recently instead of downloading them again")
+
+    incremental = st.checkbox("Only fetch new reviews", value=False,
+                              help="Stop at reviews stored by a previous scrape of this product "
+                                   "and only store the new ones")
+
+    background = st.checkbox("Run in the background", value=True,
+                             help="Queue the scrape for the worker processes and follow it on the "
+                                  "scrape jobs page, it carries on if this tab is closed")
+
     if st.button("Scrape Reviews"):
         # Validate product name before proceeding
         if not product or not product.strip():
             st.error("Please enter a product name before scraping reviews.")
             return None
+
+        if background:
+            from src.jobs import get_job_queue, get_job_scheduler
+
+            job_id = get_job_queue().submit(product, int(no_of_products),
+                                            max_workers=int(max_workers),
+                                            fetch_engine=fetch_engine,
+                                            use_cache=use_cache,
+                                            incremental=incremental)
+            if get_job_scheduler() is None:
+                st.info("No scrape workers run in the app, start them with `python -m src.jobs`")
+            st.session_state["data"] = True
+            st.success(f"Queued scrape job {job_id} for '{product}'. "
+                       "Follow it on the scrape jobs page.")
+            return None
+
+        # Loaded on the first scrape, not on every app start
+        from src.scrapper.scrape import ScrapeReviews
+
+        known_review_keys = None
+        if incremental:
+            try:
+                known_review_keys = get_mongo_io().get_known_review_keys(product)
+                st.info(f"{len(known_review_keys)} reviews already stored for '{product}'")
+            except Exception as db_error:
+                st.warning(f"Could not load the stored reviews, scraping everything: {db_error}")
             
         scrapper = ScrapeReviews(
             product_name=product,
-            no_of_products=int(no_of_products)
+            no_of_products=int(no_of_products),
+            max_workers=int(max_workers),
+            fetch_engine=fetch_engine,
+            use_cache=use_cache,
+            known_review_keys=known_review_keys
         )
 
         try:
-            # First try to  scrape the data
-            scrapped_data = scrapper.get_review_data()
-            if scrapped_data is not None and not scrapped_data.empty:
+            # Show and store each product's reviews as soon as it is scraped,
+            # so results appear early and a failed scrape keeps what it has
+            progress = st.empty()
+            # Where the scrape spends its time, counted since it started.
+            # Scrapes of other sessions running meanwhile are included
+            metrics = get_metrics()
+            started = metrics.snapshot()
+            stages = st.expander("Scrape stages", expanded=True).empty()
+            table = st.empty()
+            batches = []
+            stored = True
+            mongoio = None
+
+            for batch in scrapper.iter_review_data():
+                if batch.empty:
+                    continue
+                batches.append(batch)
                 st.session_state["data"] = True
-                
-                # Display the scraped data first, so user has access to it even if DB fails
-                st.success(f"Successfully scraped {len(scrapped_data)} reviews for '{product}'")
-                st.dataframe(scrapped_data)
-                
-                # Then try to store in MongoDB with separate error handling
+
+                scrapped_data = pd.concat(batches, axis=0)
+                progress.info(f"Scraped {len(batches)} of {int(no_of_products)} products "
+                              f"({len(scrapped_data)} reviews so far)...")
+                table.dataframe(scrapped_data)
+
+                # Store each batch with separate error handling
                 try:
-                    mongoio = MongoIO()
-                    mongoio.store_reviews(product_name=product, reviews=scrapped_data)
-                    st.success("✅ Reviews successfully stored in the database")
+                    if mongoio is None:
+                        mongoio = get_mongo_io()
+                    # Written to MongoDB in the background, scraping goes on meanwhile
+                    mongoio.store_reviews(product_name=product, reviews=batch,
+                                          append=len(batches) > 1,
+                                          incremental=incremental,
+                                          write_behind=True)
                 except Exception as db_error:
+                    stored = False
                     st.warning("⚠️ Reviews were scraped successfully but could not be stored in the database")
                     st.error(f"Database error: {str(db_error)}")
+
+                activity = metrics.since(started)
+                counters = activity["counters"]
+                with stages.container():
+                    st.caption(f"{counters.get('pages_total', 0):.0f} pages, "
+                               f"{counters.get('page_bytes_total', 0) / 2 ** 20:.1f} MB loaded")
+                    st.dataframe(stage_table(activity), hide_index=True)
+
+            progress.empty()
+            if batches:
+                st.success(f"Successfully scraped {len(scrapped_data)} reviews for '{product}'")
+                if stored:
+                    st.success("✅ Reviews successfully stored in the database")
+                    pending_entries, pending_reviews = mongoio.pending_sync()
+                    if pending_reviews:
+                        st.info(f"{pending_reviews} reviews are being written to MongoDB in the background")
+                else:
                     st.info("💡 You can still view the scraped data above, but it won't be available for analysis later.\n" +
                            "Please check your internet connection and try again.")
+            elif known_review_keys:
+                st.info(f"No new reviews for '{product}' since the last scrape.")
             else:
                 st.warning(f"No reviews found for '{product}'. Try another product.")
         except Exception as e:
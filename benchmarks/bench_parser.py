@@ -0,0 +1,95 @@
+"""
+Micro-benchmark of the review page parser.
+
+    python -m benchmarks.bench_parser --reviews 100 1000 5000
+    python -m benchmarks.bench_parser --pages saved/*.html
+
+Review pages are rendered from the sample data unless saved pages are given.
+The original findAll-and-align implementation is timed alongside the
+ReviewPageParser backends for comparison.
+"""
+import argparse
+import glob
+import statistics
+import time
+
+import pandas as pd
+from bs4 import BeautifulSoup as bs
+
+from benchmarks.fixture_site import load_fixture_products, render_review_page
+from src.scrapper.parser import ReviewPageParser, PARSER_BACKENDS
+
+
+def legacy_parse(page: str) -> list:
+    """The pre-ReviewPageParser implementation of ScrapeReviews.extract_products."""
+    review_html = bs(page, "html.parser")
+    review = review_html.find_all("div", {"class": "detailed-reviews-userReviewsContainer"})
+    user_rating, user_comment, user_name = [], [], []
+    for i in review:
+        user_rating.extend(i.find_all("div", {"class": "user-review-main user-review-showRating"}))
+        user_comment.extend(i.find_all("div", {"class": "user-review-reviewTextWrapper"}))
+        user_name.extend(i.find_all("div", {"class": "user-review-left"}))
+
+    reviews = []
+    for i in range(min(len(user_rating), len(user_comment), len(user_name))):
+        spans = user_name[i].find_all("span")
+        reviews.append({
+            "Date": spans[1].text if len(spans) > 1 else "No Date given",
+            "Rating": user_rating[i].find("span", class_="user-review-starRating").get_text().strip(),
+            "Name": user_name[i].find("span").text,
+            "Comment": user_comment[i].text,
+        })
+    return reviews
+
+
+def fixture_page(no_of_reviews: int) -> str:
+    product = load_fixture_products(1)[0]
+    reviews = product["reviews"]
+    repeats = -(-no_of_reviews // len(reviews))
+    product["reviews"] = pd.concat([reviews] * repeats, ignore_index=True).head(no_of_reviews)
+    return render_review_page(product)
+
+
+def time_parser(parse, page: str, repeat: int) -> tuple:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        reviews = parse(page)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), len(reviews)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reviews", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--pages", nargs="*", help="Saved review page HTML files")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = {}
+        for pattern in args.pages:
+            for path in glob.glob(pattern):
+                with open(path, encoding="utf-8") as f:
+                    pages[path] = f.read()
+    else:
+        pages = {f"fixture-{n}": fixture_page(n) for n in args.reviews}
+
+    parsers = {"legacy": legacy_parse}
+    for backend in PARSER_BACKENDS:
+        try:
+            parsers[backend] = ReviewPageParser(backend=backend).parse
+        except ValueError as e:
+            print(f"Skipping {backend}: {e}")
+
+    for name, page in pages.items():
+        baseline = None
+        for parser_name, parse in parsers.items():
+            elapsed, count = time_parser(parse, page, args.repeat)
+            baseline = baseline or elapsed
+            print(f"{name:<24} {parser_name:<12} reviews={count:<6} "
+                  f"median={elapsed * 1000:8.2f}ms speedup={baseline / elapsed:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
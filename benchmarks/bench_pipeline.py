@@ -0,0 +1,175 @@
+"""
+Offline benchmark of the scrape -> store -> dashboard pipeline.
+
+    python -m benchmarks.bench_pipeline --save-baseline
+    python -m benchmarks.bench_pipeline --sizes 1000 10000 100000 1000000
+
+Nothing leaves the machine: the scrape replays the recorded pages of
+``benchmarks/fixtures`` from a local FixtureSite, MongoDB is replaced by
+mongomock (the mongo stages are skipped when it is not installed) and the
+larger stages run on synthetic reviews scaled from the sample data. Each
+stage reports its latency percentiles, throughput and peak memory, and the
+run exits with status 1 when a stage regressed against the baseline, and
+with status 2 when there is no baseline to compare against.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+from benchmarks.datasets import scaled_sizes, synthetic_reviews
+from benchmarks.fixture_site import RECORDED_FIXTURES_DIR, FixtureSite, load_pages
+from benchmarks.harness import (DEFAULT_BASELINE_PATH, DEFAULT_TOLERANCE, compare, load_baseline,
+                                measure, save_baseline)
+from src.data_report.generate_data_report import DashboardGenerator
+from src.data_report.summary import summaries_from_frame
+from src.review_schema import add_review_keys, normalize_reviews
+from src.scrapper.parser import ReviewPageParser
+from src.scrapper.scrape import ScrapeReviews
+from src.storage.parquet import ParquetReviewStore
+
+DEFAULT_SIZES = scaled_sizes(1000, 100_000)
+# mongomock keeps documents as Python dicts, larger sizes mostly measure that
+DEFAULT_MONGO_MAX_ROWS = 10_000
+COLLECTION = "benchmark_reviews"
+
+
+def fixture_stages(repeat: int, fixtures_dir: str) -> list:
+    """Parsing and scraping of the recorded pages."""
+    pages, _ = load_pages(fixtures_dir)
+    review_pages = [page for path, page in pages.items() if path.startswith("/reviews/")]
+    parser = ReviewPageParser()
+
+    def parse():
+        return sum(len(parser.parse(page)) for page in review_pages)
+
+    results = [measure("parse", len(review_pages), parse, repeat=repeat)]
+
+    with FixtureSite(pages_dir=fixtures_dir) as site:
+        no_of_products = len(review_pages)
+
+        def scrape():
+            scrapper = ScrapeReviews(product_name="fixture product", no_of_products=no_of_products,
+                                     base_url=site.base_url, fetch_engine="http", use_cache=False)
+            with contextlib.redirect_stdout(io.StringIO()):
+                return len(scrapper.get_review_data())
+
+        results.append(measure("scrape", no_of_products, scrape, repeat=repeat))
+    return results
+
+
+def mongo_database():
+    """A mongo_operation backed by mongomock, None when it is not installed."""
+    try:
+        import mongomock
+    except ImportError:
+        return None
+    from src.database_connect import MongoConnectionManager, mongo_operation
+
+    url = "mongodb://benchmark.invalid"
+    MongoConnectionManager.get(url)._client = mongomock.MongoClient()
+    return mongo_operation(url, "benchmark")
+
+
+def dataset_stages(size: int, repeat: int, root: str, mongo_max_rows: int) -> list:
+    """Normalizing, storing, loading and summarizing ``size`` reviews."""
+    raw = synthetic_reviews(size)
+    reviews = normalize_reviews(add_review_keys(raw))
+    store = ParquetReviewStore(root=os.path.join(root, f"store-{size}"))
+
+    def load_local():
+        return len(pd.concat(store.iter_reviews(COLLECTION), ignore_index=True))
+
+    results = [
+        measure("normalize", size, lambda: len(normalize_reviews(add_review_keys(raw))), repeat=repeat),
+        measure("store_local", size, lambda: store.write(COLLECTION, reviews), repeat=repeat),
+        measure("load_local", size, load_local, repeat=repeat),
+    ]
+    store.close()
+
+    mongo = mongo_database() if size <= mongo_max_rows else None
+    if mongo is not None:
+        def mongo_write(_):
+            # Plain inserts, mongomock scans the collection for every upsert
+            # and would make the stage quadratic
+            with contextlib.redirect_stdout(io.StringIO()):
+                return mongo.bulk_insert(reviews, COLLECTION).written
+
+        def mongo_read():
+            return sum(len(batch) for batch in mongo.iter_batches(COLLECTION))
+
+        # Each write starts from an empty collection, as a first scrape does
+        results.append(measure("mongo_write", size, mongo_write, repeat=repeat,
+                               setup=lambda: mongo.db.drop_collection(COLLECTION)))
+        results.append(measure("mongo_read", size, mongo_read, repeat=repeat))
+        mongo.db.drop_collection(COLLECTION)
+
+    summaries = summaries_from_frame(reviews)
+    results.append(measure("summaries", size, lambda: summaries_from_frame(reviews), repeat=repeat,
+                           items=size))
+    results.append(measure("dashboard", size,
+                           lambda: DashboardGenerator(reviews, summaries).figures(), repeat=repeat,
+                           items=size))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Synthetic dataset sizes, in reviews")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per stage")
+    parser.add_argument("--fixtures", default=RECORDED_FIXTURES_DIR, help="Recorded pages to scrape")
+    parser.add_argument("--mongo-max-rows", type=int, default=DEFAULT_MONGO_MAX_ROWS,
+                        help="Largest size the mongo stages run on")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store the results as the new baseline instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Relative slowdown or memory growth reported as a regression")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    fixtures_dir = os.path.abspath(args.fixtures)
+    results = []
+    # Stores write under the working directory, keep them out of the project
+    with tempfile.TemporaryDirectory() as root:
+        cwd = os.getcwd()
+        os.chdir(root)
+        try:
+            for result in fixture_stages(args.repeat, fixtures_dir):
+                print(result)
+                results.append(result)
+            for size in args.sizes:
+                for result in dataset_stages(size, args.repeat, root, args.mongo_max_rows):
+                    print(result)
+                    results.append(result)
+        finally:
+            os.chdir(cwd)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump([result.to_dict() for result in results], f, indent=2)
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        return
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        # A check without a baseline could never fail, it is not a pass either
+        print(f"No baseline at {args.baseline}, run with --save-baseline to record one")
+        sys.exit(2)
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    if regressions:
+        sys.exit(1)
+    print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Compare sequential and pooled scraping against the local fixture site.
+
+    python -m benchmarks.bench_scrape --products 8 --workers 1 4 --engines browser http
+
+The browser engine requires Chrome and a matching chromedriver on the PATH.
+"""
+import argparse
+import time
+
+from benchmarks.fixture_site import FixtureSite
+from src.constants import FETCH_ENGINES
+from src.scrapper.scrape import ScrapeReviews
+
+
+def run(no_of_products: int, max_workers: int, fetch_engine: str, base_url: str) -> tuple:
+    start = time.perf_counter()
+    scrapper = ScrapeReviews(product_name="fixture product",
+                             no_of_products=no_of_products,
+                             max_workers=max_workers,
+                             fetch_engine=fetch_engine,
+                             base_url=base_url)
+    data = scrapper.get_review_data()
+    return time.perf_counter() - start, len(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=8)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--engines", nargs="+", choices=FETCH_ENGINES, default=["browser"])
+    args = parser.parse_args()
+
+    with FixtureSite(no_of_products=args.products) as site:
+        for fetch_engine in args.engines:
+            for max_workers in args.workers:
+                elapsed, rows = run(args.products, max_workers, fetch_engine, site.base_url)
+                print(f"engine={fetch_engine:<8} workers={max_workers:<3} products={args.products:<4} "
+                      f"reviews={rows:<6} elapsed={elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
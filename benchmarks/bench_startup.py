@@ -0,0 +1,115 @@
+"""
+Cold start and rerun times of the Streamlit pages, checked against a budget.
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --pages app.py --repeat 10 --cold-budget 1.5
+
+Every repeat starts a fresh interpreter, as a new container does, and runs
+the page with Streamlit's AppTest: the first run pays for importing the app
+and creating its shared clients, the following runs are the reruns of every
+widget interaction. The runs are offline (MONGO_DB_URL is unset) in an empty
+working directory. The run exits with status 1 when a page is over budget or
+imports one of the modules that should only load on first use.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.harness import StageResult
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["app.py", "pages/generate_analysis.py", "pages/scrape_jobs.py"]
+# Loaded by the first scrape, dashboard or MongoDB operation, never at startup
+LAZY_MODULES = ("selenium", "bs4", "lxml", "flask", "pymongo")
+# Seconds of the first run and of a rerun, once the interpreter and Streamlit are up
+COLD_START_BUDGET = 2.0
+RERUN_BUDGET = 0.25
+
+
+def probe(page: str, reruns: int) -> dict:
+    """Run ``page`` once cold and ``reruns`` more times, in this process."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(ROOT, page), default_timeout=120)
+    started = time.perf_counter()
+    app.run()
+    cold = time.perf_counter() - started
+    loaded = sorted(module for module in LAZY_MODULES if module in sys.modules)
+
+    timings = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        app.run()
+        timings.append(time.perf_counter() - started)
+    return {"cold": cold, "reruns": timings, "lazy_loaded": loaded,
+            "exceptions": [str(exception.value) for exception in app.exception],
+            # Kilobytes on Linux
+            "max_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024}
+
+
+def run_fresh(page: str, reruns: int, workdir: str) -> dict:
+    """probe() in a new interpreter."""
+    env = {name: value for name, value in os.environ.items()
+           if name not in ("MONGO_DB_URL", "METRICS_PORT")}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--probe", page, "--reruns", str(reruns)],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True).stdout
+    # The page prints while it runs, the result is the last line
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", nargs="+", default=PAGES)
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per page")
+    parser.add_argument("--reruns", type=int, default=5, help="Reruns per interpreter")
+    parser.add_argument("--cold-budget", type=float, default=COLD_START_BUDGET)
+    parser.add_argument("--rerun-budget", type=float, default=RERUN_BUDGET)
+    parser.add_argument("--probe", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        print(json.dumps(probe(args.probe, args.reruns)))
+        return
+
+    failures = []
+    for page in args.pages:
+        cold, reruns, peak, lazy_loaded, exceptions = [], [], 0, set(), set()
+        for _ in range(args.repeat):
+            # A new working directory each time, nothing is stored yet
+            with tempfile.TemporaryDirectory() as workdir:
+                result = run_fresh(page, args.reruns, workdir)
+            cold.append(result["cold"])
+            reruns.extend(result["reruns"])
+            peak = max(peak, result["max_rss"])
+            lazy_loaded.update(result["lazy_loaded"])
+            exceptions.update(result["exceptions"])
+
+        for stage, timings, budget in (("cold_start", cold, args.cold_budget),
+                                       ("rerun", reruns, args.rerun_budget)):
+            # The peak is the resident memory of the whole process
+            measured = StageResult(stage, 1, 1, timings, peak)
+            print(f"{page:<28} {measured}")
+            if measured.percentile(50) > budget:
+                failures.append(f"{page} {stage} p50 {measured.percentile(50):.2f}s "
+                                   f"over the {budget:.2f}s budget")
+        if lazy_loaded:
+            failures.append(f"{page} loaded {', '.join(sorted(lazy_loaded))} at startup")
+        for exception in sorted(exceptions):
+            print(f"{page:<28} raised: {exception}")
+
+    for message in failures:
+        print(f"Failed: {message}")
+    if failures:
+        sys.exit(1)
+    print("Every page starts within its budget")
+
+
+if __name__ == "__main__":
+    main()
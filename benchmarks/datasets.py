@@ -0,0 +1,70 @@
+"""
+Synthetic review datasets scaled from the sample ``data.csv``.
+
+    reviews = synthetic_reviews(100_000)
+
+Rows are sampled from the sample reviews and spread over several products,
+with distinct reviewer names and dates so every review has its own
+fingerprint. Values keep the text form they are scraped in (prices with the
+rupee sign, dates like "12 Mar 2024"), so the datasets exercise the same
+parsing as freshly scraped reviews.
+"""
+import numpy as np
+import pandas as pd
+
+from benchmarks.fixture_site import SAMPLE_DATA_PATH
+
+# Reviews per synthetic product, roughly the size of a popular product's review list
+REVIEWS_PER_PRODUCT = 2000
+MAX_PRODUCTS = 50
+DATE_RANGE = ("2020-01-01", "2024-12-31")
+
+
+def synthetic_reviews(rows: int, products: int = None, seed: int = 0,
+                      data_path: str = SAMPLE_DATA_PATH) -> pd.DataFrame:
+    """
+    Build ``rows`` raw reviews shaped like a scrape.
+
+    Args:
+        rows: Number of reviews
+        products: Number of products they are spread over, defaults to one
+            per REVIEWS_PER_PRODUCT reviews, at most MAX_PRODUCTS
+        seed: Seed of the random sampling, the same seed gives the same data
+        data_path: Sample reviews to scale
+
+    Returns:
+        pd.DataFrame: Reviews with the columns of the sample data
+    """
+    sample = pd.read_csv(data_path)
+    rng = np.random.default_rng(seed)
+    products = products or min(MAX_PRODUCTS, max(1, rows // REVIEWS_PER_PRODUCT))
+
+    data = sample.iloc[rng.integers(0, len(sample), rows)].reset_index(drop=True)
+    product = rng.integers(0, products, rows)
+
+    # Per product and per day values are built once and picked by index
+    titles = sample["Product Name"].unique()
+    names = np.array([f"{titles[k % len(titles)]} #{k}" for k in range(products)], dtype=object)
+    prices = np.array([f"₹{price}" for price in rng.integers(199, 4999, products)], dtype=object)
+    overall = np.round(rng.uniform(3.0, 4.9, products), 1)
+    days = pd.date_range(*DATE_RANGE, freq="D")
+    day_names = np.asarray(days.strftime("%d %b %Y"), dtype=object)
+
+    data["Product Name"] = names[product]
+    # Products keep one price and overall rating each, like a scrape
+    data["Price"] = prices[product]
+    data["Over_All_Rating"] = overall[product]
+    data["Date"] = day_names[rng.integers(0, len(days), rows)]
+    data["Rating"] = rng.choice([1, 2, 3, 4, 5], rows, p=[0.06, 0.04, 0.1, 0.25, 0.55])
+    data["Name"] = data["Name"].astype(str) + " " + pd.Series(np.arange(rows)).astype(str)
+    return data
+
+
+def scaled_sizes(smallest: int = 1000, largest: int = 1_000_000) -> list:
+    """Dataset sizes from ``smallest`` to ``largest``, growing tenfold."""
+    sizes = []
+    size = smallest
+    while size <= largest:
+        sizes.append(size)
+        size *= 10
+    return sizes
@@ -0,0 +1,237 @@
+"""
+A local stand-in for the Myntra pages the scraper visits.
+
+Search, product and review pages are rendered from the sample ``data.csv`` so
+that ScrapeReviews can be pointed at ``FixtureSite.base_url`` and exercised
+without touching the real site. Pages recorded with
+``benchmarks.record_fixtures`` can be replayed instead.
+
+    with FixtureSite(no_of_products=4) as site:
+        ScrapeReviews("derma co", 4, base_url=site.base_url).get_review_data()
+
+    with FixtureSite(pages_dir=RECORDED_FIXTURES_DIR) as site:
+        ...
+"""
+import html
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+SAMPLE_DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.csv")
+# Pages recorded by benchmarks.record_fixtures, listed in MANIFEST_NAME
+RECORDED_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+MANIFEST_NAME = "manifest.json"
+
+
+def load_fixture_products(no_of_products: int = 4, data_path: str = SAMPLE_DATA_PATH) -> list:
+    """
+    Build ``no_of_products`` fake products, each carrying the sample reviews.
+
+    Returns:
+        list: Dicts with id, slug, title, rating, price and a reviews DataFrame
+    """
+    data = pd.read_csv(data_path)
+    reviews = data[["Date", "Rating", "Name", "Comment"]]
+    title = str(data["Product Name"].iloc[0])
+
+    products = []
+    for i in range(no_of_products):
+        product_id = str(29237734 + i)
+        products.append({
+            "id": product_id,
+            "slug": f"skin-care-combo/fixture-brand/product-{i}/{product_id}/buy",
+            "title": title.replace("29237734", product_id),
+            "rating": str(data["Over_All_Rating"].iloc[0]),
+            "price": str(data["Price"].iloc[0]),
+            "reviews": reviews,
+        })
+    return products
+
+
+def render_search_page(products: list) -> str:
+    items = "".join(
+        f'<li class="product-base"><a href="{product["slug"]}" target="_blank">'
+        f'<h3 class="product-brand">{html.escape(product["title"])}</h3></a></li>'
+        for product in products
+    )
+    return f'<html><head><title>Search</title></head><body><ul class="results-base">{items}</ul></body></html>'
+
+
+def render_product_page(product: dict, with_reviews: bool = True) -> str:
+    reviews_link = (
+        f'<a class="detailed-reviews-allReviews" href="/reviews/{product["id"]}">View all reviews</a>'
+        if with_reviews else ""
+    )
+    return (
+        f'<html><head><title>{html.escape(product["title"])}</title></head><body>'
+        f'<div class="index-overallRating"><div>{product["rating"]}</div></div>'
+        f'<p class="pdp-discount-container"><span class="pdp-price"><strong>{product["price"]}</strong></span></p>'
+        f'{reviews_link}</body></html>'
+    )
+
+
+def render_review_card(review) -> str:
+    return (
+        '<div class="user-review-userReviewWrapper">'
+        '<div class="user-review-main user-review-showRating">'
+        f'<span class="user-review-starRating">{review.Rating}</span></div>'
+        f'<div class="user-review-reviewTextWrapper">{html.escape(str(review.Comment))}</div>'
+        '<div class="user-review-footer"><div class="user-review-left">'
+        f'<span>{html.escape(str(review.Name))}</span><span>{review.Date}</span>'
+        '</div></div></div>'
+    )
+
+
+# Appends the next page of review cards shortly after the user scrolls to the
+# bottom, mimicking the infinite scroll of the real review list.
+INFINITE_SCROLL_SCRIPT = """
+<script>
+var pending = %s, loading = false;
+window.addEventListener("scroll", function () {
+  if (loading || !pending.length) { return; }
+  if (window.innerHeight + window.scrollY < document.body.scrollHeight - 50) { return; }
+  loading = true;
+  setTimeout(function () {
+    document.querySelector(".detailed-reviews-userReviewsContainer")
+      .insertAdjacentHTML("beforeend", pending.shift());
+    loading = false;
+  }, %d);
+});
+</script>
+"""
+
+
+def render_review_page(product: dict, page_size: int = None, load_delay_ms: int = 300) -> str:
+    """
+    Render the review list; with ``page_size`` only the first page is in the
+    HTML and the rest is appended on scroll after ``load_delay_ms``.
+    """
+    cards = [render_review_card(review) for review in product["reviews"].itertuples(index=False)]
+    page_size = page_size or len(cards) or 1
+    pages = ["".join(cards[i:i + page_size]) for i in range(0, len(cards), page_size)] or [""]
+    script = INFINITE_SCROLL_SCRIPT % (json.dumps(pages[1:]), load_delay_ms) if len(pages) > 1 else ""
+    return (
+        f'<html><head><title>{html.escape(product["title"])}</title></head><body>'
+        f'<div class="detailed-reviews-userReviewsContainer">{pages[0]}</div>'
+        f'<div style="height: 1200px"></div>{script}</body></html>'
+    )
+
+
+def save_pages(directory: str, pages: dict, search_page: str):
+    """
+    Write recorded pages to ``directory``, with a manifest mapping each URL
+    path to its file.
+
+    Args:
+        directory: Fixture directory, created if needed
+        pages: URL path -> page HTML
+        search_page: HTML of the search results
+    """
+    os.makedirs(directory, exist_ok=True)
+    manifest = {"search": "search.html", "pages": {}}
+    files = {"search.html": search_page}
+    for number, (path, page) in enumerate(sorted(pages.items()), start=1):
+        name = f"page-{number:03d}.html"
+        manifest["pages"][path] = name
+        files[name] = page
+    for name, page in files.items():
+        with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+            f.write(page)
+    with open(os.path.join(directory, MANIFEST_NAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def load_pages(directory: str) -> tuple:
+    """
+    Read pages written by save_pages.
+
+    Returns:
+        tuple: URL path -> page HTML, and the search page HTML
+    """
+    with open(os.path.join(directory, MANIFEST_NAME), encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    def read(name: str) -> str:
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            return f.read()
+
+    return {path: read(name) for path, name in manifest["pages"].items()}, read(manifest["search"])
+
+
+class FixtureSite:
+    """Serve the fixture pages over HTTP on a background thread."""
+
+    def __init__(self, no_of_products: int = 4, host: str = "127.0.0.1", port: int = 0,
+                 data_path: str = SAMPLE_DATA_PATH, review_page_size: int = 10,
+                 pages_dir: str = None):
+        """
+        Args:
+            no_of_products: Products rendered from the sample data
+            host: Interface to listen on
+            port: Port to listen on, 0 picks a free one
+            data_path: Sample reviews the products are rendered from
+            review_page_size: Review cards in the HTML of a review page, the
+                rest are appended on scroll
+            pages_dir: Replay the pages recorded in this directory instead of
+                rendering them, see save_pages
+        """
+        self.review_page_size = review_page_size
+        if pages_dir is None:
+            self.products = load_fixture_products(no_of_products, data_path=data_path)
+            self.pages = self._render_pages()
+            self.search_page = render_search_page(self.products)
+        else:
+            self.products = []
+            self.pages, self.search_page = load_pages(pages_dir)
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def _render_pages(self) -> dict:
+        pages = {}
+        for product in self.products:
+            pages["/" + product["slug"]] = render_product_page(product)
+            pages[f"/reviews/{product['id']}"] = render_review_page(product, page_size=self.review_page_size)
+        return pages
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                # Anything that is not a product or review page is a search
+                body = site.pages.get(path) or site.search_page
+                payload = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
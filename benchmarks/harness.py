@@ -0,0 +1,152 @@
+"""
+Timing, memory and baseline checks shared by the benchmarks.
+
+Each measured stage is run ``repeat`` times for its latency percentiles and
+once more under tracemalloc for its peak Python heap (NumPy and pandas
+buffers included, Arrow's own allocator is not traced). Results can be saved
+as a baseline and later runs compared against it.
+"""
+import gc
+import json
+import os
+import platform
+import time
+import tracemalloc
+
+import numpy as np
+
+DEFAULT_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# Slowdown or memory growth over the baseline reported as a regression
+DEFAULT_TOLERANCE = 0.25
+# Checked against the baseline, lower is better for all of them. Smaller
+# absolute differences are noise and never reported
+COMPARED_METRICS = {"p50_ms": 1.0, "peak_mb": 1.0}
+
+
+class StageResult:
+    """Latency, throughput and memory of one stage at one dataset size."""
+
+    def __init__(self, stage: str, size: int, items: int, timings: list, peak_bytes: int):
+        self.stage = stage
+        self.size = size
+        self.items = items
+        self.timings = timings
+        self.peak_bytes = peak_bytes
+
+    @property
+    def key(self) -> str:
+        return f"{self.stage}@{self.size}"
+
+    def percentile(self, q: float) -> float:
+        return float(np.percentile(self.timings, q))
+
+    def to_dict(self) -> dict:
+        p50 = self.percentile(50)
+        return {
+            "stage": self.stage,
+            "size": self.size,
+            "items": self.items,
+            "runs": len(self.timings),
+            "p50_ms": p50 * 1000,
+            "p90_ms": self.percentile(90) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "items_per_second": self.items / p50 if p50 > 0 else float("inf"),
+            "peak_mb": self.peak_bytes / 2 ** 20,
+        }
+
+    def __str__(self):
+        row = self.to_dict()
+        return (f"{self.stage:<14} size={self.size:<8} p50={row['p50_ms']:10.2f}ms "
+                f"p90={row['p90_ms']:10.2f}ms p99={row['p99_ms']:10.2f}ms "
+                f"{row['items_per_second']:12.0f} items/s peak={row['peak_mb']:8.1f}MB")
+
+
+def measure(stage: str, size: int, run, repeat: int = 5, setup=None, items: int = None) -> StageResult:
+    """
+    Time ``run`` and trace its peak memory.
+
+    Args:
+        stage: Stage name
+        size: Dataset size the stage ran on
+        run: Callable taking the output of ``setup``, returning the number of
+            items it processed (or None to count ``size``)
+        repeat: Timed runs
+        setup: Callable preparing the input of each run, not timed
+        items: Items processed per run, defaults to what ``run`` returns
+
+    Returns:
+        StageResult: The measurements
+    """
+    timings = []
+    for _ in range(repeat):
+        argument = setup() if setup else None
+        gc.collect()
+        started = time.perf_counter()
+        processed = run(argument) if setup else run()
+        timings.append(time.perf_counter() - started)
+        items = items or processed or size
+
+    argument = setup() if setup else None
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(argument) if setup else run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return StageResult(stage, size, items, timings, peak)
+
+
+def environment() -> dict:
+    """What the numbers depend on besides the code, saved with a baseline."""
+    import pandas as pd
+
+    return {"python": platform.python_version(), "pandas": pd.__version__,
+            "machine": platform.machine(), "processor": platform.processor() or None,
+            "cpus": os.cpu_count()}
+
+
+def save_baseline(results: list, path: str = DEFAULT_BASELINE_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"environment": environment(),
+                   "results": {result.key: result.to_dict() for result in results}}, f, indent=2)
+    print(f"Saved the baseline of {len(results)} measurements to {path}")
+
+
+def load_baseline(path: str = DEFAULT_BASELINE_PATH):
+    """The saved baseline, None if there is none."""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results: list, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """
+    Find the stages that got slower or use more memory than the baseline.
+
+    Args:
+        results: StageResult of this run
+        baseline: Baseline from load_baseline
+        tolerance: Allowed relative growth of each of COMPARED_METRICS
+
+    Returns:
+        list: One message per regression, empty when there is none
+    """
+    if baseline.get("environment") != environment():
+        print("Warning: the baseline was measured in another environment, "
+              "differences may not come from the code")
+    regressions = []
+    for result in results:
+        reference = baseline["results"].get(result.key)
+        if reference is None:
+            continue
+        current = result.to_dict()
+        for metric, noise in COMPARED_METRICS.items():
+            if reference[metric] <= 0 or current[metric] - reference[metric] < noise:
+                continue
+            change = current[metric] / reference[metric] - 1
+            if change > tolerance:
+                regressions.append(f"{result.key} {metric}: {reference[metric]:.2f} -> "
+                                   f"{current[metric]:.2f} (+{change:.0%})")
+    return regressions
@@ -0,0 +1,72 @@
+"""
+Record the pages of a scrape as fixtures for the offline benchmarks.
+
+    python -m benchmarks.record_fixtures --product "derma co" --products 4
+    python -m benchmarks.record_fixtures --base-url https://www.myntra.com/ --engine browser
+
+Every search, product and review page the scrape loads is saved as it was
+served (review lists after scrolling with the browser engine), together with
+a manifest that FixtureSite(pages_dir=...) replays. Without --base-url the
+pages are recorded from a FixtureSite rendered from the sample data.
+"""
+import argparse
+from urllib.parse import urlsplit
+
+from benchmarks.fixture_site import RECORDED_FIXTURES_DIR, FixtureSite, save_pages
+from src.constants import FETCH_ENGINES
+from src.scrapper.scrape import ScrapeReviews
+
+
+class RecordingScrape(ScrapeReviews):
+    """A scrape keeping every page it fetches, keyed by URL path."""
+
+    def __init__(self, *args, **kwargs):
+        # Pages must come from the site, not from the page cache
+        super().__init__(*args, use_cache=False, **kwargs)
+        self.recorded = {}
+        self.search_page = None
+
+    def _fetch_page(self, url: str, ready_marker: str = None, scroll: bool = False) -> str:
+        page = super()._fetch_page(url, ready_marker, scroll)
+        if ready_marker == "results-base":
+            self.search_page = page
+        else:
+            self.recorded[urlsplit(url).path] = page
+        return page
+
+
+def record(base_url: str, product_name: str, no_of_products: int, fetch_engine: str,
+           directory: str) -> int:
+    """
+    Returns:
+        int: Number of reviews in the recorded pages
+    """
+    scrapper = RecordingScrape(product_name=product_name, no_of_products=no_of_products,
+                               base_url=base_url, fetch_engine=fetch_engine)
+    reviews = len(scrapper.get_review_data())
+    if scrapper.search_page is None:
+        raise RuntimeError("The search page could not be recorded")
+    save_pages(directory, scrapper.recorded, scrapper.search_page)
+    print(f"Recorded {len(scrapper.recorded) + 1} pages with {reviews} reviews to {directory}")
+    return reviews
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="Site to record, defaults to a local FixtureSite")
+    parser.add_argument("--product", default="fixture product")
+    parser.add_argument("--products", type=int, default=4)
+    parser.add_argument("--engine", choices=FETCH_ENGINES, default="http")
+    parser.add_argument("--output", default=RECORDED_FIXTURES_DIR)
+    args = parser.parse_args()
+
+    if args.base_url:
+        record(args.base_url, args.product, args.products, args.engine, args.output)
+    else:
+        # Every review in one page, as a scrolled review list is recorded
+        with FixtureSite(no_of_products=args.products, review_page_size=10 ** 6) as site:
+            record(site.base_url, args.product, args.products, args.engine, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,50 +1,25 @@
 import pandas as pd
 import streamlit as st 
 import os
-from src.cloud_io import MongoIO
-from src.constants import SESSION_PRODUCT_KEY
+from src.cloud_io import get_mongo_io
+from src.constants import SESSION_PRODUCT_KEY, REVIEW_COLUMNS, SENTIMENT_COLUMN, DUPLICATE_COLUMN
 from src.utils import fetch_product_names_from_cloud
 from src.data_report.generate_data_report import DashboardGenerator
+from src.data_report.cache import get_dashboard_cache
 
-# Initialize MongoDB connection with error handling
-try:
-    mongo_con = MongoIO()
-    if hasattr(mongo_con, 'offline_mode') and mongo_con.offline_mode:
-        st.warning("⚠️ Running in offline mode. Some features may be limited.")
-        st.info("The application will use locally saved data if available.")
-except Exception as e:
-    st.error(f"MongoDB Connection Error: {e}")
-    st.info("The application will continue in offline mode with limited functionality.")
-    # Create a dummy MongoIO instance for offline mode
-    class DummyMongoIO:
-        def __init__(self):
-            self.offline_mode = True
-            
-        def get_reviews(self, product_name, collection_name=None):
-            # Try to load from -> local backup
-            try:
-                backup_dir = os.path.join(os.getcwd(), "data_backup")
-                backup_file = os.path.join(backup_dir, f"{product_name.replace(' ', '_')}.csv")
-                if os.path.exists(backup_file):
-                    data = pd.read_csv(backup_file)
-                    st.success(f"Loaded {len(data)} reviews from local backup")
-                    return data
-                else:
-                    st.warning(f"No local backup found for {product_name}")
-                    return pd.DataFrame()
-            except Exception as local_e:
-                st.error(f"Error loading reviews from local backup: {local_e}")
-                return pd.DataFrame()
-    
-    mongo_con = DummyMongoIO()
+# The MongoDB client connects lazily, offline reviews are read from the local store
+mongo_con = get_mongo_io()
+if not mongo_con.is_online():
+    st.warning("⚠️ Running in offline mode. Some features may be limited.")
+    st.info("The application will use locally saved data if available.")
 
 
-def create_analysis_page(review_data: pd.DataFrame):
+def create_analysis_page(review_data: pd.DataFrame, load_dashboard=None):
     if review_data is not None:
 
         st.dataframe(review_data)
         if st.button("Generate Analysis"):
-            dashboard = DashboardGenerator(review_data)
+            dashboard = load_dashboard() if load_dashboard else DashboardGenerator(review_data)
 
             # Display general information
             dashboard.display_general_info()
@@ -52,15 +27,41 @@ def create_analysis_page(review_data: pd.DataFrame):
             # Display product-specific sections
             dashboard.display_product_sections()
 
+            # Display sentiment, keywords and aspects of the comments
+            dashboard.display_text_insights()
+
 
 try:
     # Check if data flag is set in session state
     if st.session_state.get("data", False):
         # Check if product name is set and not empty
         if SESSION_PRODUCT_KEY in st.session_state and st.session_state[SESSION_PRODUCT_KEY].strip():
+            with st.sidebar:
+                min_rating = st.slider("Minimum review rating", min_value=1, max_value=5, value=1)
+                max_reviews = st.number_input("Maximum reviews to load (0 for all)",
+                                              min_value=0, step=1000, value=0)
+                skip_duplicates = st.checkbox("Hide duplicate reviews", value=True,
+                                              help="Leave out reviews that copy the comment of an "
+                                                   "earlier review of the product")
             try:
-                # Get product reviews with error handling
-                data = mongo_con.get_reviews(product_name=st.session_state[SESSION_PRODUCT_KEY])
+                product_name = st.session_state[SESSION_PRODUCT_KEY]
+                collection_name = product_name.replace(" ", "_")
+                rating_filter = min_rating if min_rating > 1 else None
+                view = (rating_filter, int(max_reviews), skip_duplicates)
+
+                # Reruns and other sessions reuse what was loaded and computed
+                # for this product while its stored reviews are unchanged
+                cache = get_dashboard_cache()
+                fingerprint = mongo_con.get_fingerprint(product_name)
+
+                # Only load the columns and reviews the dashboard needs
+                data = cache.get_or_compute(
+                    collection_name, ("reviews",) + view, fingerprint,
+                    lambda: mongo_con.get_reviews(product_name=product_name,
+                                                  columns=REVIEW_COLUMNS + [SENTIMENT_COLUMN, DUPLICATE_COLUMN],
+                                                  min_rating=rating_filter,
+                                                  limit=int(max_reviews) or None,
+                                                  skip_duplicates=skip_duplicates))
                 
                 # Check if data is empty (could be due to MongoDB connection issues)
                 if data is None or (isinstance(data, pd.DataFrame) and data.empty):
@@ -71,7 +72,16 @@ try:
                            "- Go back to the search page and re-scrape the reviews")
                     st.markdown(""" # Database Connection Issue""")
                 else:
-                    create_analysis_page(data)
+                    def build_dashboard():
+                        # Aggregated by MongoDB or the local store
+                        summaries = mongo_con.get_review_summaries(product_name=product_name,
+                                                                   min_rating=rating_filter,
+                                                                   skip_duplicates=skip_duplicates)
+                        return DashboardGenerator(data, summaries=summaries)
+
+                    # Only built once the analysis is requested
+                    create_analysis_page(data, lambda: cache.get_or_compute(
+                        collection_name, ("dashboard",) + view, fingerprint, build_dashboard))
             except Exception as db_error:
                 st.error(f"Database error: {str(db_error)}")
                 st.info("💡 The application is having trouble connecting to the database. Please try again later.")
@@ -0,0 +1,51 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from src.constants import JOB_STATUSES
+from src.jobs import get_job_queue
+
+st.title("Scrape Jobs")
+
+queue = get_job_queue()
+
+with st.sidebar:
+    statuses = st.multiselect("Status", JOB_STATUSES, default=list(JOB_STATUSES))
+    limit = st.number_input("Jobs to show", min_value=1, step=10, value=50)
+    auto_refresh = st.checkbox("Refresh automatically", value=True)
+    refresh_interval = st.number_input("Refresh every (seconds)", min_value=1, value=3)
+
+counts = queue.counts()
+for column, status in zip(st.columns(len(JOB_STATUSES)), JOB_STATUSES):
+    column.metric(status.capitalize(), counts.get(status, 0))
+
+jobs = queue.jobs(limit=int(limit), statuses=tuple(statuses))
+if not jobs:
+    st.info("No scrape jobs yet. Queue one from the search page.")
+else:
+    # Jobs being worked on, with their progress
+    for job in jobs:
+        if job.status == "running":
+            st.progress(job.progress, text=f"Job {job.job_id} '{job.product_name}': "
+                                           f"{job.products_done} of {job.no_of_products} products, "
+                                           f"{job.reviews_scraped} reviews")
+
+    table = pd.DataFrame([job.to_dict() for job in jobs])
+    for column in ("created_at", "started_at", "finished_at"):
+        table[column] = pd.to_datetime(table[column], unit="s")
+    st.dataframe(table, hide_index=True)
+
+    cancellable = [job.job_id for job in jobs if job.status in ("queued", "running")]
+    if cancellable:
+        job_id = st.selectbox("Job", cancellable)
+        if st.button("Cancel job"):
+            if queue.cancel(job_id):
+                st.success(f"Job {job_id} cancelled")
+            else:
+                st.warning(f"Job {job_id} already finished")
+
+# Poll while jobs are waiting or running
+if auto_refresh and (counts.get("queued") or counts.get("running")):
+    time.sleep(refresh_interval)
+    st.rerun()
@@ -5,7 +5,7 @@ setup (
     author='Chandan Roy',
     author_email='atchandanworkspace@gmail.com',
     description='scrapper',
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks", "benchmarks.*"]),
         install_requires=[
         "streamlit",
         "pandas",
@@ -13,6 +13,7 @@ setup (
         "plotly",
         "database-connect",
         "requests",
-        "beautifulsoup4"
+        "beautifulsoup4",
+        "pyarrow"
     ]
 )
\ No newline at end of file
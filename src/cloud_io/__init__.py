@@ -1,51 +1,163 @@
 import pandas as pd
-from src.database_connect import mongo_operation as mongo 
 import os, sys
-from src.constants import MONGO_DATABASE_NAME
+import threading
+from src.constants import (MONGO_DATABASE_NAME, REVIEW_KEY_COLUMN, REVIEW_READ_BATCH_SIZE,
+                           CATALOG_SEARCH_LIMIT, DUPLICATE_COLUMN, WRITE_COUNTER_COLLECTION)
 from src.exception import CustomException
+from src.review_schema import (REVIEW_KEY_FIELDS, add_review_keys, review_keys,
+                               parse_review_dates, parse_numbers, normalize_reviews)
+from src.data_report.cache import get_dashboard_cache
+from src.text_analytics import add_sentiment
+from src.dedup import DedupIndex
+from src.storage import create_review_store
+from src.storage.journal import WriteJournal
+from src.storage.catalog import LocalCatalog, catalog_entry
+from src.cloud_io.sync import SyncWorker
+from src.telemetry import inc, timed
+from src.data_report.summary import (SUMMARY_COLUMNS, TOP_REVIEWS, summary_pipeline,
+                                     summaries_from_aggregation, summaries_from_frame)
 
 
 
 class MongoIO:
-    mongo_ins = None
-    offline_mode = False
-
     def __init__(self):
-        if MongoIO.mongo_ins is None and not MongoIO.offline_mode:
-            mongo_db_url = os.getenv("MONGO_DB_URL")
-            if not mongo_db_url:
-                print("MONGO_DB_URL environment variable not set. Application starting in offline mode.")
-                MongoIO.offline_mode = True
-                self.mongo_ins = None
-                self.offline_mode = True
-                return
-            
-            try:
-                MongoIO.mongo_ins = mongo(client_url=mongo_db_url,
-                                          database_name=MONGO_DATABASE_NAME)
-                print("Successfully connected to MongoDB.")
-            except Exception as e:
-                print(f"MongoDB connection error: {e}")
-                print("Creating offline mode for the application...")
-                MongoIO.offline_mode = True
-                MongoIO.mongo_ins = None
-                
-                error_msg = (
-                    "Failed to connect to MongoDB. This could be due to one of the following reasons:\n"
-                    "1. Your IP address is not whitelisted in MongoDB Atlas\n"
-                    "2. Network restrictions or firewall settings\n"
-                    "3. VPN interference with SSL connections\n"
-                    "4. MongoDB Atlas service might be temporarily unavailable\n"
-                    "5. The MONGO_DB_URL environment variable is incorrect.\n\n"
-                    "The application will continue in offline mode with limited functionality."
-                )
-                print(error_msg)
-        
-        self.mongo_ins = MongoIO.mongo_ins
-        self.offline_mode = MongoIO.offline_mode
+        # Used offline and whenever MongoDB cannot be reached, see create_review_store
+        self.local_store = create_review_store()
+        # CSV backups of earlier versions, a no-op once they were migrated
+        self.local_store.migrate_csv()
+        # Product catalogs, one entry per product kept up to date on write
+        self.local_catalog = LocalCatalog(self.local_store.root)
+        self.catalog = None
+        # Fingerprints of the stored reviews, to find repeated and copied ones
+        self.dedup_index = DedupIndex(self.local_store.root)
+        self.mongo_db_url = os.getenv("MONGO_DB_URL")
+        self.mongo_ins = None
+        self.offline_mode = True
+        # Writes waiting for MongoDB, see store_reviews and SyncWorker
+        self.journal = None
+        self.sync_worker = None
+
+        if not self.mongo_db_url:
+            print("MONGO_DB_URL environment variable not set. Application starting in offline mode.")
+            return
+
+        self.journal = WriteJournal()
+        if not self._configure_client():
+            error_msg = (
+                "Failed to connect to MongoDB. This could be due to one of the following reasons:\n"
+                "1. Your IP address is not whitelisted in MongoDB Atlas\n"
+                "2. Network restrictions or firewall settings\n"
+                "3. VPN interference with SSL connections\n"
+                "4. MongoDB Atlas service might be temporarily unavailable\n"
+                "5. The MONGO_DB_URL environment variable is incorrect.\n\n"
+                "The application will continue in offline mode and store reviews locally "
+                "until MongoDB can be reached."
+            )
+            print(error_msg)
+        if self.journal.pending()[0]:
+            # Writes left over by an earlier run
+            self._start_sync_worker()
+
+    def _configure_client(self) -> bool:
+        # pymongo is only loaded when a MongoDB URL is configured
+        from src.database_connect import mongo_operation as mongo
+        from src.cloud_io.catalog import MongoCatalog
+
+        try:
+            # The shared client connects lazily on the first operation
+            self.mongo_ins = mongo(client_url=self.mongo_db_url,
+                                   database_name=MONGO_DATABASE_NAME)
+            self.catalog = MongoCatalog(self.mongo_ins)
+            self.offline_mode = False
+            print("MongoDB client configured.")
+            return True
+        except Exception as e:
+            print(f"MongoDB connection error: {e}")
+            self.mongo_ins = None
+            self.catalog = None
+            self.offline_mode = True
+            return False
+
+    def reconnect(self) -> bool:
+        """
+        Bring the instance back online once MongoDB can be reached again.
+
+        Returns:
+            bool: Whether MongoDB is reachable
+        """
+        if not self.mongo_db_url:
+            return False
+        if self.mongo_ins is None and not self._configure_client():
+            return False
+        # A successful ping also closes the circuit breaker
+        return self.mongo_ins.ping(force=True)
+
+    def _start_sync_worker(self):
+        if self.sync_worker is None or not self.sync_worker.is_alive():
+            self.sync_worker = SyncWorker(self, self.journal)
+            self.sync_worker.start()
+
+    def _enqueue(self, collection_name: str, reviews: pd.DataFrame, product_name: str = None):
+        """Journal reviews for the sync worker to write to MongoDB."""
+        self.journal.append(collection_name, reviews, product_name=product_name)
+        self._start_sync_worker()
+        self.sync_worker.wake()
+
+    def pending_sync(self) -> tuple:
+        """
+        Returns:
+            tuple: Journal entries and reviews not written to MongoDB yet
+        """
+        return (0, 0) if self.journal is None else self.journal.pending()
 
+    def is_online(self) -> bool:
+        """
+        Whether MongoDB operations should be attempted. False in offline mode
+        and while the connection's circuit breaker is open, so callers go
+        straight to the local store instead of waiting on timeouts. The sync
+        worker brings the instance back online, see reconnect.
+        """
+        return (not self.offline_mode
+                and self.mongo_ins is not None
+                and self.mongo_ins.manager.is_available())
+
+    def health_check(self, force: bool = False) -> bool:
+        """Ping MongoDB, the result is cached for a few seconds."""
+        if not self.is_online():
+            return False
+        return self.mongo_ins.ping(force=force)
+
+    @timed("store_reviews")
     def store_reviews(self,
-                      product_name: str, reviews: pd.DataFrame):
+                      product_name: str, reviews: pd.DataFrame,
+                      append: bool = False,
+                      incremental: bool = False,
+                      write_behind: bool = False):
+        """
+        Store scraped reviews in MongoDB, or in the local store when offline.
+
+        Every review is stored with its fingerprint in REVIEW_KEY_COLUMN and
+        the sentiment of its comment in SENTIMENT_COLUMN. In MongoDB reviews
+        are upserted on the fingerprint, so storing a review again updates
+        the stored copy instead of duplicating it.
+
+        Reviews already stored under another fingerprint, same reviewer and
+        comment, are dropped, and reviews copying the comment of an earlier
+        review are flagged in DUPLICATE_COLUMN, see DedupIndex.
+
+        Reviews that cannot be written to MongoDB are also journaled, and the
+        sync worker writes them once MongoDB can be reached again.
+
+        Args:
+            product_name: Product the reviews were scraped for
+            reviews: Reviews to store
+            append: Add to the local store instead of replacing it, used when
+                a scrape is stored product by product
+            incremental: Only add the reviews that are not stored yet, keeping
+                everything already stored
+            write_behind: Journal the reviews and return at once, the sync
+                worker writes them to MongoDB in the background
+        """
         try:
             # Check if product_name is empty or None
             if not product_name or product_name.strip() == "":
@@ -62,41 +174,59 @@ class MongoIO:
             if reviews is None or reviews.empty:
                 print("Warning: Empty reviews DataFrame provided, nothing to store")
                 return
+
+            # Reviews are stored typed, see normalize_reviews, and with the
+            # sentiment of their comment so the dashboard never scores them again
+            reviews = add_sentiment(normalize_reviews(add_review_keys(reviews)))
+            # Offline a write that is not appended replaces the local copy
+            reviews, fingerprints = self._flag_duplicates(
+                product_name, collection_name, reviews,
+                replace=not (append or incremental or self.is_online()))
+            if reviews.empty:
+                print(f"Every review of {product_name} is already stored, nothing to store")
+                return
+            # Whatever is written, cached dashboards of the product are stale
+            get_dashboard_cache().invalidate(collection_name)
                 
             # Check if we're in offline mode
-            if self.offline_mode or self.mongo_ins is None:
-                print(f"Warning: Operating in offline mode. Reviews for {product_name} will not be stored in MongoDB.")
-                # Save to local CSV file as fallback
-                try:
-                    import os
-                    backup_dir = os.path.join(os.getcwd(), "data_backup")
-                    os.makedirs(backup_dir, exist_ok=True)
-                    backup_file = os.path.join(backup_dir, f"{collection_name}.csv")
-                    reviews.to_csv(backup_file, index=False)
-                    print(f"Reviews saved locally to {backup_file}")
-                    return
-                except Exception as local_e:
-                    print(f"Error saving reviews locally: {local_e}")
-                    return
-                
+            if not self.is_online():
+                print(f"Warning: Operating in offline mode. Reviews for {product_name} will not be stored in MongoDB yet.")
+                stored = self._store_locally(collection_name, reviews, append=append,
+                                             incremental=incremental, product_name=product_name)
+                if self.journal is not None:
+                    self._enqueue(collection_name, reviews, product_name)
+                    stored = True
+                if stored:
+                    self._record_duplicates(product_name, collection_name, fingerprints)
+                return
+
+            if write_behind:
+                inc("stored_reviews_total", len(reviews), target="journal")
+                # The sync worker updates the catalog once they are written
+                self._enqueue(collection_name, reviews, product_name)
+                self._record_duplicates(product_name, collection_name, fingerprints)
+                print(f"Queued {len(reviews)} reviews for {product_name} for MongoDB")
+                return
+
             try:
                 # Add timeout handling for MongoDB operations
-                self.mongo_ins.bulk_insert(reviews, collection_name)
-                print(f"Successfully stored {len(reviews)} reviews for {product_name}")
+                report = self.mongo_ins.bulk_insert(reviews, collection_name,
+                                                    upsert_key=REVIEW_KEY_COLUMN)
+                inc("stored_reviews_total", report.written, target="mongodb")
+                print(f"Successfully stored {report.written} reviews for {product_name} "
+                      f"({report.inserted} new, {report.failed} failed)")
+                self._record_duplicates(product_name, collection_name, fingerprints)
+                self.update_catalog(collection_name, product_name, online=True,
+                                    new_reviews=reviews.iloc[report.new_positions])
             except Exception as mongo_error:
                 # Handle MongoDB connection errors specifically
                 print(f"MongoDB operation error during store_reviews: {mongo_error}")
                 print("Failed to store reviews in MongoDB. Attempting to save locally...")
-                # Try local backup if MongoDB storage fails
-                try:
-                    import os
-                    backup_dir = os.path.join(os.getcwd(), "data_backup")
-                    os.makedirs(backup_dir, exist_ok=True)
-                    backup_file = os.path.join(backup_dir, f"{collection_name}.csv")
-                    reviews.to_csv(backup_file, index=False)
-                    print(f"Reviews saved locally to {backup_file} as fallback")
-                except Exception as local_e:
-                    print(f"Error saving reviews locally: {local_e}")
+                # Try the local store if MongoDB storage fails, and sync them later
+                self._store_locally(collection_name, reviews, append=append, incremental=incremental,
+                                    product_name=product_name)
+                self._enqueue(collection_name, reviews, product_name)
+                self._record_duplicates(product_name, collection_name, fingerprints)
 
         except ValueError as ve:
             # Re-raise validation errors
@@ -106,66 +236,517 @@ class MongoIO:
             print(f"Unexpected error in store_reviews: {e}")
             raise CustomException(e, sys)
 
+    def _flag_duplicates(self, product_name: str, collection_name: str, reviews: pd.DataFrame,
+                         replace: bool = False) -> tuple:
+        """
+        Drop reviews scraped twice and flag copied ones, see DedupIndex.flag.
+        Errors are reported and the reviews stored as they are.
+
+        Args:
+            product_name: Product the reviews were scraped for
+            collection_name: Collection the reviews are stored in
+            reviews: Reviews about to be stored, with their fingerprints
+            replace: The reviews replace every stored review of the product
+
+        Returns:
+            tuple: The reviews to store and their Fingerprints, to record
+                with _record_duplicates once they are stored. None instead
+                of the Fingerprints when the check failed
+        """
+        try:
+            if replace:
+                self.dedup_index.remove(collection_name)
+            elif not self.dedup_index.indexed(collection_name):
+                self._index_stored_reviews(product_name, collection_name)
+            flagged, fingerprints = self.dedup_index.flag(collection_name, reviews)
+        except Exception as e:
+            print(f"Error checking the reviews of {product_name} for duplicates: {e}")
+            return reviews, None
+
+        repeated = len(reviews) - len(flagged)
+        copied = int(flagged[DUPLICATE_COLUMN].notna().sum())
+        inc("duplicate_reviews_total", repeated, kind="repeated")
+        inc("duplicate_reviews_total", copied, kind="copied")
+        if repeated or copied:
+            print(f"{repeated} reviews of {product_name} were scraped twice, {copied} copy another review")
+        return flagged, fingerprints
+
+    def _record_duplicates(self, product_name: str, collection_name: str, fingerprints):
+        """
+        Add reviews to the DedupIndex once they were stored or journaled, so a
+        write that failed leaves them out and a retry checks them again.
+        """
+        if fingerprints is None:
+            return
+        try:
+            self.dedup_index.add(collection_name, fingerprints)
+        except Exception as e:
+            print(f"Error recording the reviews of {product_name} for duplicates: {e}")
+
+    def _index_stored_reviews(self, product_name: str, collection_name: str):
+        """Add the reviews stored before the DedupIndex existed to it, read once per product."""
+        # Reviews stored before fingerprints existed get theirs computed from
+        # their dates as scraped, like the scraper does, not the parsed ones
+        batches = [add_review_keys(batch) for batch in self.iter_reviews(
+            product_name, columns=REVIEW_KEY_FIELDS + [REVIEW_KEY_COLUMN], normalize=False)]
+        if not batches:
+            return
+        stored = normalize_reviews(pd.concat(batches, ignore_index=True))
+        _, fingerprints = self.dedup_index.flag(collection_name, stored)
+        self.dedup_index.add(collection_name, fingerprints)
+
+    def _store_locally(self, collection_name: str, reviews: pd.DataFrame,
+                       append: bool = False, incremental: bool = False,
+                       product_name: str = None) -> bool:
+        """
+        Write reviews to the local store, see store_reviews.
+
+        Returns:
+            bool: Whether the reviews were written, errors are only reported
+        """
+        try:
+            written = self.local_store.write(collection_name, reviews,
+                                             append=append, incremental=incremental)
+            inc("stored_reviews_total", written, target="local")
+            print(f"{written} reviews saved locally to {self.local_store.root}")
+        except Exception as local_e:
+            print(f"Error saving reviews locally: {local_e}")
+            return False
+        self.update_catalog(collection_name, product_name, online=False)
+        return True
+
+    def update_catalog(self, collection_name: str, product_name: str = None,
+                       online: bool = False, last_scraped=None, new_reviews: pd.DataFrame = None):
+        """
+        Refresh the catalog entry of a product from its stored reviews, in
+        MongoDB or in the local catalog. Errors are reported without failing
+        the write the entry is updated for.
+
+        Args:
+            collection_name: Collection holding the reviews
+            product_name: Product search the reviews were scraped for, None
+                keeps the name already in the catalog
+            online: Update the MongoDB catalog rather than the local one
+            last_scraped: Time the reviews were stored, defaults to now
+            new_reviews: Reviews a MongoDB write added, counted into the
+                entry instead of counting the collection again
+        """
+        catalog = self.catalog if online else self.local_catalog
+        try:
+            if online and new_reviews is not None \
+                    and self.catalog.add_reviews(collection_name, new_reviews, product_name, last_scraped):
+                return
+            if online:
+                # Repairs or fills the entry, counted by the server with one
+                # document read per rating
+                review_count, rating_counts = self.catalog.rating_counts(collection_name)
+            else:
+                review_count, rating_counts = self.local_store.rating_counts(collection_name)
+            if product_name is None:
+                entry = catalog.get(collection_name)
+                # Products stored before the catalog only have their collection name
+                product_name = entry["product_name"] if entry else collection_name.replace("_", " ")
+            catalog.update(catalog_entry(product_name, collection_name, review_count,
+                                         rating_counts, last_scraped=last_scraped))
+        except Exception as e:
+            print(f"Error updating the product catalog for {collection_name}: {e}")
+
+    def rebuild_catalog(self, online: bool = False):
+        """
+        Add the products stored before the catalog existed, listing the
+        collections once. Products already in the catalog are kept.
+        """
+        if online:
+            with self.mongo_ins.manager.guard():
+                collections = self.mongo_ins.db.list_collection_names(maxTimeMS=5000)
+            collections = [collection for collection in collections
+                           if collection.strip()
+                           and collection not in (self.catalog.collection_name, WRITE_COUNTER_COLLECTION)]
+        else:
+            collections = self.local_store.list_collections()
+        catalog = self.catalog if online else self.local_catalog
+        for collection_name in collections:
+            if catalog.get(collection_name) is None:
+                self.update_catalog(collection_name, online=online)
+
+    def _read_catalog(self, read, operation: str):
+        """Run ``read`` on the MongoDB catalog, or the local one when offline."""
+        if self.is_online():
+            try:
+                return read(self.catalog)
+            except Exception as mongo_error:
+                print(f"MongoDB operation error during {operation}: {mongo_error}")
+        return read(self.local_catalog)
+
+    @staticmethod
+    def _keys_of(reviews: pd.DataFrame) -> set:
+        """Fingerprints of stored reviews, computing those stored without one."""
+        if reviews.empty:
+            return set()
+        keys = review_keys(reviews)
+        if REVIEW_KEY_COLUMN in reviews:
+            keys = reviews[REVIEW_KEY_COLUMN].where(reviews[REVIEW_KEY_COLUMN].notna(), keys)
+        return set(keys)
+
+    def get_known_review_keys(self, product_name: str) -> set:
+        """
+        Fingerprints of the reviews already stored for a product, used by
+        incremental scrapes to skip reviews that were scraped before.
+
+        Returns:
+            set: Review fingerprints, empty if nothing is stored
+        """
+        collection_name = product_name.replace(" ", "_")
+        fields = REVIEW_KEY_FIELDS + [REVIEW_KEY_COLUMN]
+        if self.is_online():
+            try:
+                return self._keys_of(pd.DataFrame(self.mongo_ins.find_fields(collection_name, fields)))
+            except Exception as mongo_error:
+                print(f"MongoDB operation error during get_known_review_keys: {mongo_error}")
+
+        return self.local_store.known_keys(collection_name)
+
+    def get_fingerprint(self, product_name: str):
+        """
+        Fingerprint of the stored reviews of a product, it changes whenever
+        reviews are added or updated. Used to key the DashboardCache.
+
+        Returns:
+            tuple: Review count, newest document id and number of bulk
+                writes in MongoDB, or size and modification time of the
+                local store. None when neither can be read.
+        """
+        collection_name = product_name.replace(" ", "_")
+        if self.is_online():
+            try:
+                return ("mongo",) + self.mongo_ins.fingerprint(collection_name)
+            except Exception as mongo_error:
+                print(f"MongoDB operation error during get_fingerprint: {mongo_error}")
+
+        fingerprint = self.local_store.fingerprint(collection_name)
+        return None if fingerprint is None else ("local",) + fingerprint
+
+    def catalog_entries(self, limit: int = None) -> list:
+        """
+        Catalog entries of the stored products, most recently scraped first,
+        from MongoDB or the local catalog when offline. An empty catalog is
+        filled from the stored collections first, see rebuild_catalog.
+
+        Returns:
+            list: Dicts with the product_name, slug (its collection name),
+                review_count, last_scraped time in UTC, avg_rating and
+                rating_counts of each product
+        """
+        def read(catalog):
+            if not len(catalog):
+                self.rebuild_catalog(online=catalog is self.catalog)
+            return catalog.entries(limit)
+
+        return self._read_catalog(read, "catalog_entries")
+
+    def list_products(self) -> list:
+        """
+        Names of the products with stored reviews, most recently scraped
+        first, as they were searched for.
+        """
+        return [entry["product_name"] for entry in self.catalog_entries()]
+
+    def search_products(self, prefix: str, limit: int = CATALOG_SEARCH_LIMIT) -> list:
+        """
+        Catalog entries of the products whose name starts with ``prefix``,
+        ignoring case, see catalog_entries.
+        """
+        return self._read_catalog(lambda catalog: catalog.search(prefix, limit), "search_products")
+
+    def get_catalog_entry(self, product_name: str):
+        """
+        Catalog entry of a product, see catalog_entries. A single indexed
+        lookup, used to check how fresh the stored reviews are.
+
+        Returns:
+            dict: The entry, None if the product was never stored
+        """
+        collection_name = product_name.replace(" ", "_")
+        return self._read_catalog(lambda catalog: catalog.get(collection_name), "get_catalog_entry")
+
     def get_reviews(self,
-                    product_name: str):
+                    product_name: str,
+                    columns: list = None,
+                    min_rating: float = None,
+                    max_rating: float = None,
+                    date_from=None,
+                    date_to=None,
+                    limit: int = None,
+                    batch_size: int = REVIEW_READ_BATCH_SIZE,
+                    skip_duplicates: bool = False) -> pd.DataFrame:
+        """
+        Load the stored reviews of a product, see iter_reviews for the filters.
+
+        Returns:
+            pd.DataFrame: The matching reviews, empty if none are stored
+        """
+        try:
+            batches = list(self.iter_reviews(product_name, columns=columns,
+                                             min_rating=min_rating, max_rating=max_rating,
+                                             date_from=date_from, date_to=date_to,
+                                             limit=limit, batch_size=batch_size,
+                                             skip_duplicates=skip_duplicates))
+            if not batches:
+                return pd.DataFrame(columns=columns)
+            # Concatenating loses the categorical product names, restore them
+            data = normalize_reviews(pd.concat(batches, ignore_index=True))
+            print(f"Successfully loaded {len(data)} reviews for {product_name}")
+            return data
+
+        except ValueError as ve:
+            # Re-raise validation errors
+            raise CustomException(ve, sys)
+        except Exception as e:
+            # Handle other unexpected errors
+            print(f"Unexpected error in get_reviews: {e}")
+            raise CustomException(e, sys)
+
+    def get_review_summaries(self,
+                             product_name: str,
+                             min_rating: float = None,
+                             max_rating: float = None,
+                             top_k: int = TOP_REVIEWS,
+                             skip_duplicates: bool = False) -> list:
+        """
+        Per-product statistics for the analysis dashboard.
+
+        In MongoDB they are computed by an aggregation pipeline, so only one
+        small document per product is transferred instead of every review.
+        When the aggregation is not available they are computed from the
+        reviews loaded with get_reviews, and offline by the local store.
+
+        Args:
+            product_name: Product the reviews were scraped for
+            min_rating: Lowest review Rating to include
+            max_rating: Highest review Rating to include
+            top_k: Number of positive and negative reviews per product
+            skip_duplicates: Leave out the reviews flagged in DUPLICATE_COLUMN
+
+        Returns:
+            list: One ProductSummary per product
+        """
         try:
             # Check if product_name is empty or None
             if not product_name or product_name.strip() == "":
                 raise ValueError("Product name cannot be empty")
-                
+
             # Replace spaces with underscores for collection name
             collection_name = product_name.replace(" ", "_")
-            
-            # Verify collection name is not empty
-            if not collection_name or collection_name.strip() == "":
-                raise ValueError("Collection name cannot be empty")
-            
-            # Check if we're in offline mode
-            if self.offline_mode or self.mongo_ins is None:
-                print(f"Warning: Operating in offline mode. Attempting to load reviews from local backup.")
-                try:
-                    import os
-                    backup_dir = os.path.join(os.getcwd(), "data_backup")
-                    backup_file = os.path.join(backup_dir, f"{collection_name}.csv")
-                    if os.path.exists(backup_file):
-                        data = pd.read_csv(backup_file)
-                        print(f"Successfully loaded {len(data)} reviews from local backup")
-                        return data
-                    else:
-                        print(f"No local backup found for {product_name}")
-                        return pd.DataFrame()
-                except Exception as local_e:
-                    print(f"Error loading reviews from local backup: {local_e}")
-                    return pd.DataFrame()
-            
+
+            if not self.is_online():
+                # Computed by the local store, with SQL in the SQLite backend
+                return self.local_store.summaries(collection_name, min_rating=min_rating,
+                                                  max_rating=max_rating, top_k=top_k,
+                                                  skip_duplicates=skip_duplicates)
+
             try:
-                # Add timeout handling for MongoDB operations
-                data = self.mongo_ins.find(collection_name=collection_name)
-                return data
+                query = _rating_query(min_rating, max_rating)
+                if skip_duplicates:
+                    query = _skip_duplicates(query)
+                pipeline = summary_pipeline(query, top_k=top_k)
+                result = self.mongo_ins.aggregate(collection_name, pipeline)
+                return summaries_from_aggregation(result[0]) if result else []
             except Exception as mongo_error:
-                # Handle MongoDB connection errors specifically
-                print(f"MongoDB operation error: {mongo_error}")
-                # Try to load from local backup if MongoDB fails
-                try:
-                    import os
-                    backup_dir = os.path.join(os.getcwd(), "data_backup")
-                    backup_file = os.path.join(backup_dir, f"{collection_name}.csv")
-                    if os.path.exists(backup_file):
-                        data = pd.read_csv(backup_file)
-                        print(f"Successfully loaded {len(data)} reviews from local backup")
-                        return data
-                    else:
-                        print(f"No local backup found for {product_name}")
-                        return pd.DataFrame()
-                except Exception as local_e:
-                    print(f"Error loading reviews from local backup: {local_e}")
-                    # Return empty DataFrame instead of raising an exception
-                    return pd.DataFrame()
+                # $topN needs MongoDB 5.2, older servers fall back too
+                print(f"MongoDB aggregation error during get_review_summaries: {mongo_error}")
+                print("Computing the summaries from the stored reviews...")
+
+            reviews = self.get_reviews(product_name, columns=SUMMARY_COLUMNS,
+                                       min_rating=min_rating, max_rating=max_rating,
+                                       skip_duplicates=skip_duplicates)
+            return summaries_from_frame(reviews, top_k=top_k)
 
+        except CustomException:
+            raise
         except ValueError as ve:
             # Re-raise validation errors
             raise CustomException(ve, sys)
         except Exception as e:
             # Handle other unexpected errors
-            print(f"Unexpected error in get_reviews: {e}")
+            print(f"Unexpected error in get_review_summaries: {e}")
             raise CustomException(e, sys)
+
+    def iter_reviews(self,
+                     product_name: str,
+                     columns: list = None,
+                     min_rating: float = None,
+                     max_rating: float = None,
+                     date_from=None,
+                     date_to=None,
+                     limit: int = None,
+                     batch_size: int = REVIEW_READ_BATCH_SIZE,
+                     skip_duplicates: bool = False,
+                     normalize: bool = True):
+        """
+        Stream the stored reviews of a product in batches, normalized to
+        REVIEW_DTYPES.
+
+        In MongoDB the projection, rating filter and limit run on the server
+        and documents are read through a batched cursor, so only the requested
+        columns and rows ever reach Python, one batch at a time. The local
+        store only decodes the requested columns and pushes the filters down
+        to its Parquet files.
+
+        Args:
+            product_name: Product the reviews were scraped for
+            columns: Columns to load, None for all
+            min_rating: Lowest review Rating to include
+            max_rating: Highest review Rating to include
+            date_from: Earliest review Date to include
+            date_to: Latest review Date to include
+            limit: Maximum number of reviews
+            batch_size: Reviews per batch
+            skip_duplicates: Leave out the reviews flagged in DUPLICATE_COLUMN
+            normalize: False yields the values as stored, e.g. the dates
+                as scraped of reviews stored before dates were typed
+
+        Yields:
+            pd.DataFrame: Batches of matching reviews
+        """
+        # Check if product_name is empty or None
+        if not product_name or product_name.strip() == "":
+            raise ValueError("Product name cannot be empty")
+
+        # Replace spaces with underscores for collection name
+        collection_name = product_name.replace(" ", "_")
+
+        filters = dict(min_rating=min_rating, max_rating=max_rating,
+                       date_from=date_from, date_to=date_to, skip_duplicates=skip_duplicates)
+
+        if self.is_online():
+            yielded = False
+            try:
+                for batch in self._iter_mongo_reviews(collection_name, columns, limit,
+                                                      batch_size, **filters):
+                    yielded = True
+                    yield normalize_reviews(batch) if normalize else batch
+                return
+            except Exception as mongo_error:
+                # Falling back half way through would repeat reviews
+                if yielded:
+                    raise
+                print(f"MongoDB operation error: {mongo_error}")
+                print("Attempting to load reviews from local backup...")
+        else:
+            print(f"Warning: Operating in offline mode. Attempting to load reviews from local backup.")
+
+        if not self.local_store.exists(collection_name):
+            print(f"No local backup found for {product_name}")
+            return
+        for batch in self.local_store.iter_reviews(collection_name, columns, limit, batch_size,
+                                                   **filters):
+            batch, _ = _finish_batch(batch, columns, None)
+            yield normalize_reviews(batch) if normalize else batch
+
+    def _iter_mongo_reviews(self, collection_name: str, columns: list, limit: int,
+                            batch_size: int, min_rating=None, max_rating=None,
+                            date_from=None, date_to=None, skip_duplicates: bool = False):
+        query = _rating_query(min_rating, max_rating)
+        if skip_duplicates:
+            query = _skip_duplicates(query)
+        filter_dates = date_from is not None or date_to is not None
+        if filter_dates:
+            date_query = _date_query(date_from, date_to)
+            query = {"$and": [query, date_query]} if query else date_query
+
+        # Reviews stored before dates were typed keep their dates as text,
+        # those are filtered once loaded, so the limit can only be applied
+        # on the server without a date filter
+        fields = None
+        if columns is not None:
+            fields = list(columns) + (["Date"] if filter_dates and "Date" not in columns else [])
+
+        remaining = limit
+        for documents in self.mongo_ins.iter_batches(collection_name, query=query, fields=fields,
+                                                     limit=None if filter_dates else limit,
+                                                     batch_size=batch_size):
+            batch = pd.DataFrame(documents)
+            if filter_dates:
+                batch = _filter_reviews(batch, date_from=date_from, date_to=date_to)
+            batch, remaining = _finish_batch(batch, columns, remaining)
+            if not batch.empty:
+                yield batch
+            if remaining == 0:
+                break
+
+
+def _rating_query(min_rating=None, max_rating=None) -> dict:
+    """MongoDB filter on the review Rating, empty without bounds."""
+    rating_bounds = []
+    # Ratings may be stored as text, compare them as numbers
+    rating = {"$convert": {"input": "$Rating", "to": "double", "onError": None, "onNull": None}}
+    if min_rating is not None:
+        rating_bounds.append({"$gte": [rating, min_rating]})
+    if max_rating is not None:
+        rating_bounds.append({"$lte": [rating, max_rating]})
+    return {"$expr": {"$and": rating_bounds}} if rating_bounds else {}
+
+
+def _skip_duplicates(query: dict) -> dict:
+    """``query`` restricted to reviews without DUPLICATE_COLUMN, stored before it or not flagged."""
+    unflagged = {DUPLICATE_COLUMN: None}
+    return {"$and": [query, unflagged]} if query else unflagged
+
+
+def _date_query(date_from=None, date_to=None) -> dict:
+    """
+    MongoDB filter on the review Date. Dates stored as text by older
+    versions cannot be compared on the server and are let through.
+    """
+    bounds = {}
+    if date_from is not None:
+        bounds["$gte"] = pd.Timestamp(date_from).to_pydatetime()
+    if date_to is not None:
+        bounds["$lte"] = pd.Timestamp(date_to).to_pydatetime()
+    return {"$or": [{"Date": bounds}, {"Date": {"$type": "string"}}]}
+
+
+def _filter_reviews(reviews: pd.DataFrame, min_rating=None, max_rating=None,
+                    date_from=None, date_to=None) -> pd.DataFrame:
+    """Apply the review filters of MongoIO.iter_reviews to a loaded batch."""
+    mask = pd.Series(True, index=reviews.index)
+    if (min_rating is not None or max_rating is not None) and "Rating" in reviews:
+        rating = parse_numbers(reviews["Rating"])
+        if min_rating is not None:
+            mask &= rating >= min_rating
+        if max_rating is not None:
+            mask &= rating <= max_rating
+    if (date_from is not None or date_to is not None) and "Date" in reviews:
+        dates = parse_review_dates(reviews["Date"])
+        if date_from is not None:
+            mask &= dates >= pd.Timestamp(date_from)
+        if date_to is not None:
+            mask &= dates <= pd.Timestamp(date_to)
+    return reviews[mask]
+
+
+def _finish_batch(batch: pd.DataFrame, columns: list, remaining: int):
+    """Select the requested columns and apply what is left of the limit."""
+    if columns is not None:
+        batch = batch.reindex(columns=columns)
+    if remaining is not None:
+        batch = batch.head(remaining)
+        remaining -= len(batch)
+    return batch, remaining
+
+
+_shared_mongo_io = None
+_shared_mongo_io_lock = threading.Lock()
+
+
+def get_mongo_io() -> MongoIO:
+    """
+    Return the MongoIO shared by the whole process, so Streamlit reruns,
+    sessions and pages reuse one connection pool instead of building their own.
+    """
+    global _shared_mongo_io
+    if _shared_mongo_io is None:
+        with _shared_mongo_io_lock:
+            if _shared_mongo_io is None:
+                _shared_mongo_io = MongoIO()
+    return _shared_mongo_io
@@ -0,0 +1,134 @@
+import re
+
+import pandas as pd
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+
+from src.constants import CATALOG_COLLECTION, CATALOG_SEARCH_LIMIT
+from src.data_report.summary import rating_count_pipeline
+from src.review_schema import parse_numbers
+from src.storage.catalog import _rating_text, search_key, utc_now
+
+
+class MongoCatalog:
+    """
+    Catalog of the products stored in MongoDB, see LocalCatalog.
+
+    Entries live in CATALOG_COLLECTION keyed by the product's collection
+    name, with indexes on the search key and the scrape time, so lookups and
+    prefix searches never list or scan the review collections.
+    """
+
+    def __init__(self, mongo_ins, collection_name: str = CATALOG_COLLECTION):
+        """
+        Args:
+            mongo_ins: mongo_operation of the database
+            collection_name: Collection holding the catalog
+        """
+        self.mongo_ins = mongo_ins
+        self.collection_name = collection_name
+        self._indexed = False
+
+    @property
+    def collection(self):
+        return self.mongo_ins.db[self.collection_name]
+
+    def _ensure_indexes(self):
+        if self._indexed:
+            return
+        with self.mongo_ins.manager.guard():
+            self.collection.create_index([("search_key", ASCENDING)])
+            self.collection.create_index([("last_scraped", DESCENDING)])
+        self._indexed = True
+
+    @staticmethod
+    def _entry(document: dict) -> dict:
+        document["slug"] = document.pop("_id")
+        return document
+
+    def rating_counts(self, collection_name: str) -> tuple:
+        """
+        Count the stored reviews of a product on the server, which reads the
+        whole collection. Only used to fill or repair an entry, writes are
+        counted with add_reviews.
+
+        Returns:
+            tuple: Number of reviews and Rating -> number of reviews
+        """
+        counts = {row["_id"]: row["count"]
+                  for row in self.mongo_ins.aggregate(collection_name, rating_count_pipeline())}
+        return sum(counts.values()), counts
+
+    def add_reviews(self, collection_name: str, reviews: pd.DataFrame, product_name: str = None,
+                    last_scraped=None) -> bool:
+        """
+        Count newly stored reviews into the entry of a product with $inc,
+        instead of counting the whole collection again, see rating_counts.
+
+        Args:
+            collection_name: Collection holding the reviews
+            reviews: Reviews that were not stored before
+            product_name: Product search the reviews were scraped for, None
+                keeps the name already in the catalog
+            last_scraped: Time the reviews were stored, defaults to now
+
+        Returns:
+            bool: False when the product has no entry to add to, or a rating
+                cannot be a field name, and it has to be counted instead
+        """
+        ratings = parse_numbers(reviews["Rating"]).dropna() if "Rating" in reviews else pd.Series(dtype=float)
+        counts = {_rating_text(rating): int(count) for rating, count in ratings.value_counts().items()}
+        if any("." in rating for rating in counts):
+            return False
+        increments = {"review_count": len(reviews)}
+        increments.update({f"rating_counts.{rating}": count for rating, count in counts.items()})
+        fields = {"last_scraped": last_scraped or utc_now()}
+        if product_name is not None:
+            fields.update(product_name=product_name, search_key=search_key(product_name))
+
+        self._ensure_indexes()
+        with self.mongo_ins.manager.guard():
+            document = self.collection.find_one_and_update(
+                {"_id": collection_name}, {"$inc": increments, "$set": fields},
+                return_document=ReturnDocument.AFTER)
+            if document is None:
+                return False
+            rated = {float(rating): count for rating, count in document["rating_counts"].items()}
+            total = sum(rated.values())
+            avg_rating = sum(rating * count for rating, count in rated.items()) / total if total else None
+            self.collection.update_one({"_id": collection_name}, {"$set": {"avg_rating": avg_rating}})
+        return True
+
+    def update(self, entry: dict):
+        """Add or replace the entry of a product, see catalog_entry."""
+        self._ensure_indexes()
+        document = {field: value for field, value in entry.items() if field != "slug"}
+        with self.mongo_ins.manager.guard():
+            self.collection.replace_one({"_id": entry["slug"]}, document, upsert=True)
+
+    def get(self, collection_name: str):
+        """The entry of a product, None if it is not in the catalog."""
+        with self.mongo_ins.manager.guard():
+            document = self.collection.find_one({"_id": collection_name})
+        return None if document is None else self._entry(document)
+
+    def search(self, prefix: str, limit: int = CATALOG_SEARCH_LIMIT) -> list:
+        """Entries whose product name starts with ``prefix``, ignoring case."""
+        self._ensure_indexes()
+        # An anchored, case sensitive regex on the lower case key is an index range scan
+        query = {"search_key": {"$regex": "^" + re.escape(search_key(prefix))}}
+        with self.mongo_ins.manager.guard():
+            cursor = self.collection.find(query).sort("search_key", ASCENDING).limit(limit)
+            return [self._entry(document) for document in cursor]
+
+    def entries(self, limit: int = None) -> list:
+        """Every entry, most recently scraped first."""
+        self._ensure_indexes()
+        with self.mongo_ins.manager.guard():
+            cursor = self.collection.find().sort("last_scraped", DESCENDING)
+            if limit:
+                cursor = cursor.limit(limit)
+            return [self._entry(document) for document in cursor]
+
+    def __len__(self):
+        with self.mongo_ins.manager.guard():
+            return self.collection.estimated_document_count()
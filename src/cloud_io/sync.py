@@ -0,0 +1,117 @@
+import random
+import threading
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from src.constants import (REVIEW_KEY_COLUMN, SYNC_INTERVAL, SYNC_MAX_BACKOFF,
+                           SYNC_BATCH_ENTRIES)
+from src.data_report.cache import get_dashboard_cache
+from src.storage.journal import WriteJournal
+from src.telemetry import inc, span
+
+
+class SyncWorker(threading.Thread):
+    """
+    Background thread writing journaled reviews to MongoDB.
+
+    Every round it reconnects if needed, claims a batch of journal entries,
+    merges the entries of each collection into one chunked bulk upsert and
+    acknowledges what was written. Failed rounds are retried with jittered
+    exponential backoff, and a successful one brings the MongoIO back online.
+    """
+
+    def __init__(self, mongo_io, journal: WriteJournal,
+                 interval: float = SYNC_INTERVAL,
+                 max_backoff: float = SYNC_MAX_BACKOFF,
+                 batch_entries: int = SYNC_BATCH_ENTRIES):
+        super().__init__(name="mongo-sync", daemon=True)
+        self.mongo_io = mongo_io
+        self.journal = journal
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self.batch_entries = batch_entries
+        self.synced = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    def wake(self):
+        """Sync now instead of at the next interval, e.g. after a new write."""
+        self._wake.set()
+
+    def stop(self, timeout: float = None):
+        self._stop.set()
+        self._wake.set()
+        self.join(timeout)
+
+    def run(self):
+        delay = 0
+        while not self._stop.is_set():
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                while self.sync_once() == self.batch_entries:
+                    # A full batch, more entries are likely waiting
+                    pass
+                delay = self.interval
+            except Exception as e:
+                delay = min(self.max_backoff, max(self.interval, delay * 2))
+                # Jitter keeps several processes from retrying in lockstep
+                delay *= random.uniform(0.5, 1.0)
+                print(f"Sync to MongoDB failed, retrying in {delay:.0f}s: {e}")
+
+    def sync_once(self) -> int:
+        """
+        Write one batch of journal entries to MongoDB.
+
+        Returns:
+            int: Number of entries written
+
+        Raises:
+            ConnectionError: MongoDB cannot be reached, nothing was claimed
+        """
+        if self.journal.pending()[0] == 0:
+            return 0
+        if not self.mongo_io.reconnect():
+            raise ConnectionError("MongoDB is unavailable")
+
+        entries = self.journal.claim(self.batch_entries)
+        by_collection = {}
+        for entry in entries:
+            by_collection.setdefault(entry.collection_name, []).append(entry)
+
+        acked = set()
+        try:
+            for collection_name, collection_entries in by_collection.items():
+                ids = [entry.entry_id for entry in collection_entries]
+                reviews = pd.concat([entry.reviews for entry in collection_entries], ignore_index=True)
+                with span("sync_to_mongodb") as fields:
+                    report = self.mongo_io.mongo_ins.bulk_insert(reviews, collection_name,
+                                                                 upsert_key=REVIEW_KEY_COLUMN)
+                    fields["reviews"] = report.written
+                inc("synced_reviews_total", report.written)
+                # Documents MongoDB rejected would fail again, they are reported and dropped
+                if report.failed:
+                    print(f"Sync of {collection_name}: {report.failed} reviews rejected by MongoDB")
+                self.journal.ack(ids)
+                acked.update(ids)
+                get_dashboard_cache().invalidate(collection_name)
+                # The newest entry names the product and dates the scrape
+                latest = collection_entries[-1]
+                product_name = next((entry.product_name for entry in reversed(collection_entries)
+                                     if entry.product_name), None)
+                last_scraped = None
+                if latest.created_at is not None:
+                    last_scraped = datetime.fromtimestamp(latest.created_at, timezone.utc).replace(tzinfo=None)
+                self.mongo_io.update_catalog(collection_name, product_name, online=True,
+                                             last_scraped=last_scraped,
+                                             new_reviews=reviews.iloc[report.new_positions])
+                self.synced += report.written
+                print(f"Synced {report.written} reviews of {collection_name} to MongoDB")
+        except Exception:
+            # Retried by the next round rather than after the lease
+            self.journal.release([entry.entry_id for entry in entries if entry.entry_id not in acked])
+            raise
+        return len(entries)
@@ -1,3 +1,155 @@
 MONGO_DATABASE_NAME: str = "myntra-reviews"
 
-SESSION_PRODUCT_KEY: str = "product_name"
\ No newline at end of file
+SESSION_PRODUCT_KEY: str = "product_name"
+
+MYNTRA_BASE_URL: str = "https://www.myntra.com/"
+
+MAX_SCRAPE_WORKERS: int = 8
+
+# Browser sessions, see BrowserPool. Set the BROWSER_HEADLESS environment
+# variable to 0 to watch the browsers while debugging
+BROWSER_HEADLESS: bool = True
+# Most browsers kept by the process-wide pool, which grows to the number of
+# workers scrapes ask for. They are reused by every scrape
+BROWSER_POOL_SIZE: int = MAX_SCRAPE_WORKERS
+# Browsers a job worker process starts while waiting for its first job, 0 to
+# only start them when a job needs one
+BROWSER_WARM_COUNT: int = 1
+# Browsers are restarted after this many checkouts or seconds, bounding their memory
+BROWSER_MAX_USES: int = 50
+BROWSER_MAX_AGE: float = 30 * 60.0
+# Resource types browsers never download, the scraper only reads the HTML
+BROWSER_BLOCKED_RESOURCES: tuple = ("image", "font", "stylesheet", "media")
+
+# Written by the review parser in place of missing review fields
+NO_RATING: str = "No rating Given"
+NO_COMMENT: str = "No comment Given"
+NO_NAME: str = "No Name given"
+NO_DATE: str = "No Date given"
+
+REVIEW_CARD_CLASS: str = "user-review-userReviewWrapper"
+REVIEW_CARD_SELECTOR: str = f".detailed-reviews-userReviewsContainer .{REVIEW_CARD_CLASS}"
+
+# Review list loading limits, in seconds
+REVIEW_LOAD_TIMEOUT: float = 120.0
+REVIEW_IDLE_TIMEOUT: float = 2.0
+REVIEW_POLL_INTERVAL: float = 0.1
+
+FETCH_ENGINES: tuple = ("browser", "http", "auto")
+
+HTTP_TIMEOUT: float = 15.0
+HTTP_USER_AGENT: str = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36"
+)
+
+REVIEW_COLUMNS: list = [
+    "Product Name",
+    "Over_All_Rating",
+    "Price",
+    "Date",
+    "Rating",
+    "Name",
+    "Comment",
+]
+
+# Scraped page cache, TTLs in seconds per page type
+PAGE_CACHE_DIR: str = ".page_cache"
+PAGE_CACHE_MAX_BYTES: int = 200 * 1024 * 1024
+PAGE_CACHE_TTL: dict = {
+    "search": 60 * 60,
+    "product": 6 * 60 * 60,
+    "reviews": 60 * 60,
+}
+
+REVIEW_KEY_COLUMN: str = "Review_Key"
+
+# MongoDB connection pool and failure handling, timeouts in milliseconds
+MONGO_MAX_POOL_SIZE: int = 50
+MONGO_MIN_POOL_SIZE: int = 0
+MONGO_MAX_IDLE_TIME_MS: int = 5 * 60 * 1000
+MONGO_CONNECT_TIMEOUT_MS: int = 5000
+MONGO_SOCKET_TIMEOUT_MS: int = 20000
+MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+MONGO_BREAKER_FAILURE_THRESHOLD: int = 3
+MONGO_BREAKER_RESET_SECONDS: float = 30.0
+MONGO_HEALTH_CHECK_INTERVAL: float = 15.0
+MONGO_BULK_CHUNK_SIZE: int = 1000
+REVIEW_READ_BATCH_SIZE: int = 5000
+
+REVIEW_DATE_FORMAT: str = "%d %b %Y"
+REVIEW_DATE_FORMAT_LONG: str = "%d %B %Y"
+
+# Loaded reviews, summaries and dashboards kept in memory, least recently used are evicted first
+DASHBOARD_CACHE_MAX_ENTRIES: int = 32
+
+# Local review store, used offline and when MongoDB is unavailable. The
+# backend can be overridden with the REVIEW_STORE_BACKEND environment variable
+REVIEW_STORE_BACKENDS: tuple = ("parquet", "sqlite")
+REVIEW_STORE_BACKEND: str = "parquet"
+LOCAL_STORE_DIR: str = "data_backup"
+LOCAL_STORE_COMPRESSION: str = "zstd"
+# Appended partitions of a product are merged into one past this count
+LOCAL_STORE_MAX_PARTITIONS: int = 32
+
+# Write-behind sync of stored reviews to MongoDB
+SYNC_INTERVAL: float = 5.0
+SYNC_MAX_BACKOFF: float = 300.0
+# Journal entries merged into one round of bulk writes
+SYNC_BATCH_ENTRIES: int = 50
+# Seconds a claimed entry is reserved for one sync worker
+SYNC_LEASE_SECONDS: float = 120.0
+
+# Product catalog, one entry per product search kept up to date on every write
+CATALOG_COLLECTION: str = "product_catalog"
+# Number of bulk writes of every review collection, part of its fingerprint so
+# that upserts updating stored reviews invalidate cached dashboards
+WRITE_COUNTER_COLLECTION: str = "write_counters"
+# Products suggested by a prefix search
+CATALOG_SEARCH_LIMIT: int = 20
+
+# Background scrape jobs, see src.jobs. The number of worker processes
+# started by the app can be overridden with the SCRAPE_JOB_WORKERS
+# environment variable, 0 leaves the jobs to `python -m src.jobs`
+JOB_STATUSES: tuple = ("queued", "running", "done", "failed", "cancelled")
+JOB_WORKERS: int = 2
+# Seconds an idle worker waits before looking for new jobs
+JOB_POLL_INTERVAL: float = 2.0
+# Seconds a running job is reserved for its worker, renewed after every product
+JOB_LEASE_SECONDS: float = 600.0
+# Runs of a job before it is marked failed
+JOB_MAX_ATTEMPTS: int = 3
+
+# Scrape instrumentation, see src.telemetry. Finished spans are appended to
+# metrics.jsonl in LOCAL_STORE_DIR, the METRICS_LOG environment variable
+# overrides the path and an empty value disables the log. Set METRICS_PORT to
+# serve the metrics in the Prometheus text format
+METRICS_PREFIX: str = "myntra"
+# The log is rotated to a single ".1" file past this size
+METRICS_LOG_MAX_BYTES: int = 20 * 1024 * 1024
+# Upper bounds of the span duration histogram buckets, in seconds
+METRICS_SPAN_BUCKETS: tuple = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Review text analytics, see src.text_analytics. The sentiment of every review
+# is computed when it is stored and kept in SENTIMENT_COLUMN, from -1 to 1
+SENTIMENT_COLUMN: str = "Sentiment"
+# Reviews scoring above this are positive, below its opposite negative
+SENTIMENT_THRESHOLD: float = 0.05
+KEYWORDS_PER_PRODUCT: int = 10
+# Words and phrases mentioned by fewer reviews of a product are not keywords
+KEYWORD_MIN_REVIEWS: int = 2
+
+# Duplicate reviews, see src.dedup. A review repeating an earlier review of the
+# same product has the fingerprint of that review in DUPLICATE_COLUMN
+DUPLICATE_COLUMN: str = "Duplicate Of"
+# Estimated Jaccard similarity of the comments' character shingles above which
+# two reviews are near duplicates
+DUPLICATE_SIMILARITY: float = 0.8
+# Shorter comments ("Nice product") are too common to tell copies apart
+DUPLICATE_MIN_WORDS: int = 5
+# Characters per shingle, MinHash signature length and LSH bands. Signatures
+# split into bands of MINHASH_PERMUTATIONS / LSH_BANDS values, reviews sharing
+# a band are compared. Changing these needs the index to be deleted
+SHINGLE_SIZE: int = 5
+MINHASH_PERMUTATIONS: int = 64
+LSH_BANDS: int = 16
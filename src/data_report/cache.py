@@ -0,0 +1,80 @@
+import threading
+from collections import OrderedDict
+
+from src.constants import DASHBOARD_CACHE_MAX_ENTRIES
+
+
+class DashboardCache:
+    """
+    In-memory LRU cache of loaded reviews, summaries and dashboards.
+
+    Entries are keyed by product collection, what was computed and the
+    fingerprint of the stored reviews (see MongoIO.get_fingerprint), so an
+    entry is only reused while the reviews it was computed from are unchanged.
+    store_reviews also invalidates the collection it writes to.
+    """
+
+    def __init__(self, max_entries: int = DASHBOARD_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, collection_name: str, key: tuple, fingerprint, compute):
+        """
+        Args:
+            collection_name: Collection the value is computed from
+            key: What is computed, including its parameters
+            fingerprint: Fingerprint of the stored reviews, None to skip the cache
+            compute: Called without arguments on a miss
+
+        Returns:
+            The cached or computed value
+        """
+        if fingerprint is None:
+            return compute()
+
+        entry_key = (collection_name, key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # Computed outside the lock, so one slow load does not block others
+        value = compute()
+        with self._lock:
+            self._entries[entry_key] = (fingerprint, value)
+            self._entries.move_to_end(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, collection_name: str = None):
+        """Drop the entries of a collection, or every entry."""
+        with self._lock:
+            if collection_name is None:
+                self._entries.clear()
+                return
+            for entry_key in [key for key in self._entries if key[0] == collection_name]:
+                del self._entries[entry_key]
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_shared_dashboard_cache = None
+_shared_dashboard_cache_lock = threading.Lock()
+
+
+def get_dashboard_cache() -> DashboardCache:
+    """Return the DashboardCache shared by every session of the process."""
+    global _shared_dashboard_cache
+    if _shared_dashboard_cache is None:
+        with _shared_dashboard_cache_lock:
+            if _shared_dashboard_cache is None:
+                _shared_dashboard_cache = DashboardCache()
+    return _shared_dashboard_cache
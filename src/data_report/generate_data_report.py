@@ -1,77 +1,145 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 
 import os, sys
 from src.exception import CustomException
+from src.data_report.summary import summaries_from_frame
+from src.text_analytics import analyze_reviews
+
+
+def _or_nan(value) -> float:
+    return float("nan") if value is None else value
 
 
 class DashboardGenerator:
-    def __init__(self, data):
+    def __init__(self, data, summaries: list = None):
+        """
+        Args:
+            data: Reviews of the products
+            summaries: ProductSummary per product, e.g. aggregated on the server
+                by MongoIO.get_review_summaries. Computed from ``data`` in a
+                single grouped pass when not given.
+        """
         self.data = data
+        self.summaries = summaries if summaries is not None else summaries_from_frame(data)
+        self._figures = None
+        self._text_insights = None
+
+    def figures(self) -> tuple:
+        """
+        The general information charts, built once per dashboard so a
+        cached dashboard redraws without rebuilding them.
+        """
+        if self._figures is None:
+            # Plotly is only loaded once a dashboard is drawn
+            import plotly.express as px
+
+            # Summary pie chart of average ratings by product
+            product_ratings = pd.DataFrame(
+                [(summary.product_name, summary.avg_rating) for summary in self.summaries],
+                columns=['Product Name', 'Over_All_Rating']).dropna()
+            fig_pie = px.pie(product_ratings, values='Over_All_Rating', names='Product Name',
+                             title='Average Ratings by Product')
+
+            # Bar chart comparing average prices of different products with different colors
+            avg_prices = pd.DataFrame(
+                [(summary.product_name, summary.avg_price) for summary in self.summaries],
+                columns=['Product Name', 'Price']).dropna()
+            fig_bar = px.bar(avg_prices, x='Product Name', y='Price', color='Product Name',
+                             title='Average Price Comparison Between Products',
+                             color_discrete_sequence=px.colors.qualitative.Bold)
+            fig_bar.update_xaxes(title='Product Name')
+            fig_bar.update_yaxes(title='Average Price')
+            self._figures = (fig_pie, fig_bar)
+        return self._figures
+
+    def text_insights(self):
+        """
+        Sentiment, keywords and aspects of the comments, see analyze_reviews.
+        Computed once per dashboard, from the sentiment stored with each review.
+        """
+        if self._text_insights is None:
+            self._text_insights = analyze_reviews(self.data)
+        return self._text_insights
 
     def display_general_info(self):
         st.header('General Information')
 
-        # Convert 'Over_All_Rating' and 'Price' columns to numeric
-        self.data['Over_All_Rating'] = pd.to_numeric(self.data['Over_All_Rating'], errors='coerce')
-        self.data['Price'] = pd.to_numeric(
-            self.data['Price'].apply(lambda x: x.replace("₹", "")),
-            errors='coerce')
-
-        self.data["Rating"] = pd.to_numeric(self.data['Rating'], errors='coerce')
-
-        # Summary pie chart of average ratings by product
-        product_ratings = self.data.groupby('Product Name', as_index=False)['Over_All_Rating'].mean().dropna()
-
-        fig_pie = px.pie(product_ratings, values='Over_All_Rating', names='Product Name',
-                         title='Average Ratings by Product')
+        fig_pie, fig_bar = self.figures()
         st.plotly_chart(fig_pie)
-
-        # Bar chart comparing average prices of different products with different colors
-        avg_prices = self.data.groupby('Product Name', as_index=False)['Price'].mean().dropna()
-        fig_bar = px.bar(avg_prices, x='Product Name', y='Price', color='Product Name',
-                         title='Average Price Comparison Between Products',
-                         color_discrete_sequence=px.colors.qualitative.Bold)
-        fig_bar.update_xaxes(title='Product Name')
-        fig_bar.update_yaxes(title='Average Price')
         st.plotly_chart(fig_bar)
 
     def display_product_sections(self):
         st.header('Product Sections')
 
-        product_names = self.data['Product Name'].unique()
-        columns = st.columns(len(product_names))
-
-        for i, product_name in enumerate(product_names):
-            product_data = self.data[self.data['Product Name'] == product_name]
+        if not self.summaries:
+            return
+        columns = st.columns(len(self.summaries))
 
+        for i, summary in enumerate(self.summaries):
             with columns[i]:
-                st.subheader(f'{product_name}')
+                st.subheader(f'{summary.product_name}')
 
                 # Display price in text or markdown with emojis
-                avg_price = product_data['Price'].mean()
-                st.markdown(f"💰 Average Price: ₹{avg_price:.2f}")
+                st.markdown(f"💰 Average Price: ₹{_or_nan(summary.avg_price):.2f}")
 
                 # Display average rating
-                avg_rating = product_data['Over_All_Rating'].mean()
-                st.markdown(f"⭐ Average Rating: {avg_rating:.2f}")
+                st.markdown(f"⭐ Average Rating: {_or_nan(summary.avg_rating):.2f}")
 
                 # Display top positive comments with great ratings
-                positive_reviews = product_data[product_data['Rating'] >= 4.5].nlargest(5, 'Rating')
                 st.subheader('Positive Reviews')
-                for index, row in positive_reviews.iterrows():
-                    st.markdown(f"✨ Rating: {row['Rating']} - {row['Comment']}")
+                for review in summary.positive_reviews:
+                    st.markdown(f"✨ Rating: {review['Rating']} - {review['Comment']}")
 
                 # Display top negative comments with worst ratings
-                negative_reviews = product_data[product_data['Rating'] <= 2].nsmallest(5, 'Rating')
                 st.subheader('Negative Reviews')
-                for index, row in negative_reviews.iterrows():
-                    st.markdown(f"💢 Rating: {row['Rating']} - {row['Comment']}")
+                for review in summary.negative_reviews:
+                    st.markdown(f"💢 Rating: {review['Rating']} - {review['Comment']}")
 
                 # Display rating counts in different categories
                 st.subheader('Rating Counts')
-                rating_counts = product_data['Rating'].value_counts().sort_index(ascending=False)
-                for rating, count in rating_counts.items():
+                for rating, count in summary.rating_counts.items():
                     st.write(f"🔹 Rating {rating} count: {count}")
+
+    def display_text_insights(self):
+        st.header('What Reviewers Say')
+
+        if "Comment" not in self.data:
+            return
+        import plotly.express as px
+
+        insights = self.text_insights()
+        if insights.sentiment.empty:
+            st.info("No comments to analyse.")
+            return
+
+        # Share of positive, neutral and negative comments per product
+        shares = insights.sentiment.melt(id_vars='Product Name', value_vars=['Positive', 'Neutral', 'Negative'],
+                                         var_name='Sentiment', value_name='Share')
+        fig_sentiment = px.bar(shares, x='Share', y='Product Name', color='Sentiment', orientation='h',
+                               title='Sentiment of the Comments',
+                               color_discrete_map={'Positive': '#2ca02c', 'Neutral': '#bbbbbb',
+                                                   'Negative': '#d62728'})
+        fig_sentiment.update_xaxes(tickformat='.0%')
+        st.plotly_chart(fig_sentiment)
+
+        # Split once instead of filtering both frames for every product
+        keywords_by_product = dict(tuple(insights.keywords.groupby('Product Name', sort=False)))
+        aspects_by_product = dict(tuple(insights.aspects.groupby('Product Name', sort=False)))
+        for product_name in insights.sentiment['Product Name']:
+            st.subheader(f'{product_name}')
+
+            # Words and phrases used more in this product's reviews than elsewhere
+            keywords = keywords_by_product.get(product_name)
+            if keywords is not None:
+                st.markdown("🔑 Keywords: " + ", ".join(
+                    f"{keyword} ({reviews})" for keyword, reviews in zip(keywords['Keyword'], keywords['Reviews'])))
+
+            # How often each aspect comes up, coloured by how reviewers feel about it
+            aspects = aspects_by_product.get(product_name)
+            if aspects is not None:
+                fig_aspects = px.bar(aspects, x='Aspect', y='Share', color='Sentiment',
+                                     color_continuous_scale='RdYlGn', range_color=(-1, 1),
+                                     hover_data=['Reviews'], title='Aspects Mentioned')
+                fig_aspects.update_yaxes(title='Share of Reviews', tickformat='.0%')
+                st.plotly_chart(fig_aspects)
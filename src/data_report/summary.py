@@ -0,0 +1,191 @@
+import pandas as pd
+
+from src.review_schema import normalize_reviews
+
+# Columns the per-product summaries are computed from
+SUMMARY_COLUMNS = ["Product Name", "Over_All_Rating", "Price", "Rating", "Comment"]
+
+POSITIVE_RATING = 4.5
+NEGATIVE_RATING = 2
+TOP_REVIEWS = 5
+
+
+class ProductSummary:
+    """
+    Everything the dashboard shows for one product: average price and
+    rating, the rating histogram and the best and worst reviews.
+    """
+
+    def __init__(self,
+                 product_name: str,
+                 review_count: int,
+                 avg_price: float,
+                 avg_rating: float,
+                 rating_counts: dict,
+                 positive_reviews: list,
+                 negative_reviews: list):
+        self.product_name = product_name
+        self.review_count = review_count
+        self.avg_price = avg_price
+        self.avg_rating = avg_rating
+        # Rating -> number of reviews, highest rating first
+        self.rating_counts = rating_counts
+        # Dicts with the Rating and Comment of each review
+        self.positive_reviews = positive_reviews
+        self.negative_reviews = negative_reviews
+
+    def __repr__(self):
+        return (f"ProductSummary({self.product_name!r}, reviews={self.review_count}, "
+                f"avg_price={self.avg_price}, avg_rating={self.avg_rating})")
+
+
+def _number(value):
+    """None for missing values, ints for whole numbers, floats otherwise."""
+    if value is None or pd.isna(value):
+        return None
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def summaries_from_frame(data: pd.DataFrame, top_k: int = TOP_REVIEWS) -> list:
+    """
+    Compute the product summaries from raw reviews.
+
+    The statistics of every product come from a few grouped passes over all
+    reviews rather than from filtering the reviews once per product.
+
+    Returns:
+        list: One ProductSummary per product, in order of first appearance
+    """
+    if data is None or data.empty:
+        return []
+
+    data = normalize_reviews(data)
+    products = data.groupby("Product Name", sort=False, observed=True)
+    stats = products.agg(review_count=("Rating", "size"),
+                         avg_price=("Price", "mean"),
+                         avg_rating=("Over_All_Rating", "mean"))
+
+    rating_counts = {name: {} for name in stats.index}
+    histogram = (data.groupby(["Product Name", "Rating"], observed=True).size()
+                 .sort_index(level="Rating", ascending=False))
+    for (product_name, rating), count in histogram.items():
+        rating_counts[product_name][_number(rating)] = int(count)
+
+    positive = _top_reviews(data[data["Rating"] >= POSITIVE_RATING], top_k, ascending=False)
+    negative = _top_reviews(data[data["Rating"] <= NEGATIVE_RATING], top_k, ascending=True)
+
+    return [
+        ProductSummary(
+            product_name=product_name,
+            review_count=int(row.review_count),
+            avg_price=_number(row.avg_price),
+            avg_rating=_number(row.avg_rating),
+            rating_counts=rating_counts[product_name],
+            positive_reviews=positive.get(product_name, []),
+            negative_reviews=negative.get(product_name, []),
+        )
+        for product_name, row in zip(stats.index, stats.itertuples(index=False))
+    ]
+
+
+def _top_reviews(reviews: pd.DataFrame, top_k: int, ascending: bool) -> dict:
+    """The ``top_k`` highest or lowest rated reviews of each product."""
+    top = (reviews.sort_values("Rating", ascending=ascending, kind="stable")
+           .groupby("Product Name", sort=False, observed=True).head(top_k))
+    by_product = {}
+    for product_name, rating, comment in zip(top["Product Name"], top["Rating"], top["Comment"]):
+        by_product.setdefault(product_name, []).append({"Rating": _number(rating), "Comment": comment})
+    return by_product
+
+
+def _converted(field: str) -> dict:
+    """Aggregation expression reading ``field`` as a number, or null."""
+    value = {"$toString": f"${field}"}
+    for symbol in ("₹", ","):
+        value = {"$replaceAll": {"input": value, "find": symbol, "replacement": ""}}
+    return {"$convert": {"input": value, "to": "double", "onError": None, "onNull": None}}
+
+
+def summary_pipeline(query: dict = None, top_k: int = TOP_REVIEWS) -> list:
+    """
+    MongoDB aggregation pipeline computing the product summaries on the
+    server, returning one small document per product instead of every review.
+    Requires MongoDB 5.2 or later for $topN.
+    """
+    pipeline = []
+    if query:
+        pipeline.append({"$match": query})
+    pipeline += [
+        {"$project": {
+            "_id": 0,
+            "order": "$_id",
+            "product": "$Product Name",
+            "price": _converted("Price"),
+            "overall": _converted("Over_All_Rating"),
+            "rating": _converted("Rating"),
+            "comment": "$Comment",
+        }},
+        # Unrated reviews sort last in both directions
+        {"$addFields": {"rating_low": {"$ifNull": ["$rating", float("inf")]}}},
+        {"$facet": {
+            "products": [
+                {"$group": {
+                    "_id": "$product",
+                    "order": {"$min": "$order"},
+                    "count": {"$sum": 1},
+                    "avg_price": {"$avg": "$price"},
+                    "avg_rating": {"$avg": "$overall"},
+                    "positive": {"$topN": {"n": top_k, "sortBy": {"rating": -1},
+                                           "output": {"Rating": "$rating", "Comment": "$comment"}}},
+                    "negative": {"$topN": {"n": top_k, "sortBy": {"rating_low": 1},
+                                           "output": {"Rating": "$rating", "Comment": "$comment"}}},
+                }},
+                {"$sort": {"order": 1}},
+            ],
+            "ratings": [
+                {"$match": {"rating": {"$ne": None}}},
+                {"$group": {"_id": {"product": "$product", "rating": "$rating"},
+                            "count": {"$sum": 1}}},
+            ],
+        }},
+    ]
+    return pipeline
+
+
+def rating_count_pipeline() -> list:
+    """
+    MongoDB aggregation pipeline counting the reviews of each Rating, one
+    document per rating with a null rating for unrated reviews.
+    """
+    return [{"$group": {"_id": _converted("Rating"), "count": {"$sum": 1}}}]
+
+
+def summaries_from_aggregation(result: dict) -> list:
+    """Build the product summaries from the output of summary_pipeline."""
+    rating_counts = {}
+    for row in result.get("ratings", []):
+        rating_counts.setdefault(row["_id"]["product"], {})[_number(row["_id"]["rating"])] = row["count"]
+
+    summaries = []
+    for row in result.get("products", []):
+        product_name = row["_id"]
+        # The top reviews are taken before filtering, which keeps the same
+        # reviews as filtering first since they are sorted by rating
+        positive = [review for review in row["positive"]
+                    if review["Rating"] is not None and review["Rating"] >= POSITIVE_RATING]
+        negative = [review for review in row["negative"]
+                    if review["Rating"] is not None and review["Rating"] <= NEGATIVE_RATING]
+        counts = rating_counts.get(product_name, {})
+        summaries.append(ProductSummary(
+            product_name=product_name,
+            review_count=row["count"],
+            avg_price=_number(row["avg_price"]),
+            avg_rating=_number(row["avg_rating"]),
+            rating_counts={rating: counts[rating] for rating in sorted(counts, reverse=True)},
+            positive_reviews=[{"Rating": _number(review["Rating"]), "Comment": review["Comment"]}
+                              for review in positive],
+            negative_reviews=[{"Rating": _number(review["Rating"]), "Comment": review["Comment"]}
+                              for review in negative],
+        ))
+    return summaries
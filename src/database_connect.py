@@ -1,43 +1,380 @@
 # src/database_connect.py
 
-from pymongo import MongoClient
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from pymongo import MongoClient, InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, ConnectionFailure, PyMongoError, ServerSelectionTimeoutError
 import pandas as pd
 
+from src.constants import (MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE, MONGO_MAX_IDLE_TIME_MS,
+                           MONGO_CONNECT_TIMEOUT_MS, MONGO_SOCKET_TIMEOUT_MS,
+                           MONGO_SERVER_SELECTION_TIMEOUT_MS, MONGO_BREAKER_FAILURE_THRESHOLD,
+                           MONGO_BREAKER_RESET_SECONDS, MONGO_HEALTH_CHECK_INTERVAL,
+                           MONGO_BULK_CHUNK_SIZE, WRITE_COUNTER_COLLECTION)
+from src.review_schema import to_records
+
+
+class MongoUnavailableError(ConnectionError):
+    """Raised without touching the network while the circuit breaker is open."""
+
+
+class MongoConnectionManager:
+    """
+    Process-wide MongoDB client for one connection URL.
+
+    The client is created on first use with an explicit connection pool and
+    short timeouts, and shared by every mongo_operation (and so every
+    Streamlit session and page) in the process. A circuit breaker stops
+    requests for MONGO_BREAKER_RESET_SECONDS after repeated failures, so a
+    slow or unreachable cluster fails fast instead of stalling each call.
+    """
+
+    _managers = {}
+    _managers_lock = threading.Lock()
+
+    def __init__(self, client_url: str):
+        self.client_url = client_url
+        self.max_pool_size = int(os.getenv("MONGO_MAX_POOL_SIZE", MONGO_MAX_POOL_SIZE))
+        self.min_pool_size = int(os.getenv("MONGO_MIN_POOL_SIZE", MONGO_MIN_POOL_SIZE))
+
+        self._client = None
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = 0.0
+        self._trial = False
+        self._last_health_check = 0.0
+        self._healthy = None
+
+    @classmethod
+    def get(cls, client_url: str) -> "MongoConnectionManager":
+        """Return the shared manager for ``client_url``."""
+        with cls._managers_lock:
+            if client_url not in cls._managers:
+                cls._managers[client_url] = cls(client_url)
+            return cls._managers[client_url]
+
+    @property
+    def client(self) -> MongoClient:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._create_client()
+        return self._client
+
+    def _create_client(self) -> MongoClient:
+        # connect=False defers all network I/O to the first operation
+        options = dict(
+            connect=False,
+            maxPoolSize=self.max_pool_size,
+            minPoolSize=self.min_pool_size,
+            maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+            connectTimeoutMS=MONGO_CONNECT_TIMEOUT_MS,
+            socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+            serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        )
+        return MongoClient(
+            self.client_url,
+            tls=True,
+            tlsAllowInvalidCertificates=True,  # Disable certificate verification for troubleshooting
+            **options
+        )
+
+    def is_available(self) -> bool:
+        """False while the circuit breaker is open or its trial call is running."""
+        return time.monotonic() >= self._open_until and not self._trial
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._open_until = 0.0
+            self._trial = False
+
+    def record_failure(self, unreachable: bool = False):
+        """
+        Count a connectivity failure, opening the breaker after
+        MONGO_BREAKER_FAILURE_THRESHOLD of them or at once when ``unreachable``.
+        """
+        with self._lock:
+            self._failures += 1
+            self._trial = False
+            # A server selection timeout already waited for every server, so a cold
+            # start against a down cluster does not wait for it once per threshold
+            if unreachable or self._failures >= MONGO_BREAKER_FAILURE_THRESHOLD:
+                # Open the breaker, the next call after the reset time is a trial
+                self._open_until = time.monotonic() + MONGO_BREAKER_RESET_SECONDS
+                self._failures = MONGO_BREAKER_FAILURE_THRESHOLD - 1
+                print(f"MongoDB unavailable, failing fast for {MONGO_BREAKER_RESET_SECONDS}s")
+
+    def _begin_call(self):
+        with self._lock:
+            if time.monotonic() < self._open_until or self._trial:
+                raise MongoUnavailableError("MongoDB is unavailable (circuit breaker open)")
+            # After the reset time one trial call goes through, the others keep
+            # failing fast until it tells whether the server is back
+            self._trial = self._open_until > 0
+
+    @contextmanager
+    def guard(self):
+        """Run a MongoDB operation through the circuit breaker."""
+        self._begin_call()
+        try:
+            yield
+        except ConnectionFailure as e:
+            # Only connectivity problems count, the server answered otherwise
+            self.record_failure(unreachable=isinstance(e, ServerSelectionTimeoutError))
+            raise
+        except PyMongoError:
+            self.record_success()
+            raise
+        except BaseException:
+            # The call failed before reaching the server, the next one is the trial
+            with self._lock:
+                self._trial = False
+            raise
+        self.record_success()
+
+    def health_check(self, force: bool = False) -> bool:
+        """
+        Ping the server, reusing the last result for MONGO_HEALTH_CHECK_INTERVAL
+        seconds unless ``force`` is set.
+        """
+        now = time.monotonic()
+        if not force and self._healthy is not None \
+                and now - self._last_health_check < MONGO_HEALTH_CHECK_INTERVAL:
+            return self._healthy
+        try:
+            with self.guard():
+                self.client.admin.command("ping")
+            self._healthy = True
+        except (PyMongoError, MongoUnavailableError) as e:
+            print(f"MongoDB health check failed: {e}")
+            self._healthy = False
+        self._last_health_check = now
+        return self._healthy
+
+    def close(self):
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+class BulkWriteReport:
+    """Outcome of a chunked bulk write, one entry per chunk."""
+
+    def __init__(self, collection_name: str):
+        self.collection_name = collection_name
+        self.chunks = []
+
+    def add_chunk(self, details: dict, records: int, seconds: float, start: int = 0) -> dict:
+        """
+        Args:
+            details: bulk_api_result of the chunk, or the details of its BulkWriteError
+            records: Records in the chunk
+            seconds: Duration of the bulk write
+            start: Position of the chunk's first record in the written records
+        """
+        failed = {error["index"] for error in details.get("writeErrors", [])}
+        # Positions of the records stored as new documents rather than updates
+        new = [start + upserted["index"] for upserted in details.get("upserted", [])]
+        if details.get("nInserted", 0):
+            new += [start + index for index in range(records) if index not in failed]
+        written = details.get("nInserted", 0) + details.get("nUpserted", 0) + details.get("nMatched", 0)
+        chunk = {
+            "records": records,
+            "inserted": details.get("nInserted", 0) + details.get("nUpserted", 0),
+            "written": written,
+            "new": sorted(new),
+            "failed": len(details.get("writeErrors", [])),
+            "errors": [error.get("errmsg") for error in details.get("writeErrors", [])],
+            "seconds": seconds,
+            "docs_per_second": records / seconds if seconds > 0 else float("inf"),
+        }
+        self.chunks.append(chunk)
+        return chunk
+
+    @property
+    def inserted(self) -> int:
+        return sum(chunk["inserted"] for chunk in self.chunks)
+
+    @property
+    def written(self) -> int:
+        return sum(chunk["written"] for chunk in self.chunks)
+
+    @property
+    def new_positions(self) -> list:
+        """Positions of the records that were not stored before, see add_chunk."""
+        return [position for chunk in self.chunks for position in chunk["new"]]
+
+    @property
+    def failed(self) -> int:
+        return sum(chunk["failed"] for chunk in self.chunks)
+
+    def __repr__(self):
+        return (f"BulkWriteReport({self.collection_name!r}, chunks={len(self.chunks)}, "
+                f"written={self.written}, inserted={self.inserted}, failed={self.failed})")
+
+
 class mongo_operation:
     def __init__(self, client_url: str, database_name: str):
-        # Configure MongoDB client with modified SSL settings and timeouts
-        try:
-            # First try with TLS settings
-            self.client = MongoClient(
-                client_url,
-                tls=True,
-                tlsAllowInvalidCertificates=True,  # Disable certificate verification for troubleshooting
-                connectTimeoutMS=30000,     # Increase connection timeout to 30 seconds
-                socketTimeoutMS=30000,      # Increase socket timeout to 30 seconds
-                serverSelectionTimeoutMS=30000  # Increase server selection timeout
-            )
-        except Exception as e:
-            print(f"First connection attempt failed: {e}")
-            # Fall back to older SSL settings if TLS fails
-            self.client = MongoClient(
-                client_url,
-                ssl=True,
-                ssl_cert_reqs='CERT_NONE',  # Disable certificate verification for troubleshooting
-                connectTimeoutMS=30000,     # Increase connection timeout to 30 seconds
-                socketTimeoutMS=30000,      # Increase socket timeout to 30 seconds
-                serverSelectionTimeoutMS=30000  # Increase server selection timeout
-            )
-        self.db = self.client[database_name]
-
-    def bulk_insert(self, df: pd.DataFrame, collection_name: str):
+        # The client is shared and only connects on the first operation
+        self.manager = MongoConnectionManager.get(client_url)
+        self.database_name = database_name
+        # Collections whose upsert key index is known to exist
+        self._indexed = set()
+
+    @property
+    def client(self) -> MongoClient:
+        return self.manager.client
+
+    @property
+    def db(self):
+        return self.client[self.database_name]
+
+    def ping(self, force: bool = False) -> bool:
+        return self.manager.health_check(force=force)
+
+    def bulk_insert(self, df: pd.DataFrame, collection_name: str,
+                    chunk_size: int = MONGO_BULK_CHUNK_SIZE,
+                    upsert_key: str = None) -> "BulkWriteReport":
+        """
+        Write a DataFrame in chunks of unordered bulk writes.
+
+        Records are converted one chunk at a time, and a bad document only
+        fails itself rather than the rest of its chunk. With ``upsert_key``
+        records are upserted on that field, so writing the same reviews again
+        updates them instead of storing duplicates.
+
+        Args:
+            df: Records to write
+            collection_name: Target collection
+            chunk_size: Records per bulk write
+            upsert_key: Field identifying a record, None for plain inserts
+
+        Returns:
+            BulkWriteReport: Per-chunk counts, failures and throughput
+        """
+        # Validate collection name
+        if not collection_name or collection_name.strip() == "":
+            raise ValueError("Collection name cannot be empty")
+        collection = self.db[collection_name]
+        report = BulkWriteReport(collection_name)
+
+        if upsert_key is not None and collection_name not in self._indexed:
+            with self.manager.guard():
+                collection.create_index(upsert_key)
+            self._indexed.add(collection_name)
+
+        chunks = range(0, len(df), chunk_size)
+        for number, start in enumerate(chunks, start=1):
+            records = to_records(df.iloc[start:start + chunk_size])
+            if upsert_key is None:
+                operations = [InsertOne(record) for record in records]
+            else:
+                operations = [
+                    UpdateOne({upsert_key: record[upsert_key]}, {"$set": record}, upsert=True)
+                    for record in records
+                ]
+
+            started = time.perf_counter()
+            try:
+                with self.manager.guard():
+                    result = collection.bulk_write(operations, ordered=False)
+                details = result.bulk_api_result
+            except BulkWriteError as e:
+                # Unordered writes carry on past bad documents, keep counting
+                details = e.details
+            chunk = report.add_chunk(details, len(records), time.perf_counter() - started, start=start)
+            print(f"Bulk write {collection_name} chunk {number}/{len(chunks)}: "
+                  f"{chunk['written']} written, {chunk['failed']} failed, "
+                  f"{chunk['docs_per_second']:.0f} docs/s")
+
+        if report.written:
+            # Upserts may only update stored reviews, which leaves the count
+            # and newest id unchanged, see fingerprint
+            with self.manager.guard():
+                self.db[WRITE_COUNTER_COLLECTION].update_one(
+                    {"_id": collection_name}, {"$inc": {"writes": 1}}, upsert=True)
+        return report
+
+    def find_fields(self, collection_name: str, fields: list):
+        """Return only ``fields`` of every document in the collection."""
         # Validate collection name
         if not collection_name or collection_name.strip() == "":
             raise ValueError("Collection name cannot be empty")
-        records = df.to_dict(orient="records")
-        self.db[collection_name].insert_many(records)
+        projection = {field: True for field in fields}
+        projection['_id'] = False
+        with self.manager.guard():
+            return list(self.db[collection_name].find({}, projection))
+
+    def iter_batches(self, collection_name: str, query: dict = None, fields: list = None,
+                     limit: int = None, batch_size: int = 1000):
+        """
+        Stream matching documents through a server-side cursor.
+
+        Args:
+            collection_name: Collection to read
+            query: MongoDB filter, None for every document
+            fields: Fields to return, None for all
+            limit: Maximum number of documents
+            batch_size: Documents per batch, also the cursor batch size
+
+        Yields:
+            list: Batches of documents without their _id
+        """
+        # Validate collection name
+        if not collection_name or collection_name.strip() == "":
+            raise ValueError("Collection name cannot be empty")
+        projection = {'_id': False}
+        if fields is not None:
+            projection.update({field: True for field in fields})
+
+        cursor = self.db[collection_name].find(query or {}, projection, batch_size=batch_size)
+        if limit:
+            cursor = cursor.limit(limit)
+
+        batch = []
+        with self.manager.guard():
+            for document in cursor:
+                batch.append(document)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
 
     def find(self, collection_name: str):
         # Validate collection name
         if not collection_name or collection_name.strip() == "":
             raise ValueError("Collection name cannot be empty")
-        return list(self.db[collection_name].find({}, {'_id': False}))
+        with self.manager.guard():
+            return list(self.db[collection_name].find({}, {'_id': False}))
+
+    def aggregate(self, collection_name: str, pipeline: list) -> list:
+        """Run an aggregation pipeline on the server and return its results."""
+        # Validate collection name
+        if not collection_name or collection_name.strip() == "":
+            raise ValueError("Collection name cannot be empty")
+        with self.manager.guard():
+            return list(self.db[collection_name].aggregate(pipeline, allowDiskUse=True))
+
+    def fingerprint(self, collection_name: str) -> tuple:
+        """
+        Cheap summary of a collection's content: its document count, the
+        newest document id, which change whenever documents are added, and
+        the number of bulk writes, which changes when they are updated.
+        """
+        # Validate collection name
+        if not collection_name or collection_name.strip() == "":
+            raise ValueError("Collection name cannot be empty")
+        collection = self.db[collection_name]
+        with self.manager.guard():
+            # Read from the collection metadata instead of counting the documents
+            count = collection.estimated_document_count()
+            latest = collection.find_one({}, {'_id': True}, sort=[('_id', -1)])
+            counter = self.db[WRITE_COUNTER_COLLECTION].find_one({"_id": collection_name})
+        return (count, None if latest is None else str(latest['_id']),
+                0 if counter is None else counter["writes"])
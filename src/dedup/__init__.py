@@ -0,0 +1,3 @@
+from src.dedup.index import DedupIndex, Fingerprints
+from src.dedup.minhash import (band_buckets, content_hashes, minhash_signatures, normalize_comments,
+                               similarities)
@@ -0,0 +1,248 @@
+import os
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from src.constants import (DUPLICATE_COLUMN, DUPLICATE_SIMILARITY, MINHASH_PERMUTATIONS,
+                           REVIEW_KEY_COLUMN)
+from src.dedup.minhash import (band_buckets, content_hashes, eligible, minhash_signatures,
+                               normalize_comments, similarities)
+
+# Rows per IN (...) lookup, below SQLite's limit of bound parameters
+LOOKUP_BATCH = 500
+
+
+class Fingerprints:
+    """
+    Fingerprints of a batch of reviews, computed by DedupIndex.flag and
+    recorded by DedupIndex.add once the reviews are stored.
+    """
+
+    def __init__(self, keys: np.ndarray, content: np.ndarray, duplicate_of: np.ndarray,
+                 signatures: np.ndarray, checked: np.ndarray):
+        """
+        Args:
+            keys: REVIEW_KEY_COLUMN of every review
+            content: content_hashes of every review, None without a comment
+            duplicate_of: Key of the review each one repeats, None for originals
+            signatures: MinHash signatures, rows of unchecked reviews are unused
+            checked: Whether each review was checked for near duplicates
+        """
+        self.keys = keys
+        self.content = content
+        self.duplicate_of = duplicate_of
+        self.signatures = signatures
+        self.checked = checked
+
+    def __len__(self):
+        return len(self.keys)
+
+
+class DedupIndex:
+    """
+    Near-duplicate index of the stored reviews, in a small SQLite file next
+    to the local catalog.
+
+    Every stored review is recorded with the hash of its content and the
+    review it duplicates. Original reviews long enough to compare also have
+    their MinHash signature stored and one row per LSH band bucket, indexed,
+    so the candidates of a new review are found with a lookup per bucket
+    instead of a comparison with every stored review. Only the candidates'
+    signatures are compared.
+
+    The index only ever grows with the reviews written through store_reviews
+    and is rebuilt from the stored reviews of a product when it has none of
+    them, see MongoIO.store_reviews.
+    """
+
+    def __init__(self, root: str, path: str = None, threshold: float = DUPLICATE_SIMILARITY):
+        """
+        Args:
+            root: Directory of the local store
+            path: Index file, defaults to dedup.sqlite in ``root``
+            threshold: Similarity above which reviews are near duplicates
+        """
+        os.makedirs(root, exist_ok=True)
+        self.path = path or os.path.join(root, "dedup.sqlite")
+        self.threshold = threshold
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS reviews ("
+                " collection TEXT NOT NULL,"
+                " review_key TEXT NOT NULL,"
+                " content TEXT,"
+                " duplicate_of TEXT,"
+                " signature BLOB,"
+                " PRIMARY KEY (collection, review_key))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS reviews_content ON reviews (collection, content)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                " collection TEXT NOT NULL,"
+                " bucket INTEGER NOT NULL,"
+                " review_key TEXT NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (collection, bucket)")
+
+    def _lookup(self, sql: str, collection_name: str, values) -> list:
+        """Rows of ``sql`` for ``values`` in batches, ``sql`` ends with an IN placeholder."""
+        rows = []
+        values = list(values)
+        with self._lock:
+            for begin in range(0, len(values), LOOKUP_BATCH):
+                batch = values[begin:begin + LOOKUP_BATCH]
+                rows.extend(self._conn.execute(sql.format(", ".join("?" * len(batch))),
+                                               [collection_name] + batch).fetchall())
+        return rows
+
+    def indexed(self, collection_name: str) -> bool:
+        """Whether reviews of the collection were added to the index."""
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM reviews WHERE collection = ? LIMIT 1",
+                                      (collection_name,)).fetchone() is not None
+
+    def flag(self, collection_name: str, reviews: pd.DataFrame) -> tuple:
+        """
+        Find the reviews that repeat a stored review or an earlier review of
+        the batch.
+
+        Only a review whose REVIEW_KEY_COLUMN repeats an earlier review of
+        the batch is dropped, the same review scraped twice. Every other
+        review is kept, and one whose comment has at least
+        DUPLICATE_MIN_WORDS words and repeats or nearly copies an earlier
+        review's is flagged with the key of that review in DUPLICATE_COLUMN.
+        Short comments like "Good" are written by many reviewers and are
+        never flagged. Reviews already in the index keep the flag they were
+        stored with.
+
+        Args:
+            collection_name: Collection the reviews are stored in
+            reviews: Reviews with their REVIEW_KEY_COLUMN
+
+        Returns:
+            tuple: The reviews to store, flagged, and their Fingerprints
+        """
+        reviews = reviews[~reviews[REVIEW_KEY_COLUMN].duplicated()].reset_index(drop=True)
+        keys = reviews[REVIEW_KEY_COLUMN].to_numpy(dtype=object)
+        names = reviews["Name"] if "Name" in reviews else pd.Series("", index=reviews.index)
+        comments = reviews["Comment"] if "Comment" in reviews else pd.Series(None, index=reviews.index)
+        content = content_hashes(names, comments).to_numpy(dtype=object)
+        text = normalize_comments(comments)
+        long_enough = eligible(text)
+        duplicate_of = np.full(len(reviews), None, dtype=object)
+
+        # Reviews stored before keep their flag
+        stored = dict(self._lookup("SELECT review_key, duplicate_of FROM reviews"
+                                   " WHERE collection = ? AND review_key IN ({})",
+                                   collection_name, set(keys)))
+        known = np.fromiter((key in stored for key in keys), dtype=bool, count=len(keys))
+        duplicate_of[known] = [stored[key] for key in keys[known]]
+
+        # Same reviewer and comment as a stored review, or as the first review
+        # of the batch with that content
+        repeats = long_enough & ~known & pd.notna(content)
+        if repeats.any():
+            stored_content = dict(self._lookup("SELECT content, COALESCE(duplicate_of, review_key) FROM reviews"
+                                               " WHERE collection = ? AND content IN ({})",
+                                               collection_name, set(content[repeats])))
+            first = pd.Series(keys).groupby(pd.Series(content).where(repeats)).transform("first")
+            for row in np.flatnonzero(repeats):
+                original = stored_content.get(content[row])
+                if original is None and first[row] != keys[row]:
+                    original = first[row]
+                duplicate_of[row] = original
+
+        checked = long_enough & ~known & pd.isna(duplicate_of)
+        signatures = np.zeros((len(reviews), MINHASH_PERMUTATIONS), dtype=np.uint32)
+        if checked.any():
+            signatures[checked] = minhash_signatures(text[checked])
+            duplicate_of[checked] = self._near_duplicates(collection_name, keys[checked],
+                                                          signatures[checked])
+
+        # A repeat of a review of the batch that turned out to copy another
+        # one points to that original
+        batch_flags = dict(zip(keys, duplicate_of))
+        duplicate_of = np.array([batch_flags.get(original) or original for original in duplicate_of],
+                                dtype=object)
+
+        fingerprints = Fingerprints(keys, content, duplicate_of, signatures, checked)
+        flagged = reviews.assign(**{DUPLICATE_COLUMN: duplicate_of})
+        return flagged, fingerprints
+
+    def _near_duplicates(self, collection_name: str, keys: np.ndarray, signatures: np.ndarray) -> np.ndarray:
+        """Key of the original review each signature nearly duplicates, None for new ones."""
+        buckets = band_buckets(signatures)
+        rows = np.repeat(np.arange(len(keys)), buckets.shape[1])
+        buckets = buckets.ravel()
+
+        # Stored originals sharing a bucket
+        stored = pd.DataFrame(self._lookup("SELECT bucket, review_key FROM buckets"
+                                           " WHERE collection = ? AND bucket IN ({})",
+                                           collection_name, set(buckets.tolist())),
+                              columns=["bucket", "candidate"])
+        candidates = pd.DataFrame({"row": rows, "bucket": buckets}).merge(stored, on="bucket")
+        candidates = candidates.drop_duplicates(["row", "candidate"])
+        stored_signatures = dict(self._lookup("SELECT review_key, signature FROM reviews"
+                                              " WHERE collection = ? AND review_key IN ({})",
+                                              collection_name, set(candidates["candidate"])))
+
+        duplicate_of = np.full(len(keys), None, dtype=object)
+        if len(candidates):
+            others = np.stack([np.frombuffer(stored_signatures[key], dtype=np.uint32)
+                               for key in candidates["candidate"]])
+            candidates["similarity"] = similarities(signatures[candidates["row"].to_numpy()], others)
+            best = (candidates[candidates["similarity"] >= self.threshold]
+                    .sort_values("similarity", ascending=False).drop_duplicates("row"))
+            duplicate_of[best["row"].to_numpy()] = best["candidate"].to_numpy()
+
+        # Earlier reviews of the batch: the first review of each bucket leads
+        # it, later ones are compared with the leaders of their buckets
+        batch = pd.DataFrame({"row": rows, "bucket": buckets})
+        batch["leader"] = batch.groupby("bucket")["row"].transform("min")
+        batch = batch[batch["leader"] < batch["row"]].drop_duplicates(["row", "leader"])
+        if len(batch):
+            batch["similarity"] = similarities(signatures[batch["row"].to_numpy()],
+                                               signatures[batch["leader"].to_numpy()])
+            best = (batch[batch["similarity"] >= self.threshold]
+                    .sort_values(["row", "leader"]).drop_duplicates("row"))
+            # In reading order, so a leader flagged just before is resolved
+            # to its own original
+            for row, leader in zip(best["row"], best["leader"]):
+                if duplicate_of[row] is None:
+                    duplicate_of[row] = duplicate_of[leader] or keys[leader]
+        return duplicate_of
+
+    def add(self, collection_name: str, fingerprints: Fingerprints):
+        """Record stored reviews, see flag. Reviews already recorded are kept."""
+        if not len(fingerprints):
+            return
+        originals = fingerprints.checked & pd.isna(fingerprints.duplicate_of)
+        signatures = [signature.tobytes() if original else None
+                      for signature, original in zip(fingerprints.signatures, originals)]
+        buckets = band_buckets(fingerprints.signatures[originals])
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO reviews (collection, review_key, content, duplicate_of, signature)"
+                " VALUES (?, ?, ?, ?, ?)",
+                zip([collection_name] * len(fingerprints), fingerprints.keys, fingerprints.content,
+                    fingerprints.duplicate_of, signatures))
+            self._conn.executemany(
+                "INSERT INTO buckets (collection, bucket, review_key) VALUES (?, ?, ?)",
+                ((collection_name, int(bucket), key)
+                 for key, row in zip(fingerprints.keys[originals], buckets) for bucket in row))
+
+    def remove(self, collection_name: str):
+        """Forget the reviews of a collection, before it is replaced."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM reviews WHERE collection = ?", (collection_name,))
+            self._conn.execute("DELETE FROM buckets WHERE collection = ?", (collection_name,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
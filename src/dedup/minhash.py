@@ -0,0 +1,146 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from src.constants import (DUPLICATE_MIN_WORDS, LSH_BANDS, MINHASH_PERMUTATIONS, NO_COMMENT,
+                           SHINGLE_SIZE)
+
+# Fixed so that signatures stored in the index stay comparable across runs
+MINHASH_SEED = 20240617
+# Shingles hashed per chunk, bounds the (permutations x shingles) matrix to 16 MB
+MINHASH_CHUNK = 2 ** 16
+
+_MASK32 = np.uint64(0xFFFFFFFF)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def normalize_comments(comments: pd.Series) -> pd.Series:
+    """
+    Lower case comments with every run of punctuation, emoji and spaces
+    replaced by one space, missing for missing comments and NO_COMMENT.
+    """
+    text = comments.astype("string")
+    text = text.mask(text == NO_COMMENT)
+    return text.str.lower().str.replace(r"[\W_]+", " ", regex=True).str.strip()
+
+
+def content_hashes(names: pd.Series, comments: pd.Series) -> pd.Series:
+    """
+    Fingerprint of what a reviewer wrote: the reviewer name and the
+    normalized comment, missing when there is no comment. Unlike the review
+    key it ignores the date, so the same review scraped twice matches.
+    """
+    names = names.astype("string").fillna("").str.strip()
+    comments = normalize_comments(comments)
+    return pd.Series(
+        [None if pd.isna(comment) else hashlib.sha1(f"{name}\x1f{comment}".encode("utf-8")).hexdigest()
+         for name, comment in zip(names, comments)],
+        index=comments.index, dtype=object)
+
+
+def _permutations() -> tuple:
+    """Multipliers and offsets of the MINHASH_PERMUTATIONS hash functions."""
+    generator = np.random.default_rng(MINHASH_SEED)
+    multipliers = generator.integers(0, 2 ** 32, MINHASH_PERMUTATIONS, dtype=np.uint64).astype(np.uint32)
+    offsets = generator.integers(0, 2 ** 32, MINHASH_PERMUTATIONS, dtype=np.uint64).astype(np.uint32)
+    # Odd multipliers make every hash function a permutation of the 32-bit values
+    return (multipliers | np.uint32(1))[:, None], offsets[:, None]
+
+
+def _shingles(text: np.ndarray) -> tuple:
+    """
+    Hashes of the distinct character shingles of every comment.
+
+    The comments are encoded into one byte buffer and every SHINGLE_SIZE
+    window of it is hashed at once, windows crossing two comments are
+    dropped.
+
+    Returns:
+        tuple: Comment of each shingle, sorted, and its 32-bit hash
+    """
+    encoded = [comment.encode("utf-8") for comment in text]
+    lengths = np.fromiter((len(comment) for comment in encoded), dtype=np.int64, count=len(encoded))
+    buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    owner = np.repeat(np.arange(len(encoded)), lengths)
+    if len(buffer) < SHINGLE_SIZE:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint32)
+
+    # Polynomial hash of the bytes of every window, then the high half of a
+    # multiplicative mix
+    count = len(buffer) - SHINGLE_SIZE + 1
+    hashes = np.zeros(count, dtype=np.uint64)
+    for offset in range(SHINGLE_SIZE):
+        hashes = hashes * np.uint64(257) + buffer[offset:offset + count]
+    hashes = (hashes * _GOLDEN) >> np.uint64(32)
+    inside = owner[:count] == owner[SHINGLE_SIZE - 1:]
+
+    # Distinct (comment, shingle) pairs, sorted by comment. Sorted by hand,
+    # np.unique is much slower on large arrays
+    pairs = np.sort((owner[:count][inside].astype(np.uint64) << np.uint64(32)) | hashes[inside])
+    pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]]
+    return (pairs >> np.uint64(32)).astype(np.int64), (pairs & _MASK32).astype(np.uint32)
+
+
+def minhash_signatures(text: pd.Series) -> np.ndarray:
+    """
+    MinHash signatures of normalized comments, see normalize_comments.
+
+    The share of equal values of two signatures estimates the Jaccard
+    similarity of the comments' SHINGLE_SIZE character shingles. All
+    comments are hashed together with array operations, in chunks of
+    MINHASH_CHUNK shingles.
+
+    Args:
+        text: Normalized comments, none of them missing
+
+    Returns:
+        np.ndarray: (comments, MINHASH_PERMUTATIONS) uint32 signatures
+    """
+    text = text.to_numpy(dtype=object)
+    signatures = np.full((len(text), MINHASH_PERMUTATIONS), 0xFFFFFFFF, dtype=np.uint32)
+    comments, hashes = _shingles(text)
+    if not len(hashes):
+        return signatures
+
+    multipliers, offsets = _permutations()
+    # Chunks end on comment boundaries, each comment is reduced in one chunk
+    starts = np.flatnonzero(np.r_[True, comments[1:] != comments[:-1]])
+    bounds = starts[np.searchsorted(starts, np.arange(0, len(hashes), MINHASH_CHUNK))]
+    for begin, end in zip(bounds, np.r_[bounds[1:], len(hashes)]):
+        if begin == end:
+            continue
+        # One row per hash function, multiply-add wrapping at 32 bits. The
+        # minimum of each comment is reduced along contiguous rows
+        values = multipliers * hashes[None, begin:end]
+        values += offsets
+        chunk_starts = starts[(starts >= begin) & (starts < end)]
+        signatures[comments[chunk_starts]] = np.minimum.reduceat(values, chunk_starts - begin, axis=1).T
+    return signatures
+
+
+def band_buckets(signatures: np.ndarray) -> np.ndarray:
+    """
+    LSH buckets of signatures: every band of MINHASH_PERMUTATIONS / LSH_BANDS
+    values is hashed into one int64, mixed with its band number so that
+    equal values in different bands land in different buckets.
+
+    Returns:
+        np.ndarray: (signatures, LSH_BANDS) int64 buckets
+    """
+    bands = signatures.astype(np.uint64).reshape(len(signatures), LSH_BANDS, MINHASH_PERMUTATIONS // LSH_BANDS)
+    buckets = np.arange(1, LSH_BANDS + 1, dtype=np.uint64)[None, :] * _GOLDEN
+    for column in range(bands.shape[2]):
+        buckets = (buckets ^ bands[:, :, column]) * np.uint64(0x100000001B3)
+        buckets ^= buckets >> np.uint64(29)
+    return buckets.view(np.int64)
+
+
+def similarities(signatures: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """Estimated Jaccard similarity of each signature with the matching row of ``others``."""
+    return (signatures == others).mean(axis=1)
+
+
+def eligible(text: pd.Series) -> np.ndarray:
+    """Normalized comments long enough to be checked for near duplicates."""
+    return (text.str.count(" ").fillna(-1) + 1 >= DUPLICATE_MIN_WORDS).to_numpy(dtype=bool)
@@ -0,0 +1,3 @@
+from src.jobs.queue import Job, JobQueue, get_job_queue
+from src.jobs.scheduler import JobScheduler, get_job_scheduler
+from src.jobs.worker import ScrapeWorker
@@ -0,0 +1,266 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from src.constants import JOB_LEASE_SECONDS, JOB_MAX_ATTEMPTS, LOCAL_STORE_DIR
+
+JOB_FIELDS = ["id", "product_name", "no_of_products", "options", "status", "attempts",
+              "products_done", "reviews_scraped", "error", "worker",
+              "created_at", "started_at", "finished_at"]
+
+
+def default_queue_path() -> str:
+    """jobs.sqlite in LOCAL_STORE_DIR, shared by the app and the workers."""
+    directory = os.path.join(os.getcwd(), LOCAL_STORE_DIR)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, "jobs.sqlite")
+
+
+class Job:
+    """A scrape of ``no_of_products`` products found for a search."""
+
+    def __init__(self, job_id: int, product_name: str, no_of_products: int, options: dict,
+                 status: str, attempts: int = 0, products_done: int = 0, reviews_scraped: int = 0,
+                 error: str = None, worker: str = None, created_at: float = None,
+                 started_at: float = None, finished_at: float = None):
+        self.job_id = job_id
+        self.product_name = product_name
+        self.no_of_products = no_of_products
+        # ScrapeReviews settings: max_workers, fetch_engine, use_cache, incremental
+        self.options = options
+        self.status = status
+        self.attempts = attempts
+        self.products_done = products_done
+        self.reviews_scraped = reviews_scraped
+        self.error = error
+        self.worker = worker
+        # Unix times
+        self.created_at = created_at
+        self.started_at = started_at
+        self.finished_at = finished_at
+
+    @property
+    def progress(self) -> float:
+        """Share of the requested products scraped so far, from 0 to 1."""
+        if self.status == "done":
+            return 1.0
+        return min(1.0, self.products_done / self.no_of_products) if self.no_of_products else 0.0
+
+    def to_dict(self) -> dict:
+        return {"job_id": self.job_id, "product_name": self.product_name,
+                "no_of_products": self.no_of_products, "status": self.status,
+                "products_done": self.products_done, "reviews_scraped": self.reviews_scraped,
+                "attempts": self.attempts, "error": self.error, "worker": self.worker,
+                "created_at": self.created_at, "started_at": self.started_at,
+                "finished_at": self.finished_at}
+
+    def __repr__(self):
+        return (f"Job({self.job_id}, {self.product_name!r}, status={self.status!r}, "
+                f"products={self.products_done}/{self.no_of_products})")
+
+
+class JobQueue:
+    """
+    Persistent queue of scrape jobs shared by the app and the worker processes.
+
+    Jobs live in a SQLite file next to the local store, so queued jobs
+    survive restarts and any number of processes can submit, run and watch
+    them. A worker claims a job for a lease it renews after every product;
+    jobs of a worker that dies are run again once their lease runs out, up
+    to JOB_MAX_ATTEMPTS times.
+    """
+
+    def __init__(self, path: str = None, max_attempts: int = JOB_MAX_ATTEMPTS):
+        """
+        Args:
+            path: Queue file, defaults to jobs.sqlite in LOCAL_STORE_DIR
+            max_attempts: Runs of a job before it is marked failed
+        """
+        self.path = path or default_queue_path()
+        self.max_attempts = max_attempts
+
+        self._lock = threading.Lock()
+        # Autocommit, transactions are opened explicitly
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None,
+                                     timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " product_name TEXT NOT NULL,"
+                " no_of_products INTEGER NOT NULL,"
+                " options TEXT NOT NULL,"
+                " status TEXT NOT NULL DEFAULT 'queued',"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " products_done INTEGER NOT NULL DEFAULT 0,"
+                " reviews_scraped INTEGER NOT NULL DEFAULT 0,"
+                " error TEXT,"
+                " worker TEXT,"
+                " created_at REAL NOT NULL,"
+                " started_at REAL,"
+                " finished_at REAL,"
+                " lease_until REAL NOT NULL DEFAULT 0)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id)")
+
+    @staticmethod
+    def _job(row: tuple) -> Job:
+        fields = dict(zip(JOB_FIELDS, row))
+        fields["job_id"] = fields.pop("id")
+        fields["options"] = json.loads(fields["options"])
+        return Job(**fields)
+
+    def submit(self, product_name: str, no_of_products: int, **options) -> int:
+        """
+        Queue a scrape.
+
+        Args:
+            product_name: Search query for the products to scrape
+            no_of_products: Number of products with reviews to collect
+            **options: ScrapeReviews settings (max_workers, fetch_engine,
+                use_cache) and ``incremental`` to only store new reviews
+
+        Returns:
+            int: Id of the job
+        """
+        if not product_name or not product_name.strip():
+            raise ValueError("Product name cannot be empty")
+        if no_of_products < 1:
+            raise ValueError("no_of_products must be at least 1")
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (product_name, no_of_products, options, created_at)"
+                " VALUES (?, ?, ?, ?)",
+                (product_name, int(no_of_products), json.dumps(options), time.time())
+            )
+        return cursor.lastrowid
+
+    def claim(self, worker: str, lease_seconds: float = JOB_LEASE_SECONDS):
+        """
+        Take the oldest queued job, or a running job whose worker stopped
+        renewing its lease.
+
+        Returns:
+            Job: The claimed job, None when there is nothing to run
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs that keep killing their worker are not retried forever
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'failed', finished_at = ?, lease_until = 0,"
+                    " error = COALESCE(error, 'The worker running the job stopped')"
+                    " WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                    (now, now, self.max_attempts))
+                row = self._conn.execute(
+                    f"SELECT {', '.join(JOB_FIELDS)} FROM jobs"
+                    " WHERE status = 'queued' OR (status = 'running' AND lease_until < ?)"
+                    " ORDER BY id LIMIT 1", (now,)
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1, worker = ?,"
+                        " started_at = ?, lease_until = ?, products_done = 0, reviews_scraped = 0"
+                        " WHERE id = ?", (worker, now, now + lease_seconds, row[0]))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        job = self._job(row)
+        job.status, job.attempts, job.worker, job.started_at = "running", job.attempts + 1, worker, now
+        job.products_done = job.reviews_scraped = 0
+        return job
+
+    def progress(self, job_id: int, products_done: int, reviews_scraped: int,
+                 lease_seconds: float = JOB_LEASE_SECONDS) -> bool:
+        """
+        Record the progress of a running job and renew its lease.
+
+        Returns:
+            bool: Whether the job should go on, False once it was cancelled
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET products_done = ?, reviews_scraped = ?, lease_until = ?"
+                " WHERE id = ? AND status = 'running'",
+                (products_done, reviews_scraped, time.time() + lease_seconds, job_id))
+        return cursor.rowcount > 0
+
+    def finish(self, job_id: int):
+        """Mark a running job as done."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'done', finished_at = ?, lease_until = 0"
+                " WHERE id = ? AND status = 'running'", (time.time(), job_id))
+
+    def fail(self, job_id: int, error: str):
+        """Queue a failed job again, or mark it failed after its last attempt."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET error = ?, lease_until = 0,"
+                " status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END,"
+                " finished_at = CASE WHEN attempts < ? THEN NULL ELSE ? END"
+                " WHERE id = ? AND status = 'running'",
+                (error, self.max_attempts, self.max_attempts, time.time(), job_id))
+
+    def cancel(self, job_id: int) -> bool:
+        """
+        Cancel a queued or running job, a running job stops after its
+        current product.
+
+        Returns:
+            bool: Whether the job was cancelled
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', finished_at = ?, lease_until = 0"
+                " WHERE id = ? AND status IN ('queued', 'running')", (time.time(), job_id))
+        return cursor.rowcount > 0
+
+    def get(self, job_id: int):
+        """The job with ``job_id``, None if there is none."""
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE id = ?",
+                                     (job_id,)).fetchone()
+        return None if row is None else self._job(row)
+
+    def jobs(self, limit: int = 50, statuses: tuple = None) -> list:
+        """Most recent jobs first, optionally only those in ``statuses``."""
+        sql = f"SELECT {', '.join(JOB_FIELDS)} FROM jobs"
+        params = []
+        if statuses:
+            sql += f" WHERE status IN ({', '.join('?' * len(statuses))})"
+            params += list(statuses)
+        sql += " ORDER BY id DESC LIMIT ?"
+        with self._lock:
+            rows = self._conn.execute(sql, params + [limit]).fetchall()
+        return [self._job(row) for row in rows]
+
+    def counts(self) -> dict:
+        """Number of jobs in each status."""
+        with self._lock:
+            return dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_shared_queue = None
+_shared_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Return the JobQueue of the app process, shared by every session and page."""
+    global _shared_queue
+    if _shared_queue is None:
+        with _shared_queue_lock:
+            if _shared_queue is None:
+                _shared_queue = JobQueue()
+    return _shared_queue
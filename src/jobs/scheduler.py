@@ -0,0 +1,141 @@
+import argparse
+import multiprocessing
+import os
+import threading
+
+from src.constants import JOB_POLL_INTERVAL, JOB_WORKERS, MYNTRA_BASE_URL
+from src.jobs.queue import default_queue_path
+from src.jobs.worker import run_worker_process
+
+
+class JobScheduler:
+    """
+    A pool of worker processes running the jobs of a JobQueue.
+
+    Each process runs a ScrapeWorker with its own browser, HTTP connections
+    and MongoDB client, so scrapes run side by side without sharing a GIL or
+    a browser, and the app submitting the jobs stays responsive.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, queue_path: str = None,
+                 base_url: str = MYNTRA_BASE_URL, poll_interval: float = JOB_POLL_INTERVAL,
+                 metrics_port: int = None):
+        """
+        Args:
+            workers: Number of worker processes
+            queue_path: Queue file, see JobQueue
+            base_url: Site root, override to scrape locally served fixtures
+            poll_interval: Seconds an idle worker waits before looking for jobs
+            metrics_port: Serve the metrics of the first worker on this port,
+                of the next ones on the following ports, None serves none
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.queue_path = queue_path or default_queue_path()
+        self.base_url = base_url
+        self.poll_interval = poll_interval
+        self.metrics_port = metrics_port
+        # Spawned rather than forked, Chrome and the MongoDB client do not survive a fork
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = None
+        self._processes = []
+
+    def start(self):
+        """Start the worker processes, those still running are kept."""
+        if self._stop_event is None or self._stop_event.is_set():
+            self._stop_event = self._context.Event()
+        self._processes = [process for process in self._processes if process.is_alive()]
+        for number in range(len(self._processes), self.workers):
+            process = self._context.Process(
+                target=run_worker_process,
+                args=(self.queue_path, self.base_url, self._stop_event, self.poll_interval,
+                      None if self.metrics_port is None else self.metrics_port + number),
+                name=f"scrape-worker-{number}",
+                # Never outlive the app that started them
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+        print(f"Started {len(self._processes)} scrape worker processes")
+
+    def alive(self) -> int:
+        """Number of worker processes running."""
+        return sum(process.is_alive() for process in self._processes)
+
+    def join(self):
+        """Wait for the worker processes to exit."""
+        for process in self._processes:
+            process.join()
+
+    def stop(self, timeout: float = None):
+        """
+        Let the workers finish their current job and stop. Workers still
+        running after ``timeout`` are terminated, their jobs are run again
+        once their lease runs out.
+        """
+        if self._stop_event is not None:
+            self._stop_event.set()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._processes = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+_shared_scheduler = None
+_shared_scheduler_lock = threading.Lock()
+
+
+def get_job_scheduler():
+    """
+    Return the scheduler of the app process, starting its workers on first
+    use. The SCRAPE_JOB_WORKERS environment variable overrides JOB_WORKERS,
+    with 0 no workers are started and jobs are left to ``python -m src.jobs``.
+    When the app serves its metrics on METRICS_PORT, the workers serve theirs
+    on the following ports.
+
+    Returns:
+        JobScheduler: The running scheduler, None without workers
+    """
+    global _shared_scheduler
+    workers = int(os.getenv("SCRAPE_JOB_WORKERS", JOB_WORKERS))
+    if workers < 1:
+        return None
+    with _shared_scheduler_lock:
+        if _shared_scheduler is None:
+            metrics_port = os.getenv("METRICS_PORT")
+            _shared_scheduler = JobScheduler(workers=workers,
+                                             metrics_port=int(metrics_port) + 1 if metrics_port else None)
+        if _shared_scheduler.alive() < workers:
+            # Replaces workers that died
+            _shared_scheduler.start()
+    return _shared_scheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run queued scrape jobs until interrupted.")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("SCRAPE_JOB_WORKERS", JOB_WORKERS)))
+    parser.add_argument("--queue", default=None, help="Queue file, defaults to the app's")
+    parser.add_argument("--base-url", default=MYNTRA_BASE_URL)
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="Serve the metrics of the workers from this port on, one port each")
+    args = parser.parse_args()
+
+    scheduler = JobScheduler(workers=max(1, args.workers), queue_path=args.queue,
+                             base_url=args.base_url, metrics_port=args.metrics_port)
+    scheduler.start()
+    try:
+        scheduler.join()
+    except KeyboardInterrupt:
+        print("Stopping the scrape workers after their current job...")
+    finally:
+        scheduler.stop()
@@ -0,0 +1,140 @@
+import os
+import socket
+import threading
+
+from src.constants import BROWSER_WARM_COUNT, JOB_POLL_INTERVAL, MYNTRA_BASE_URL
+from src.jobs.queue import Job, JobQueue
+from src.scrapper.browser import close_browser_pool, get_browser_pool
+from src.scrapper.fetch import HttpFetchEngine
+from src.telemetry import start_metrics_server
+
+
+class ScrapeWorker:
+    """
+    Runs the jobs of a JobQueue one after another.
+
+    A worker reuses the browser pool of its process (see get_browser_pool)
+    and its HTTP connections for every job it runs, and worker processes
+    start a browser before their first job, so jobs do not wait for Chrome.
+    The reviews of each product are stored as soon as they are scraped,
+    written to MongoDB in the background by the MongoIO of the worker's
+    process.
+    """
+
+    def __init__(self, queue: JobQueue, worker_id: str = None, base_url: str = MYNTRA_BASE_URL):
+        """
+        Args:
+            queue: Queue to take jobs from
+            worker_id: Name recorded on the jobs it runs, defaults to host and pid
+            base_url: Site root, override to scrape locally served fixtures
+        """
+        self.queue = queue
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.base_url = base_url
+        self._http = None
+
+    @property
+    def http(self) -> HttpFetchEngine:
+        if self._http is None:
+            self._http = HttpFetchEngine()
+        return self._http
+
+    def run(self, stop_event: threading.Event = None, poll_interval: float = JOB_POLL_INTERVAL,
+            max_jobs: int = None) -> int:
+        """
+        Run jobs until ``stop_event`` is set, waiting for new ones when the
+        queue is empty.
+
+        Args:
+            stop_event: Set to stop once the current job is done
+            poll_interval: Seconds to wait when there is nothing to run
+            max_jobs: Stop after this many jobs, None to keep going
+
+        Returns:
+            int: Number of jobs run
+        """
+        stop_event = stop_event or threading.Event()
+        ran = 0
+        try:
+            while not stop_event.is_set() and (max_jobs is None or ran < max_jobs):
+                job = self.queue.claim(self.worker_id)
+                if job is None:
+                    stop_event.wait(poll_interval)
+                    continue
+                self.run_job(job)
+                ran += 1
+        finally:
+            self.close()
+        return ran
+
+    def run_job(self, job: Job):
+        """Scrape and store the reviews of a claimed job, recording its progress."""
+        # Imported here so a worker process only loads the app's storage once it runs
+        from src.cloud_io import get_mongo_io
+        from src.scrapper.scrape import ScrapeReviews
+
+        print(f"Worker {self.worker_id} running {job}")
+        options = job.options
+        incremental = options.get("incremental", False)
+        try:
+            mongo_io = get_mongo_io()
+            known_review_keys = mongo_io.get_known_review_keys(job.product_name) if incremental else None
+            scrapper = ScrapeReviews(
+                product_name=job.product_name,
+                no_of_products=job.no_of_products,
+                max_workers=options.get("max_workers", 1),
+                base_url=self.base_url,
+                fetch_engine=options.get("fetch_engine", "browser"),
+                http_engine=self.http,
+                use_cache=options.get("use_cache", True),
+                known_review_keys=known_review_keys,
+            )
+
+            products = reviews = 0
+            scrape = scrapper.iter_review_data()
+            try:
+                for batch in scrape:
+                    if batch.empty:
+                        continue
+                    products += 1
+                    reviews += len(batch)
+                    mongo_io.store_reviews(product_name=job.product_name, reviews=batch,
+                                           append=products > 1, incremental=incremental,
+                                           write_behind=True)
+                    if not self.queue.progress(job.job_id, products, reviews):
+                        print(f"Job {job.job_id} was cancelled after {products} products")
+                        return
+            finally:
+                # Stops the scrape and hands the browser back to the pool
+                scrape.close()
+
+            self.queue.finish(job.job_id)
+            print(f"Job {job.job_id} done: {reviews} reviews of {products} products")
+        except Exception as e:
+            print(f"Job {job.job_id} failed: {e}")
+            self.queue.fail(job.job_id, str(e))
+
+    def close(self):
+        """Quit the browsers and close the HTTP connections of this worker."""
+        close_browser_pool()
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+
+def run_worker_process(queue_path: str, base_url: str, stop_event, poll_interval: float,
+                       metrics_port: int = None):
+    """Entry point of a worker process started by JobScheduler."""
+    if metrics_port is not None:
+        start_metrics_server(metrics_port)
+    if BROWSER_WARM_COUNT:
+        # Chrome starts while the worker looks for its first job
+        threading.Thread(target=get_browser_pool(BROWSER_WARM_COUNT).warm,
+                         name="browser-warm", daemon=True).start()
+    queue = JobQueue(queue_path)
+    try:
+        ScrapeWorker(queue, base_url=base_url).run(stop_event, poll_interval=poll_interval)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        queue.close()
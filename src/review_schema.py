@@ -0,0 +1,136 @@
+import hashlib
+
+import pandas as pd
+
+from src.constants import REVIEW_KEY_COLUMN, REVIEW_DATE_FORMAT, REVIEW_DATE_FORMAT_LONG, SENTIMENT_COLUMN
+
+# Fields that identify a review, the ratings and price may change over time
+REVIEW_KEY_FIELDS = ["Product Name", "Date", "Name", "Comment"]
+
+# Analysis-ready type of each review column
+REVIEW_DTYPES = {
+    "Product Name": "category",
+    "Over_All_Rating": "float32",
+    "Price": "float32",
+    "Date": "datetime64[ns]",
+    "Rating": "float32",
+    SENTIMENT_COLUMN: "float32",
+}
+
+
+def review_key(product_name, date, name, comment) -> str:
+    """
+    Fingerprint of a single review, stable across scrapes.
+
+    Returns:
+        str: Hex digest identifying the review
+    """
+    parts = ["" if pd.isna(value) else str(value).strip()
+             for value in (product_name, date, name, comment)]
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def review_keys(reviews: pd.DataFrame) -> pd.Series:
+    """Fingerprint every review of a DataFrame, see review_key."""
+    if reviews.empty:
+        return pd.Series([], index=reviews.index, dtype=object)
+    columns = [reviews[field] if field in reviews else pd.Series("", index=reviews.index)
+               for field in REVIEW_KEY_FIELDS]
+    return pd.Series(
+        [review_key(*values) for values in zip(*columns)],
+        index=reviews.index,
+        dtype=object,
+    )
+
+
+def add_review_keys(reviews: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy of ``reviews`` with its fingerprints in REVIEW_KEY_COLUMN.
+
+    Fingerprints already present are kept: they are computed from the dates
+    as scraped, which normalize_reviews replaces with parsed dates.
+    """
+    reviews = reviews.copy()
+    if REVIEW_KEY_COLUMN in reviews:
+        missing = reviews[REVIEW_KEY_COLUMN].isna()
+        if missing.any():
+            # A column without any key is read back as float NaN
+            keys = reviews[REVIEW_KEY_COLUMN].astype(object)
+            keys[missing] = review_keys(reviews[missing])
+            reviews[REVIEW_KEY_COLUMN] = keys
+    else:
+        reviews[REVIEW_KEY_COLUMN] = review_keys(reviews)
+    return reviews
+
+
+def parse_review_dates(dates: pd.Series) -> pd.Series:
+    """
+    Parse review dates such as "21 Mar 2025", "7 Sept 2024" or "22 July 2025",
+    and dates already written out in ISO format by an earlier normalization.
+
+    Returns:
+        pd.Series: datetime64 values, NaT where a date could not be parsed
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    parsed = pd.to_datetime(dates, format=REVIEW_DATE_FORMAT, errors="coerce")
+    missing = parsed.isna() & dates.notna()
+    if missing.any():
+        # Myntra writes "Sept", and does not abbreviate June and July
+        retry = dates[missing].astype(str).str.replace(" Sept ", " Sep ", regex=False)
+        parsed[missing] = pd.to_datetime(retry, format=REVIEW_DATE_FORMAT, errors="coerce").fillna(
+            pd.to_datetime(retry, format=REVIEW_DATE_FORMAT_LONG, errors="coerce")).fillna(
+            pd.to_datetime(retry, format="ISO8601", errors="coerce"))
+    return parsed
+
+
+def parse_numbers(values: pd.Series) -> pd.Series:
+    """
+    Convert prices and ratings such as "₹1,299" or "4.4" to numbers.
+
+    Returns:
+        pd.Series: float32 values, NaN where there is no number
+    """
+    if not pd.api.types.is_numeric_dtype(values):
+        values = values.astype("string").str.replace(r"[₹,]", "", regex=True).str.strip()
+    return pd.to_numeric(values, errors="coerce").astype("float32")
+
+
+def normalize_reviews(reviews: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert reviews to REVIEW_DTYPES, the types they are stored and analysed in.
+
+    Every conversion is vectorized and already converted columns pass through
+    unchanged, so reviews are normalized once when scraped and stay typed
+    through storage, loading and the dashboard. Columns that are missing are
+    skipped and other columns are left as they are.
+
+    Returns:
+        pd.DataFrame: A normalized copy of ``reviews``
+    """
+    converted = {}
+    for column, dtype in REVIEW_DTYPES.items():
+        if column not in reviews:
+            continue
+        values = reviews[column]
+        if dtype == "datetime64[ns]":
+            converted[column] = parse_review_dates(values)
+        elif dtype == "float32":
+            converted[column] = parse_numbers(values)
+        elif values.dtype != dtype:
+            converted[column] = values.astype(dtype)
+    return reviews.assign(**converted)
+
+
+def to_records(reviews: pd.DataFrame) -> list:
+    """
+    Rows of a DataFrame as dicts of plain Python values, ready for MongoDB or
+    SQLite: missing values become None and float32 columns keep their short
+    form, 4.4 rather than 4.400000095.
+    """
+    float32_columns = reviews.select_dtypes("float32").columns
+    if len(float32_columns):
+        reviews = reviews.astype({column: str for column in float32_columns}).astype(
+            {column: "float64" for column in float32_columns})
+    reviews = reviews.astype(object).where(reviews.notna(), None)
+    return reviews.to_dict(orient="records")
@@ -0,0 +1,353 @@
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from queue import Queue, Empty
+
+from src.constants import (BROWSER_BLOCKED_RESOURCES, BROWSER_HEADLESS, BROWSER_MAX_AGE,
+                           BROWSER_MAX_USES, BROWSER_POOL_SIZE)
+
+# URL patterns of each blockable resource type, for requests made by scripts
+BLOCKED_URL_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "stylesheet": ["*.css"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.mp3"],
+}
+
+# Chrome content settings blocking a resource type whatever its URL
+_BLOCKING_PREFS = {
+    "image": {"profile.managed_default_content_settings.images": 2},
+    "stylesheet": {"profile.managed_default_content_settings.stylesheets": 2},
+}
+
+
+def build_chrome_options(headless: bool = True, blocked_resources: tuple = ()):
+    """
+    Build the Chrome options used for scraping sessions.
+
+    Args:
+        headless: Run Chrome without a visible window
+        blocked_resources: Resource types not to download, see
+            BLOCKED_URL_PATTERNS
+
+    Returns:
+        Options: Configured Chrome options
+    """
+    # Selenium is only loaded by processes that start a browser
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    # Nothing the scraper reads needs these, they only cost memory
+    options.add_argument("--disable-extensions")
+    options.add_argument("--mute-audio")
+
+    prefs = {}
+    for resource in blocked_resources:
+        prefs.update(_BLOCKING_PREFS.get(resource, {}))
+    if prefs:
+        options.add_experimental_option("prefs", prefs)
+    return options
+
+
+def create_driver(headless: bool = True, blocked_resources: tuple = ()):
+    """Start a new Chrome browser session."""
+    from selenium import webdriver
+
+    driver = webdriver.Chrome(options=build_chrome_options(headless=headless,
+                                                           blocked_resources=blocked_resources))
+    patterns = [pattern for resource in blocked_resources
+                for pattern in BLOCKED_URL_PATTERNS.get(resource, [])]
+    if patterns:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        except Exception as e:
+            # Only a bandwidth saving, the session works without it
+            print(f"Could not block browser resources: {e}")
+    return driver
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"Error closing browser session: {e}")
+
+
+def _quit_all(sessions: dict):
+    """Quit the browsers of a pool, also run when a pool is garbage collected or at exit."""
+    for driver in list(sessions):
+        sessions.pop(driver, None)
+        _quit(driver)
+
+
+class BrowserSession:
+    """Bookkeeping of one pooled browser."""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.uses = 0
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.started_at
+
+
+class BrowserPool:
+    """
+    A bounded pool of reusable Chrome drivers.
+
+    Drivers are started lazily, up to ``size`` of them, and handed back to the
+    pool after each use so that concurrent scrape tasks share a fixed number
+    of browser processes instead of launching one per product.
+
+    Browsers are restarted once they were checked out ``max_uses`` times or
+    are older than ``max_age`` seconds, which bounds the memory a long-lived
+    Chrome accumulates. Every browser the pool started is quit when the pool
+    is closed, garbage collected or the interpreter exits; a browser checked
+    out while the pool is closed is quit when it is released.
+    """
+
+    def __init__(self, size: int, headless: bool = True,
+                 max_uses: int = BROWSER_MAX_USES, max_age: float = BROWSER_MAX_AGE,
+                 blocked_resources: tuple = BROWSER_BLOCKED_RESOURCES):
+        """
+        Args:
+            size: Maximum number of browsers
+            headless: Run Chrome without a visible window
+            max_uses: Checkouts before a browser is restarted, None for no limit
+            max_age: Seconds before a browser is restarted, None for no limit
+            blocked_resources: Resource types the browsers do not download
+        """
+        if size < 1:
+            raise ValueError("Browser pool size must be at least 1")
+        self.size = size
+        self.headless = headless
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.blocked_resources = tuple(blocked_resources)
+        self.started = 0
+        self.recycled = 0
+
+        self._idle = Queue()
+        # Driver -> BrowserSession of every browser the pool started
+        self._sessions = {}
+        self._starting = 0
+        # Threads blocked in checkout, each is woken when the pool is closed
+        self._waiting = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._finalizer = weakref.finalize(self, _quit_all, self._sessions)
+
+    def _expired(self, session: BrowserSession) -> bool:
+        return ((self.max_uses is not None and session.uses >= self.max_uses)
+                or (self.max_age is not None and session.age >= self.max_age))
+
+    def _start(self):
+        """Start a browser in a slot reserved by the caller."""
+        try:
+            driver = create_driver(headless=self.headless, blocked_resources=self.blocked_resources)
+        except Exception:
+            with self._lock:
+                self._starting -= 1
+            # Another waiter may be able to start one
+            self._idle.put(None)
+            raise
+        with self._lock:
+            self._starting -= 1
+            self._sessions[driver] = BrowserSession()
+            self.started += 1
+        return driver
+
+    def checkout(self):
+        """Take a driver out of the pool, starting one if the pool is not full."""
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        while True:
+            # Prefer an idle driver before starting a new browser
+            try:
+                driver = self._idle.get_nowait()
+            except Empty:
+                with self._lock:
+                    if self._closed:
+                        raise RuntimeError("Browser pool is closed")
+                    can_create = len(self._sessions) + self._starting < self.size
+                    if can_create:
+                        # Reserve the slot before the (slow) browser start
+                        self._starting += 1
+                    else:
+                        self._waiting += 1
+                if can_create:
+                    driver = self._start()
+                else:
+                    # All drivers are busy, wait for one to be released or discarded
+                    try:
+                        driver = self._idle.get()
+                    finally:
+                        with self._lock:
+                            self._waiting -= 1
+
+            # None wakes a waiter after a browser was discarded, its slot is
+            # free, or after the pool was closed
+            if driver is None:
+                if self._closed:
+                    # Pass the wake-up on, in case it was meant for another waiter
+                    self._idle.put(None)
+                    raise RuntimeError("Browser pool is closed")
+                continue
+            with self._lock:
+                session = self._sessions.get(driver)
+            if session is None:
+                continue
+            if self._expired(session):
+                self._recycle(driver)
+                continue
+            session.uses += 1
+            return driver
+
+    def release(self, driver):
+        """Hand a driver taken with checkout back to the pool."""
+        with self._lock:
+            session = self._sessions.get(driver)
+        if session is None or self._closed:
+            # Started elsewhere or the pool was closed meanwhile
+            if session is not None:
+                self.discard(driver)
+            return
+        if self._expired(session):
+            self._recycle(driver)
+            return
+        self._idle.put(driver)
+
+    def _recycle(self, driver):
+        self.recycled += 1
+        self.discard(driver)
+
+    def discard(self, driver):
+        """Quit a checked out driver instead of returning it, e.g. after it failed."""
+        with self._lock:
+            self._sessions.pop(driver, None)
+        _quit(driver)
+        # Its slot is free, wake a thread waiting in checkout
+        self._idle.put(None)
+
+    @contextmanager
+    def acquire(self):
+        """Borrow a driver from the pool for the duration of the block."""
+        driver = self.checkout()
+        try:
+            yield driver
+        except Exception:
+            # The page may be left in any state, start over with a fresh browser
+            self.discard(driver)
+            raise
+        self.release(driver)
+
+    def grow(self, size: int):
+        """Allow up to ``size`` browsers, a smaller size keeps the current one."""
+        with self._lock:
+            added = size - self.size
+            if added <= 0:
+                return
+            self.size = size
+            waiting = self._waiting
+        # Threads waiting for a free browser may start one in the new slots
+        for _ in range(min(added, waiting)):
+            self._idle.put(None)
+
+    def warm(self, count: int = None):
+        """
+        Start browsers ahead of the first scrape, so it does not wait for them.
+
+        Args:
+            count: Browsers to have running, defaults to the pool size
+        """
+        count = min(self.size, count or self.size)
+
+        def start_one():
+            with self._lock:
+                if self._closed or len(self._sessions) + self._starting >= count:
+                    return
+                self._starting += 1
+            try:
+                # Quit right away if the pool was closed meanwhile
+                self.release(self._start())
+            except Exception as e:
+                print(f"Could not start a browser: {e}")
+
+        threads = [threading.Thread(target=start_one) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def stats(self) -> dict:
+        """Browsers running, and started and recycled since the pool was created."""
+        with self._lock:
+            running = len(self._sessions)
+        return {"running": running, "started": self.started, "recycled": self.recycled}
+
+    def close(self):
+        """
+        Quit the idle browsers of the pool. Browsers still checked out are
+        quit when they are released, and threads waiting in checkout raise
+        RuntimeError.
+        """
+        with self._lock:
+            self._closed = True
+            waiting = self._waiting
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except Empty:
+                break
+            if driver is not None:
+                with self._lock:
+                    self._sessions.pop(driver, None)
+                _quit(driver)
+        for _ in range(waiting):
+            self._idle.put(None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_browser_pool(size: int = None) -> BrowserPool:
+    """
+    Return the browser pool shared by every scrape in the process, so
+    browsers stay warm between scrapes instead of being started for each.
+
+    Args:
+        size: Browsers the caller uses at once. The pool grows to the largest
+            size asked for, up to BROWSER_POOL_SIZE, None asks for that many
+    """
+    global _shared_pool
+    size = min(size or BROWSER_POOL_SIZE, BROWSER_POOL_SIZE)
+    with _shared_pool_lock:
+        if _shared_pool is None or _shared_pool._closed:
+            headless = os.getenv("BROWSER_HEADLESS", str(int(BROWSER_HEADLESS))) != "0"
+            _shared_pool = BrowserPool(size=size, headless=headless)
+        else:
+            _shared_pool.grow(size)
+    return _shared_pool
+
+
+def close_browser_pool():
+    """Quit the browsers of the shared pool, a later scrape starts new ones."""
+    with _shared_pool_lock:
+        if _shared_pool is not None:
+            _shared_pool.close()
@@ -0,0 +1,128 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from src.constants import PAGE_CACHE_DIR, PAGE_CACHE_MAX_BYTES, PAGE_CACHE_TTL
+
+
+class PageCache:
+    """
+    On-disk cache of fetched pages, keyed by URL.
+
+    Pages are stored compressed in a SQLite file. Each entry expires after the
+    TTL of its page type, and once the cache grows past ``max_bytes`` the
+    least recently used pages are evicted.
+    """
+
+    def __init__(self,
+                 cache_dir: str = None,
+                 max_bytes: int = PAGE_CACHE_MAX_BYTES,
+                 ttl: dict = None):
+        """
+        Args:
+            cache_dir: Directory holding the cache file, defaults to
+                PAGE_CACHE_DIR in the working directory
+            max_bytes: Upper bound on the compressed size of cached pages
+            ttl: Seconds a page stays fresh, per page type
+        """
+        cache_dir = cache_dir or os.path.join(os.getcwd(), PAGE_CACHE_DIR)
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "pages.sqlite")
+        self.max_bytes = max_bytes
+        self.ttl = {**PAGE_CACHE_TTL, **(ttl or {})}
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                " url TEXT PRIMARY KEY,"
+                " page_type TEXT NOT NULL,"
+                " body BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)"
+            )
+
+    def get(self, url: str, page_type: str):
+        """
+        Returns:
+            str: The cached page, or None when it is missing or expired
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT body, stored_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            body, stored_at = row
+            if now - stored_at > self.ttl.get(page_type, 0):
+                self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+                return None
+
+            self._conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, url))
+        return zlib.decompress(body).decode("utf-8")
+
+    def put(self, url: str, page_type: str, page: str):
+        body = zlib.compress(page.encode("utf-8"))
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, page_type, body, size, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (url, page_type, body, len(body), now, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used pages until the cache fits in max_bytes."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for url, size in self._conn.execute("SELECT url, size FROM pages ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((url,))
+            total -= size
+        self._conn.executemany("DELETE FROM pages WHERE url = ?", evicted)
+
+    def invalidate(self, url: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM pages")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_shared_caches = {}
+_shared_caches_lock = threading.Lock()
+
+
+def get_page_cache(cache_dir: str = None) -> PageCache:
+    """
+    Return the page cache shared by every scrape in the process, one per
+    cache directory, so scrapes and their worker threads reuse a single
+    SQLite connection instead of opening their own.
+
+    Args:
+        cache_dir: Directory holding the cache file, see PageCache
+    """
+    cache_dir = os.path.abspath(cache_dir or os.path.join(os.getcwd(), PAGE_CACHE_DIR))
+    with _shared_caches_lock:
+        if cache_dir not in _shared_caches:
+            _shared_caches[cache_dir] = PageCache(cache_dir)
+        return _shared_caches[cache_dir]
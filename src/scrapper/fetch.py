@@ -0,0 +1,95 @@
+import asyncio
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.constants import HTTP_TIMEOUT, HTTP_USER_AGENT
+
+# Markup inserted by scripts is not in the page yet, e.g. lazily loaded reviews
+_SCRIPTS = re.compile(r"<script\b.*?</script>", re.IGNORECASE | re.DOTALL)
+
+
+class HttpFetchEngine:
+    """
+    Lightweight page fetcher for content that is available without JavaScript.
+
+    A single keep-alive session with a connection pool sized for the number of
+    concurrent workers is shared by every request, so fetching many pages from
+    the same host reuses TCP/TLS connections instead of starting a browser.
+    """
+
+    def __init__(self, pool_size: int = 10, timeout: float = HTTP_TIMEOUT, retries: int = 2):
+        self.pool_size = pool_size
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": HTTP_USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=retries, backoff_factor=0.3,
+                              status_forcelist=(429, 500, 502, 503, 504))
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch(self, url: str):
+        """
+        Fetch a page over HTTP.
+
+        Returns:
+            str: The response body, or None when the request failed
+        """
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"HTTP fetch failed for {url}: {e}")
+            return None
+
+        if response.status_code != 200:
+            print(f"HTTP fetch for {url} returned status {response.status_code}")
+            return None
+        return response.text
+
+    def fetch_many(self, urls: list) -> list:
+        """Fetch several pages concurrently, keeping the order of ``urls``."""
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            return list(executor.map(self.fetch, urls))
+
+    async def afetch(self, url: str):
+        """Awaitable version of fetch for use from asyncio code."""
+        return await asyncio.to_thread(self.fetch, url)
+
+    async def afetch_many(self, urls: list) -> list:
+        """Fetch several pages concurrently from asyncio code."""
+        return list(await asyncio.gather(*(self.afetch(url) for url in urls)))
+
+    def close(self):
+        self.session.close()
+
+
+def is_server_rendered(page: str, ready_marker: str = None, min_count: int = 1) -> bool:
+    """
+    Check whether a page fetched without JavaScript already holds the content
+    we parse, by looking for the class name the parser keys on. Occurrences
+    inside scripts are not counted, they are only rendered by the browser.
+
+    Args:
+        page: Raw HTML
+        ready_marker: Class name that must appear in the page
+        min_count: Minimum number of occurrences of ``ready_marker``
+    """
+    if not page:
+        return False
+    if ready_marker is None:
+        return True
+    if page.count(ready_marker) < min_count:
+        return False
+    return _SCRIPTS.sub("", page).count(ready_marker) >= min_count
@@ -0,0 +1,102 @@
+from bs4 import BeautifulSoup as bs, SoupStrainer
+
+from src.constants import REVIEW_CARD_CLASS, NO_RATING, NO_COMMENT, NO_NAME, NO_DATE
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:  # lxml is optional, fall back to the pure Python parser
+    etree = None
+    lxml_html = None
+
+
+PARSER_BACKENDS = ("lxml", "html.parser")
+
+REVIEW_FIELDS = ["Date", "Rating", "Name", "Comment"]
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching an element carrying the class ``name``."""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+if etree is not None:
+    # Compiled once, reused for every page
+    _XPATH_CARDS = etree.XPath(
+        f'//div[{_has_class("detailed-reviews-userReviewsContainer")}]'
+        f'//div[{_has_class(REVIEW_CARD_CLASS)}]'
+    )
+    _XPATH_RATING = etree.XPath(f'.//span[{_has_class("user-review-starRating")}]')
+    _XPATH_COMMENT = etree.XPath(f'.//div[{_has_class("user-review-reviewTextWrapper")}]')
+    _XPATH_AUTHOR_SPANS = etree.XPath(f'.//div[{_has_class("user-review-left")}]//span')
+
+_CONTAINER_STRAINER = SoupStrainer("div", class_="detailed-reviews-userReviewsContainer")
+
+
+class ReviewPageParser:
+    """
+    Parse the review list of a product into one record per review card.
+
+    Each card is visited once and all of its fields are read together, so a
+    review with a missing field keeps its other fields instead of shifting
+    every following review out of alignment.
+    """
+
+    def __init__(self, backend: str = None):
+        """
+        Args:
+            backend: "lxml" or "html.parser", defaults to lxml when installed
+        """
+        if backend is None:
+            backend = "lxml" if etree is not None else "html.parser"
+        if backend not in PARSER_BACKENDS:
+            raise ValueError(f"backend must be one of {PARSER_BACKENDS}")
+        if backend == "lxml" and etree is None:
+            raise ValueError("The lxml backend requires the lxml package")
+        self.backend = backend
+
+    def parse(self, page: str, limit: int = None) -> list:
+        """
+        Args:
+            page: Review page HTML
+            limit: Maximum number of reviews to return
+
+        Returns:
+            list: Dicts with the Date, Rating, Name and Comment of each review
+        """
+        if not page:
+            return []
+        if self.backend == "lxml":
+            return self._parse_lxml(page, limit)
+        return self._parse_soup(page, limit)
+
+    def _parse_lxml(self, page: str, limit: int) -> list:
+        tree = lxml_html.fromstring(page)
+        reviews = []
+        for card in _XPATH_CARDS(tree)[:limit]:
+            rating = _XPATH_RATING(card)
+            comment = _XPATH_COMMENT(card)
+            author = _XPATH_AUTHOR_SPANS(card)
+            reviews.append({
+                "Date": author[1].text_content() if len(author) > 1 else NO_DATE,
+                "Rating": rating[0].text_content().strip() if rating else NO_RATING,
+                "Name": author[0].text_content() if author else NO_NAME,
+                "Comment": comment[0].text_content() if comment else NO_COMMENT,
+            })
+        return reviews
+
+    def _parse_soup(self, page: str, limit: int) -> list:
+        # Only build the tree for the review containers
+        review_html = bs(page, "html.parser", parse_only=_CONTAINER_STRAINER)
+        reviews = []
+        for card in review_html.find_all("div", class_=REVIEW_CARD_CLASS, limit=limit):
+            rating = card.find("span", class_="user-review-starRating")
+            comment = card.find("div", class_="user-review-reviewTextWrapper")
+            author_box = card.find("div", class_="user-review-left")
+            author = author_box.find_all("span", limit=2) if author_box else []
+            reviews.append({
+                "Date": author[1].text if len(author) > 1 else NO_DATE,
+                "Rating": rating.get_text().strip() if rating else NO_RATING,
+                "Name": author[0].text if author else NO_NAME,
+                "Comment": comment.text if comment else NO_COMMENT,
+            })
+        return reviews
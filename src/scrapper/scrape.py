@@ -1,30 +1,214 @@
-from flask import request
-from selenium import webdriver 
-from selenium.webdriver.common.by import By 
 from src.exception import CustomException
+from src.constants import (MYNTRA_BASE_URL, REVIEW_CARD_CLASS, REVIEW_CARD_SELECTOR,
+                           REVIEW_LOAD_TIMEOUT, REVIEW_IDLE_TIMEOUT, REVIEW_POLL_INTERVAL,
+                           FETCH_ENGINES, REVIEW_COLUMNS, REVIEW_KEY_COLUMN)
+from src.scrapper.browser import BrowserPool, get_browser_pool
+from src.scrapper.fetch import HttpFetchEngine, is_server_rendered
+from src.scrapper.parser import ReviewPageParser, REVIEW_FIELDS, NO_COMMENT, NO_DATE, NO_NAME
+from src.review_schema import review_key, review_keys, normalize_reviews
+from src.scrapper.cache import PageCache, get_page_cache
+from src.telemetry import inc, span, timed
 from bs4 import BeautifulSoup as bs
 import pandas as pd
 import os, sys
 import time
-from selenium.webdriver.chrome.options import Options 
-from urllib.parse import quote
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote, urljoin
 
 
 class ScrapeReviews:
     def __init__(self,
                  product_name:str,
-                 no_of_products:int):
-        options = Options()
-        # options.add_argument("--no-sandbox")
-        # options.add_argument("--disable-dev-shm-usage")
-        # options.add_argument('--headless')
-        
-        # Start a new Chrome browser session
-        self.driver = webdriver.Chrome(options=options)
+                 no_of_products:int,
+                 max_workers: int = 1,
+                 base_url: str = MYNTRA_BASE_URL,
+                 max_reviews_per_product: int = None,
+                 fetch_engine: str = "browser",
+                 driver=None,
+                 browser_pool: BrowserPool = None,
+                 http_engine: HttpFetchEngine = None,
+                 parser_backend: str = None,
+                 use_cache: bool = True,
+                 page_cache: PageCache = None,
+                 known_review_keys: set = None):
+        """
+        Args:
+            product_name: Search query for the products to scrape
+            no_of_products: Number of products with reviews to collect
+            max_workers: Number of browser workers used to scrape products
+                concurrently (1 keeps the sequential behaviour)
+            base_url: Site root, override to scrape locally served fixtures
+            max_reviews_per_product: Cap on the reviews loaded per product
+                (None loads the whole review list)
+            fetch_engine: How pages are loaded, "browser" renders every page in
+                Chrome, "http" only uses plain HTTP requests and "auto" tries
+                HTTP first and falls back to the browser when the content
+                needs JavaScript
+            driver: Existing webdriver to use instead of a pooled one, it is
+                left open
+            browser_pool: Pool to borrow drivers from, defaults to the
+                process-wide pool (see get_browser_pool), so browsers stay
+                warm between scrapes
+            http_engine: Shared HTTP engine used by the "http" and "auto" modes
+            parser_backend: Review page parser backend, "lxml" (default when
+                installed) or "html.parser"
+            use_cache: Serve pages from the on-disk page cache while they are
+                fresh, set to False to always fetch from the site
+            page_cache: Cache to use instead of the process-wide one (see
+                get_page_cache), the caller closes it
+            known_review_keys: Fingerprints of reviews already stored (see
+                MongoIO.get_known_review_keys). When given, review lists stop
+                loading once a whole batch is already known and only new
+                reviews are returned
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        if fetch_engine not in FETCH_ENGINES:
+            raise ValueError(f"fetch_engine must be one of {FETCH_ENGINES}")
+
+        # The browser is borrowed on first use, see the driver property
+        self._driver = driver
+        self._owns_driver = driver is None
+        self._browser_pool = browser_pool
+        self._driver_finalizer = None
+        self._http = http_engine
+        self._owns_http = http_engine is None
 
         self.product_name = product_name
         self.no_of_products = no_of_products
+        self.max_workers = max_workers
+        self.base_url = base_url
+        self.max_reviews_per_product = max_reviews_per_product
+        self.fetch_engine = fetch_engine
+        self.review_parser = ReviewPageParser(backend=parser_backend)
+        self.use_cache = use_cache
+        self._page_cache = page_cache
+        self.known_review_keys = known_review_keys
+
+    @property
+    def browser_pool(self) -> BrowserPool:
+        if self._browser_pool is None:
+            self._browser_pool = get_browser_pool(self.max_workers)
+        return self._browser_pool
+
+    @property
+    def driver(self):
+        if self._driver is None:
+            pool = self.browser_pool
+            self._driver = pool.checkout()
+            # Returned to the pool even if this instance is dropped without close()
+            self._driver_finalizer = weakref.finalize(self, pool.release, self._driver)
+        return self._driver
+
+    @property
+    def page_cache(self) -> PageCache:
+        if self._page_cache is None and self.use_cache:
+            self._page_cache = get_page_cache()
+        return self._page_cache
+
+    @property
+    def http(self) -> HttpFetchEngine:
+        if self._http is None:
+            self._http = HttpFetchEngine(pool_size=self.max_workers)
+        return self._http
+
+    def close_browser(self, discard: bool = False):
+        """
+        Hand the browser back to its pool if this instance borrowed it.
+
+        Args:
+            discard: Quit the browser instead, e.g. after a failed scrape left
+                it in an unknown state
+        """
+        if self._owns_driver and self._driver is not None:
+            self._driver_finalizer.detach()
+            if discard:
+                self._browser_pool.discard(self._driver)
+            else:
+                self._browser_pool.release(self._driver)
+            self._driver = None
+            self._driver_finalizer = None
+
+    def close(self, discard_browser: bool = False):
+        """Release the browser session and HTTP connections held by this instance."""
+        self.close_browser(discard=discard_browser)
+        if self._owns_http and self._http is not None:
+            self._http.close()
+            self._http = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(discard_browser=exc_type is not None)
+
+    def load_page(self, url: str, page_type: str, ready_marker: str = None,
+                  scroll: bool = False) -> str:
+        """
+        Load a page from the page cache or with the configured fetch engine.
+
+        In "auto" mode the page is first fetched over HTTP and only rendered in
+        the browser when ``ready_marker`` is missing from the response. Review
+        lists that need scrolling are only taken from HTTP when they already
+        hold ``max_reviews_per_product`` reviews.
+
+        Args:
+            url: Page to load
+            page_type: "search", "product" or "reviews", selects the cache TTL
+            ready_marker: Class name the parser needs to find in the page
+            scroll: Scroll the page in the browser to load the whole review list
 
+        Returns:
+            str: The page HTML
+        """
+        cache_key = url
+        # Incremental scrapes stop scrolling at the first known reviews, and
+        # need the newest ones, a cached review list may predate them
+        use_cache = self.use_cache and not (scroll and self.known_review_keys)
+        if scroll:
+            # A capped or partially loaded review list is not a valid answer
+            # for a full one
+            cache_key = f"{url}#max_reviews={self.max_reviews_per_product}"
+        if use_cache:
+            page = self.page_cache.get(cache_key, page_type)
+            if page is not None:
+                inc("pages_total", page_type=page_type, source="cache")
+                inc("page_bytes_total", len(page), page_type=page_type, source="cache")
+                return page
+
+        with span("fetch_page", page_type=page_type, engine=self.fetch_engine) as fields:
+            page = self._fetch_page(url, ready_marker, scroll)
+            fields["bytes"] = len(page)
+        inc("pages_total", page_type=page_type, source="site")
+        inc("page_bytes_total", len(page), page_type=page_type, source="site")
+        if use_cache and is_server_rendered(page, ready_marker):
+            # Only complete pages are cached, never error or block pages
+            self.page_cache.put(cache_key, page_type, page)
+        return page
+
+    def _fetch_page(self, url: str, ready_marker: str = None, scroll: bool = False) -> str:
+        if self.fetch_engine in ("http", "auto"):
+            page = self.http.fetch(url)
+            if self.fetch_engine == "http":
+                return page or ""
+
+            min_count = 1
+            if scroll:
+                # Without a review cap only the browser can load the full list
+                min_count = self.max_reviews_per_product or float("inf")
+            if is_server_rendered(page, ready_marker, min_count=min_count):
+                return page
+            print(f"Falling back to the browser for {url}")
+            inc("browser_fallbacks_total")
+
+        self.driver.get(url)
+        if scroll:
+            self.scroll_to_load_reviews(max_reviews=self.max_reviews_per_product,
+                                        known_review_keys=self.known_review_keys)
+        return self.driver.page_source
+
+    @timed("scrape_product_urls")
     def scrape_product_urls(self, product_name):
         try:
             # Validate product name
@@ -36,10 +220,11 @@ class ScrapeReviews:
 
             encoded_query = quote(search_string)
             # Navigate to the URL
-            self.driver.get(
-                f"https://www.myntra.com/{search_string}?rawQuery={encoded_query}"
+            myntra_text = self.load_page(
+                urljoin(self.base_url, f"{search_string}?rawQuery={encoded_query}"),
+                page_type="search",
+                ready_marker="results-base"
             )
-            myntra_text = self.driver.page_source
             myntra_html = bs(myntra_text, "html.parser")
             pclass = myntra_html.findAll("ul", {"class": "results-base"})
 
@@ -59,11 +244,15 @@ class ScrapeReviews:
         except Exception as e:
             raise CustomException(e, sys)
 
+    @timed("extract_reviews")
     def extract_reviews(self, product_link):
         try:
-            productLink = "https://www.myntra.com/" + product_link
-            self.driver.get(productLink)
-            prodRes = self.driver.page_source
+            # Reset product details so a missing field is not carried over
+            self.product_rating_value = None
+            self.product_price = None
+
+            productLink = urljoin(self.base_url, product_link)
+            prodRes = self.load_page(productLink, page_type="product", ready_marker="pdp-price")
             prodRes_html = bs(prodRes, "html.parser")
             title_h = prodRes_html.findAll("title")
 
@@ -87,113 +276,144 @@ class ScrapeReviews:
         except Exception as e:
             raise CustomException(e, sys)
         
-    def scroll_to_load_reviews(self):
+    def count_loaded_reviews(self) -> int:
+        """Number of review cards currently present in the page."""
+        return self.driver.execute_script(
+            "return document.querySelectorAll(arguments[0]).length;",
+            REVIEW_CARD_SELECTOR
+        )
+
+    def _more_reviews_loaded(self, previous: int):
+        """Wait condition: the new review count once it exceeds ``previous``."""
+        count = self.count_loaded_reviews()
+        return count if count > previous else False
+
+    def _loaded_reviews_known(self, start: int, known_review_keys: set) -> bool:
+        """Whether every review card from index ``start`` on is already stored."""
+        cards = self.driver.execute_script(
+            """
+            var cards = document.querySelectorAll(arguments[0]), out = [];
+            for (var i = arguments[1]; i < cards.length; i++) {
+                var spans = cards[i].querySelectorAll('.user-review-left span');
+                var comment = cards[i].querySelector('.user-review-reviewTextWrapper');
+                out.push([spans.length > 1 ? spans[1].textContent : null,
+                          spans.length ? spans[0].textContent : null,
+                          comment ? comment.textContent : null]);
+            }
+            return out;
+            """,
+            REVIEW_CARD_SELECTOR, start
+        )
+        if not cards:
+            return False
+        return all(
+            review_key(self.product_title, date or NO_DATE, name or NO_NAME,
+                       comment or NO_COMMENT) in known_review_keys
+            for date, name, comment in cards
+        )
+
+    @timed("scroll_to_load_reviews")
+    def scroll_to_load_reviews(self,
+                               max_reviews: int = None,
+                               max_seconds: float = REVIEW_LOAD_TIMEOUT,
+                               idle_timeout: float = REVIEW_IDLE_TIMEOUT,
+                               poll_interval: float = REVIEW_POLL_INTERVAL,
+                               known_review_keys: set = None) -> int:
+        """
+        Scroll the review list until no new review cards arrive.
+
+        Instead of sleeping a fixed time per scroll step, each step scrolls to
+        the bottom and polls the review card count, moving on as soon as new
+        cards are in the DOM. Loading stops when a step brings nothing within
+        ``idle_timeout``, when ``max_reviews`` are loaded or after ``max_seconds``.
+
+        With ``known_review_keys`` loading also stops as soon as every review
+        of a batch is already stored. Review lists are newest first, so the
+        rest of the list has been scraped before.
+
+        Args:
+            max_reviews: Stop once this many reviews are loaded (None for all)
+            max_seconds: Upper bound on the total time spent loading
+            idle_timeout: How long a step may wait for new reviews
+            poll_interval: Delay between review count checks
+            known_review_keys: Fingerprints of the reviews already stored
+
+        Returns:
+            int: Number of review cards loaded
+        """
+        # Selenium is only loaded once a page is scrolled in the browser
+        from selenium.common.exceptions import TimeoutException
+        from selenium.webdriver.support.ui import WebDriverWait
+
         # Change the window size to load more data
-        self.driver.set_window_size(1920, 1080)  # Example window size, adjust as needed
+        self.driver.set_window_size(1920, 1080)
 
-        # Get the initial height of the page
-        last_height = self.driver.execute_script("return document.body.scrollHeight")
-        
-        # Scroll in smaller increments, waiting between scrolls
-        while True:
-            # Scroll down by a small amount
-            self.driver.execute_script("window.scrollBy(0, 1000);")
-            time.sleep(3)  # Adjust this delay if needed
-            
-            # Calculate the new height after scrolling
-            new_height = self.driver.execute_script("return document.body.scrollHeight")
-            
-            # Break the loop if no new content is loaded after scrolling
-            if new_height == last_height:
+        loaded = self.count_loaded_reviews()
+        deadline = time.monotonic() + max_seconds
+        self.review_load_steps = []
+
+        if known_review_keys and self._loaded_reviews_known(0, known_review_keys):
+            print("No new reviews since the last scrape")
+            return loaded
+
+        while max_reviews is None or loaded < max_reviews:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(f"Stopped loading reviews after {max_seconds}s with {loaded} reviews loaded")
+                break
+
+            # Scroll to the bottom to trigger the next batch of reviews
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+
+            previous = loaded
+            try:
+                loaded = WebDriverWait(
+                    self.driver,
+                    timeout=min(idle_timeout, remaining),
+                    poll_frequency=poll_interval
+                ).until(lambda driver: self._more_reviews_loaded(previous))
+            except TimeoutException:
+                # No new reviews arrived, the list is fully loaded
                 break
-            
-            # Update the last height for the next iteration
-            last_height = new_height
 
+            self.review_load_steps.append(loaded - previous)
+            print(f"Review loader step {len(self.review_load_steps)}: "
+                  f"{loaded - previous} new reviews ({loaded} loaded)")
+
+            if known_review_keys and self._loaded_reviews_known(previous, known_review_keys):
+                print("Reached reviews stored by a previous scrape")
+                break
 
+        return loaded
 
+    @timed("extract_products")
     def extract_products(self, product_reviews: list):
         try:
             t2 = product_reviews["href"]
-            Review_link = "https://www.myntra.com" + t2
-            self.driver.get(Review_link)
-            
-            self.scroll_to_load_reviews()
-            
-            review_page = self.driver.page_source
-
-            review_html = bs(review_page, "html.parser")
-            review = review_html.findAll(
-                "div", {"class": "detailed-reviews-userReviewsContainer"}
-            )
-
-            # Initialize these lists before the loop
-            user_rating = []
-            user_comment = []
-            user_name = []
-            
-            # Collect all review data from all containers
-            for i in review:
-                user_rating.extend(i.findAll(
-                    "div", {"class": "user-review-main user-review-showRating"}
-                ))
-                user_comment.extend(i.findAll(
-                    "div", {"class": "user-review-reviewTextWrapper"}
-                ))
-                user_name.extend(i.findAll("div", {"class": "user-review-left"}))
-
-            reviews = []
-            # Use the minimum length to avoid index errors
-            max_reviews = min(len(user_rating), len(user_comment), len(user_name))
-            
-            for i in range(max_reviews):
-                try:
-                    rating = (
-                        user_rating[i]
-                        .find("span", class_="user-review-starRating")
-                        .get_text()
-                        .strip()
-                    )
-                except Exception:
-                    rating = "No rating Given"
-                try:
-                    comment = user_comment[i].text
-                except Exception:
-                    comment = "No comment Given"
-                try:
-                    name = user_name[i].find("span").text
-                except Exception:
-                    name = "No Name given"
-                try:
-                    spans = user_name[i].find_all("span")
-                    date = spans[1].text if len(spans) > 1 else "No Date given"
-                except Exception:
-                    date = "No Date given"
-
-                mydict = {
-                    "Product Name": self.product_title,
-                    "Over_All_Rating": self.product_rating_value,
-                    "Price": self.product_price,
-                    "Date": date,
-                    "Rating": rating,
-                    "Name": name,
-                    "Comment": comment,
-                }
-                reviews.append(mydict)
-
-            review_data = pd.DataFrame(
-                reviews,
-                columns=[
-                    "Product Name",
-                    "Over_All_Rating",
-                    "Price",
-                    "Date",
-                    "Rating",
-                    "Name",
-                    "Comment",
-                ],
-            )
-
+            Review_link = urljoin(self.base_url, t2)
+            review_page = self.load_page(Review_link, page_type="reviews",
+                                         ready_marker=REVIEW_CARD_CLASS, scroll=True)
+
+            with span("parse_reviews", backend=self.review_parser.backend) as fields:
+                reviews = self.review_parser.parse(review_page, limit=self.max_reviews_per_product)
+                fields["reviews"] = len(reviews)
+
+            with span("build_dataframe"):
+                review_data = pd.DataFrame(reviews, columns=REVIEW_FIELDS)
+                review_data.insert(0, "Product Name", self.product_title)
+                review_data.insert(1, "Over_All_Rating", self.product_rating_value)
+                review_data.insert(2, "Price", self.product_price)
+
+                # Fingerprint the reviews before their dates are parsed
+                review_data[REVIEW_KEY_COLUMN] = review_keys(review_data)
+                if self.known_review_keys:
+                    # Only keep the reviews that are not stored yet
+                    review_data = review_data[~review_data[REVIEW_KEY_COLUMN].isin(self.known_review_keys)]
+                    review_data = review_data.reset_index(drop=True)
+                review_data = normalize_reviews(review_data)
+
+            inc("products_total")
+            inc("reviews_total", len(review_data))
             return review_data
 
         except Exception as e:
@@ -219,68 +439,145 @@ class ScrapeReviews:
             
         return product_urls
 
-    def get_review_data(self) -> pd.DataFrame:
-        try:
-            # search_string = self.request.form["content"].replace(" ", "-")
-            # no_of_products = int(self.request.form["prod_no"])
+    def iter_products_sequentially(self, product_urls: list, max_products: int):
+        """
+        Scrape product reviews one product at a time on this instance's browser.
 
-            product_urls = self.scrape_product_urls(product_name=self.product_name)
+        Args:
+            product_urls: Product links returned by scrape_product_urls
+            max_products: Number of products with reviews to collect
 
-            product_details = []
+        Yields:
+            pd.DataFrame: The reviews of each product, in search order
+        """
+        review_len = 0
+
+        while review_len < max_products and product_urls:
+            # Check if we have enough URLs left
+            if review_len >= len(product_urls):
+                break
+                
+            product_url = product_urls[review_len]
+            review = self.extract_reviews(product_url)
+
+            if review:
+                review_len += 1
+                yield self.extract_products(review)
+            else:
+                product_urls.pop(review_len)
+                # Don't increment review_len here as we've removed an item
+
+    def _scrape_product(self, pool: BrowserPool, product_url: str):
+        """
+        Scrape a single product in a worker sharing this instance's settings.
+        A driver is only borrowed from the pool if a page needs the browser.
+        """
+        worker = ScrapeReviews(product_name=self.product_name,
+                               no_of_products=1,
+                               base_url=self.base_url,
+                               max_reviews_per_product=self.max_reviews_per_product,
+                               fetch_engine=self.fetch_engine,
+                               browser_pool=pool,
+                               http_engine=self._http,
+                               parser_backend=self.review_parser.backend,
+                               use_cache=self.use_cache,
+                               page_cache=self._page_cache,
+                               known_review_keys=self.known_review_keys)
+        with worker:
+            review = worker.extract_reviews(product_url)
+            if not review:
+                return None
+            return worker.extract_products(review)
+
+    def iter_products_concurrently(self, product_urls: list, max_products: int):
+        """
+        Scrape product reviews on ``max_workers`` threads sharing the browser pool.
+
+        Products are submitted in waves of the number still needed; products
+        without reviews are replaced by the next URLs, exactly like the
+        sequential loop. Each product is yielded as soon as it and every
+        product before it in ``product_urls`` are done.
+
+        Args:
+            product_urls: Product links returned by scrape_product_urls
+            max_products: Number of products with reviews to collect
+
+        Yields:
+            pd.DataFrame: The reviews of each product, in search order
+        """
+        found = 0
+        next_index = 0
+
+        if self.fetch_engine in ("http", "auto"):
+            # Create the shared HTTP engine before the workers start
+            self.http
+        if self.use_cache:
+            self.page_cache
+
+        pool = self.browser_pool
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while found < max_products and next_index < len(product_urls):
+                needed = max_products - found
+                batch = range(next_index, min(next_index + needed, len(product_urls)))
+                next_index = batch.stop
+
+                futures = {
+                    index: executor.submit(self._scrape_product, pool, product_urls[index])
+                    for index in batch
+                }
+                for index, future in futures.items():
+                    product_detail = future.result()
+                    if product_detail is not None:
+                        found += 1
+                        yield product_detail
+
+    def iter_review_data(self):
+        """
+        Scrape the reviews product by product.
+
+        Each product's reviews are yielded as soon as they are scraped, so
+        callers can show or store results progressively instead of waiting
+        for the whole scrape. The browser is closed when the generator is
+        exhausted or closed early, and quit when the scrape fails.
+
+        Yields:
+            pd.DataFrame: The reviews of one product, in search order
+        """
+        failed = False
+        try:
+            product_urls = self.scrape_product_urls(product_name=self.product_name)
 
-            review_len = 0
-            
             # Make sure we don't try to process more products than we have URLs for
             max_products = min(self.no_of_products, len(product_urls))
 
-            while review_len < max_products and product_urls:
-                # Check if we have enough URLs left
-                if review_len >= len(product_urls):
-                    break
-                    
-                product_url = product_urls[review_len]
-                review = self.extract_reviews(product_url)
-
-                if review:
-                    product_detail = self.extract_products(review)
-                    product_details.append(product_detail)
+            if self.max_workers > 1:
+                # The search page is all the main browser is needed for
+                self.close_browser()
+                yield from self.iter_products_concurrently(product_urls, max_products)
+            else:
+                yield from self.iter_products_sequentially(product_urls, max_products)
 
-                    review_len += 1
-                else:
-                    product_urls.pop(review_len)
-                    # Don't increment review_len here as we've removed an item
+        except Exception as e:
+            failed = True
+            raise CustomException(e, sys)
+        finally:
+            # Never leak the browser, whether the scrape finished or not
+            self.close(discard_browser=failed)
 
-            self.driver.quit()
+    def get_review_data(self) -> pd.DataFrame:
+        try:
+            product_details = list(self.iter_review_data())
 
             # Check if we have any product details before concatenating
             if not product_details:
                 print("No product reviews were found.")
                 # Return an empty DataFrame with the expected columns
-                return pd.DataFrame(columns=[
-                    "Product Name",
-                    "Over_All_Rating",
-                    "Price",
-                    "Date",
-                    "Rating",
-                    "Name",
-                    "Comment",
-                ])
+                return pd.DataFrame(columns=REVIEW_COLUMNS)
                 
-            data = pd.concat(product_details, axis=0)
-            
-            data.to_csv("data.csv", index=False)
-            
-            return data
-            
-            
-                
-            # columns = data.columns
+            # Concatenating loses the categorical product names, restore them
+            data = normalize_reviews(pd.concat(product_details, axis=0))
 
-            # values = [[data.loc[i, col] for col in data.columns ] for i in range(len(data)) ]
-            
-            # return columns, values
-        
-    
+            return data
 
         except Exception as e:
             raise CustomException(e, sys)
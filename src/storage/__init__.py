@@ -0,0 +1,29 @@
+import os
+
+from src.constants import REVIEW_STORE_BACKEND, REVIEW_STORE_BACKENDS
+from src.storage.base import ReviewStore
+from src.storage.parquet import ParquetReviewStore
+from src.storage.sqlite import SQLiteReviewStore
+
+_BACKENDS = {
+    "parquet": ParquetReviewStore,
+    "sqlite": SQLiteReviewStore,
+}
+
+
+def create_review_store(backend: str = None, root: str = None) -> ReviewStore:
+    """
+    Create the embedded review store.
+
+    Args:
+        backend: One of REVIEW_STORE_BACKENDS, defaults to the
+            REVIEW_STORE_BACKEND environment variable or constant
+        root: Directory of the store, see ReviewStore
+
+    Returns:
+        ReviewStore: The store
+    """
+    backend = backend or os.getenv("REVIEW_STORE_BACKEND") or REVIEW_STORE_BACKEND
+    if backend not in REVIEW_STORE_BACKENDS:
+        raise ValueError(f"backend must be one of {REVIEW_STORE_BACKENDS}")
+    return _BACKENDS[backend](root=root)
@@ -0,0 +1,147 @@
+import abc
+import glob
+import os
+
+import pandas as pd
+
+from src.constants import LOCAL_STORE_DIR, REVIEW_KEY_COLUMN, REVIEW_READ_BATCH_SIZE
+from src.data_report.summary import SUMMARY_COLUMNS, TOP_REVIEWS, summaries_from_frame
+from src.review_schema import add_review_keys, normalize_reviews
+
+# Left in the store directory once the CSV backups were migrated
+CSV_MIGRATION_MARKER = ".csv_migrated"
+
+
+class ReviewStore(abc.ABC):
+    """
+    Embedded review storage, used offline and when MongoDB is unavailable.
+
+    A store holds one collection of reviews per product search, named like
+    the MongoDB collections. Reviews are written normalized and with their
+    REVIEW_KEY_COLUMN (see MongoIO.store_reviews).
+    """
+
+    def __init__(self, root: str = None):
+        """
+        Args:
+            root: Directory of the store, defaults to LOCAL_STORE_DIR in the
+                working directory
+        """
+        self.root = root or os.path.join(os.getcwd(), LOCAL_STORE_DIR)
+
+    @abc.abstractmethod
+    def exists(self, collection_name: str) -> bool:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def list_collections(self) -> list:
+        """Names of the collections holding reviews."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def fingerprint(self, collection_name: str):
+        """
+        Returns:
+            tuple: Changes whenever reviews of the collection are written,
+                None when nothing is stored
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def write(self, collection_name: str, reviews: pd.DataFrame,
+              append: bool = False, incremental: bool = False) -> int:
+        """
+        Store reviews of a product.
+
+        Args:
+            collection_name: Collection of the product
+            reviews: Normalized reviews with their REVIEW_KEY_COLUMN
+            append: Add to the stored reviews instead of replacing them
+            incremental: Only add the reviews that are not stored yet
+
+        Returns:
+            int: Number of reviews written
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def iter_reviews(self, collection_name: str, columns: list = None, limit: int = None,
+                     batch_size: int = REVIEW_READ_BATCH_SIZE, min_rating=None, max_rating=None,
+                     date_from=None, date_to=None, skip_duplicates: bool = False):
+        """
+        Stream stored reviews, see MongoIO.iter_reviews for the filters.
+
+        Yields:
+            pd.DataFrame: Batches of matching reviews, with only the requested
+                columns that are stored
+        """
+        raise NotImplementedError
+
+    def known_keys(self, collection_name: str) -> set:
+        """Fingerprints of the reviews stored in a collection."""
+        keys = set()
+        for batch in self.iter_reviews(collection_name, columns=[REVIEW_KEY_COLUMN]):
+            keys.update(batch[REVIEW_KEY_COLUMN].dropna())
+        return keys
+
+    def rating_counts(self, collection_name: str) -> tuple:
+        """
+        Count the stored reviews of a collection, for its catalog entry.
+
+        Returns:
+            tuple: Number of reviews and Rating -> number of reviews, with
+                None for unrated reviews
+        """
+        counts = {}
+        for batch in self.iter_reviews(collection_name, columns=[REVIEW_KEY_COLUMN, "Rating"]):
+            ratings = batch["Rating"] if "Rating" in batch else pd.Series(None, index=batch.index)
+            for rating, count in ratings.value_counts(dropna=False).items():
+                rating = None if pd.isna(rating) else float(rating)
+                counts[rating] = counts.get(rating, 0) + int(count)
+        return sum(counts.values()), counts
+
+    def summaries(self, collection_name: str, min_rating=None, max_rating=None,
+                  top_k: int = TOP_REVIEWS, skip_duplicates: bool = False) -> list:
+        """
+        Per-product dashboard statistics, see MongoIO.get_review_summaries.
+
+        Returns:
+            list: One ProductSummary per product
+        """
+        batches = list(self.iter_reviews(collection_name, columns=SUMMARY_COLUMNS,
+                                         min_rating=min_rating, max_rating=max_rating,
+                                         skip_duplicates=skip_duplicates))
+        if not batches:
+            return []
+        return summaries_from_frame(pd.concat(batches, ignore_index=True), top_k=top_k)
+
+    def migrate_csv(self):
+        """
+        Move CSV backups of earlier versions into the store. Each migrated
+        CSV is kept next to the store with a .migrated suffix.
+
+        Runs once per store: a marker file is left once every CSV was
+        migrated, later calls only check for it.
+        """
+        marker = os.path.join(self.root, CSV_MIGRATION_MARKER)
+        if os.path.exists(marker) or not os.path.isdir(self.root):
+            return
+        failed = False
+        for csv_file in sorted(glob.glob(os.path.join(self.root, "*.csv"))):
+            collection_name = os.path.splitext(os.path.basename(csv_file))[0]
+            try:
+                reviews = normalize_reviews(add_review_keys(pd.read_csv(csv_file)))
+                # Incremental, so an interrupted migration can simply run again
+                self.write(collection_name, reviews, incremental=True)
+                os.replace(csv_file, csv_file + ".migrated")
+                print(f"Migrated {len(reviews)} reviews from {csv_file} to the local store")
+            except Exception as e:
+                failed = True
+                print(f"Error migrating {csv_file} to the local store: {e}")
+        if not failed:
+            # Left for the next start to try again otherwise
+            with open(marker, "w"):
+                pass
+
+    def close(self):
+        pass
@@ -0,0 +1,146 @@
+import json
+import math
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from src.constants import CATALOG_SEARCH_LIMIT
+
+# Fields of a catalog entry, keyed by the product's collection name
+CATALOG_FIELDS = ["slug", "product_name", "search_key", "review_count",
+                  "last_scraped", "avg_rating", "rating_counts"]
+
+
+def search_key(product_name: str) -> str:
+    """Lower case product name with single spaces, the key prefix searches run on."""
+    return " ".join(product_name.lower().split())
+
+
+def _rating_text(rating: float) -> str:
+    """Ratings key the histogram as text, whole ratings without decimals."""
+    rating = float(rating)
+    return str(int(rating)) if rating.is_integer() else str(rating)
+
+
+def utc_now() -> datetime:
+    """Current time in UTC without a timezone, the way MongoDB returns dates."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def catalog_entry(product_name: str, collection_name: str, review_count: int,
+                  rating_counts: dict, last_scraped: datetime = None) -> dict:
+    """
+    Build the catalog entry of a product from its stored reviews.
+
+    Args:
+        product_name: Product search the reviews were scraped for
+        collection_name: Collection holding the reviews
+        review_count: Number of stored reviews
+        rating_counts: Rating -> number of reviews, None for unrated reviews
+        last_scraped: Time the reviews were stored, defaults to now
+
+    Returns:
+        dict: The entry, with the rating histogram keyed by the rating as text
+    """
+    rated = {float(rating): count for rating, count in rating_counts.items()
+             if rating is not None and not math.isnan(rating)}
+    total = sum(rated.values())
+    avg_rating = sum(rating * count for rating, count in rated.items()) / total if total else None
+    return {
+        "slug": collection_name,
+        "product_name": product_name,
+        "search_key": search_key(product_name),
+        "review_count": int(review_count),
+        "last_scraped": last_scraped or utc_now(),
+        "avg_rating": avg_rating,
+        "rating_counts": {_rating_text(rating): int(rated[rating])
+                          for rating in sorted(rated, reverse=True)},
+    }
+
+
+class LocalCatalog:
+    """
+    Catalog of the products in the local store, in a small SQLite table.
+
+    It holds one entry per product search, updated whenever its reviews are
+    written, so product pickers and freshness checks are indexed lookups
+    instead of listing the store.
+    """
+
+    def __init__(self, root: str, path: str = None):
+        """
+        Args:
+            root: Directory of the local store
+            path: Catalog file, defaults to catalog.sqlite in ``root``
+        """
+        os.makedirs(root, exist_ok=True)
+        self.path = path or os.path.join(root, "catalog.sqlite")
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS catalog ("
+                " slug TEXT PRIMARY KEY,"
+                " product_name TEXT NOT NULL,"
+                " search_key TEXT NOT NULL,"
+                " review_count INTEGER NOT NULL,"
+                " last_scraped TEXT NOT NULL,"
+                " avg_rating REAL,"
+                " rating_counts TEXT NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS catalog_search ON catalog (search_key)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS catalog_scraped ON catalog (last_scraped)")
+
+    @staticmethod
+    def _entry(row: tuple) -> dict:
+        entry = dict(zip(CATALOG_FIELDS, row))
+        entry["last_scraped"] = datetime.fromisoformat(entry["last_scraped"])
+        entry["rating_counts"] = json.loads(entry["rating_counts"])
+        return entry
+
+    def _select(self, where: str = "", params: tuple = (), order: str = "search_key",
+                limit: int = None) -> list:
+        sql = f"SELECT {', '.join(CATALOG_FIELDS)} FROM catalog {where} ORDER BY {order}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._entry(row) for row in rows]
+
+    def update(self, entry: dict):
+        """Add or replace the entry of a product, see catalog_entry."""
+        row = dict(entry, last_scraped=entry["last_scraped"].isoformat(),
+                   rating_counts=json.dumps(entry["rating_counts"]))
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO catalog ({', '.join(CATALOG_FIELDS)})"
+                f" VALUES ({', '.join('?' * len(CATALOG_FIELDS))})",
+                [row[field] for field in CATALOG_FIELDS])
+
+    def get(self, collection_name: str):
+        """The entry of a product, None if it is not in the catalog."""
+        entries = self._select("WHERE slug = ?", (collection_name,))
+        return entries[0] if entries else None
+
+    def search(self, prefix: str, limit: int = CATALOG_SEARCH_LIMIT) -> list:
+        """Entries whose product name starts with ``prefix``, ignoring case."""
+        prefix = search_key(prefix)
+        # A range on the indexed key, everything sorting between the prefix
+        # and the prefix followed by the highest character
+        return self._select("WHERE search_key >= ? AND search_key < ?",
+                            (prefix, prefix + "\U0010ffff"), limit=limit)
+
+    def entries(self, limit: int = None) -> list:
+        """Every entry, most recently scraped first."""
+        return self._select(order="last_scraped DESC", limit=limit)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM catalog").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,141 @@
+import io
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from src.constants import LOCAL_STORE_DIR, SYNC_LEASE_SECONDS
+
+
+class JournalEntry:
+    """Reviews waiting to be written to one MongoDB collection."""
+
+    def __init__(self, entry_id: int, collection_name: str, reviews: pd.DataFrame, attempts: int,
+                 product_name: str = None, created_at: float = None):
+        self.entry_id = entry_id
+        self.collection_name = collection_name
+        self.reviews = reviews
+        self.attempts = attempts
+        # Product search the reviews were scraped for, None in older journals
+        self.product_name = product_name
+        self.created_at = created_at
+
+    def __repr__(self):
+        return (f"JournalEntry({self.entry_id}, {self.collection_name!r}, "
+                f"reviews={len(self.reviews)}, attempts={self.attempts})")
+
+
+class WriteJournal:
+    """
+    Durable queue of review writes that have not reached MongoDB yet.
+
+    Entries live in a SQLite file next to the local store, so they survive
+    restarts. A sync worker claims entries for a lease, writes them and
+    acknowledges them; entries of a worker that dies are claimed again once
+    their lease runs out, so several processes can share one journal.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        Args:
+            path: Journal file, defaults to journal.sqlite in LOCAL_STORE_DIR
+        """
+        if path is None:
+            directory = os.path.join(os.getcwd(), LOCAL_STORE_DIR)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, "journal.sqlite")
+        self.path = path
+
+        self._lock = threading.Lock()
+        # Autocommit, transactions are opened explicitly
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pending ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " collection TEXT NOT NULL,"
+                " body BLOB NOT NULL,"
+                " records INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " lease_until REAL NOT NULL DEFAULT 0)"
+            )
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(pending)")]
+            if "product" not in columns:
+                # Journals written before the product catalog
+                self._conn.execute("ALTER TABLE pending ADD COLUMN product TEXT")
+
+    def append(self, collection_name: str, reviews: pd.DataFrame, product_name: str = None) -> int:
+        """
+        Args:
+            collection_name: Collection the reviews are written to
+            reviews: Normalized reviews with their REVIEW_KEY_COLUMN
+            product_name: Product search the reviews were scraped for
+
+        Returns:
+            int: Id of the new entry
+        """
+        buffer = io.BytesIO()
+        reviews.to_parquet(buffer, index=False)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO pending (collection, product, body, records, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (collection_name, product_name, buffer.getvalue(), len(reviews), time.time())
+            )
+        return cursor.lastrowid
+
+    def claim(self, limit: int, lease_seconds: float = SYNC_LEASE_SECONDS) -> list:
+        """
+        Reserve the oldest unclaimed entries for ``lease_seconds``.
+
+        Returns:
+            list: JournalEntry objects, oldest first
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, collection, body, attempts, product, created_at FROM pending"
+                    " WHERE lease_until <= ? ORDER BY id LIMIT ?", (now, limit)
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE pending SET lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+                    [(now + lease_seconds, row[0]) for row in rows]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [JournalEntry(entry_id, collection_name, pd.read_parquet(io.BytesIO(body)), attempts + 1,
+                             product_name=product_name, created_at=created_at)
+                for entry_id, collection_name, body, attempts, product_name, created_at in rows]
+
+    def ack(self, entry_ids: list):
+        """Remove entries that were written."""
+        with self._lock:
+            self._conn.executemany("DELETE FROM pending WHERE id = ?", [(entry_id,) for entry_id in entry_ids])
+
+    def release(self, entry_ids: list):
+        """Give claimed entries back, to be retried by the next sync."""
+        with self._lock:
+            self._conn.executemany("UPDATE pending SET lease_until = 0 WHERE id = ?",
+                                   [(entry_id,) for entry_id in entry_ids])
+
+    def pending(self) -> tuple:
+        """
+        Returns:
+            tuple: Number of pending entries and of the reviews they hold
+        """
+        with self._lock:
+            entries, records = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(records), 0) FROM pending").fetchone()
+        return entries, records
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
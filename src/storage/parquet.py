@@ -0,0 +1,222 @@
+import glob
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.constants import (LOCAL_STORE_COMPRESSION, LOCAL_STORE_MAX_PARTITIONS,
+                           REVIEW_KEY_COLUMN, REVIEW_READ_BATCH_SIZE, SENTIMENT_COLUMN,
+                           DUPLICATE_COLUMN)
+from src.storage.base import ReviewStore
+
+try:
+    import fcntl
+except ImportError:
+    # Windows has no flock, writes are then only serialized within a process
+    fcntl = None
+
+# Arrow type of each known review column, other columns keep their inferred type
+REVIEW_ARROW_TYPES = {
+    "Product Name": pa.string(),
+    "Over_All_Rating": pa.float32(),
+    "Price": pa.float32(),
+    "Date": pa.timestamp("us"),
+    "Rating": pa.float32(),
+    "Name": pa.string(),
+    "Comment": pa.string(),
+    REVIEW_KEY_COLUMN: pa.string(),
+    SENTIMENT_COLUMN: pa.float32(),
+    DUPLICATE_COLUMN: pa.string(),
+}
+
+# Writes to a collection replace or add partitions, one writer at a time per
+# collection directory within a process, see _write_lock
+_write_locks = {}
+_write_locks_lock = threading.Lock()
+# Lock file in each collection directory, shared by every process using the store
+LOCK_FILE = ".lock"
+
+
+class ParquetReviewStore(ReviewStore):
+    """
+    Columnar on-disk review store, one directory of Parquet partitions per
+    product collection.
+
+    Storing reviews adds a compressed partition instead of rewriting the
+    product's data, and reads only decode the requested columns while the
+    rating and date filters are pushed down to the Parquet row groups.
+
+    The app, its job workers and their threads may share a store: writers
+    lock the collection exclusively and readers shared, with a file lock, so
+    no process removes partitions another one is writing or opening. Readers
+    only hold it while opening the partitions they then scan.
+    """
+
+    def _collection_dir(self, collection_name: str) -> str:
+        return os.path.join(self.root, collection_name)
+
+    def _partitions(self, collection_name: str) -> list:
+        return sorted(glob.glob(os.path.join(self._collection_dir(collection_name), "*.parquet")))
+
+    @contextmanager
+    def _collection_lock(self, collection_name: str, shared: bool = False):
+        """Hold the file lock of a collection, shared for readers and exclusive for writers."""
+        directory = self._collection_dir(collection_name)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, LOCK_FILE), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _write_lock(self, collection_name: str) -> threading.Lock:
+        """Lock serializing the threads writing to a collection."""
+        directory = os.path.abspath(self._collection_dir(collection_name))
+        with _write_locks_lock:
+            return _write_locks.setdefault(directory, threading.Lock())
+
+    def exists(self, collection_name: str) -> bool:
+        return bool(self._partitions(collection_name))
+
+    def list_collections(self) -> list:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if self.exists(name))
+
+    def fingerprint(self, collection_name: str):
+        """Partition count, total size and newest modification time."""
+        if not self._partitions(collection_name):
+            return None
+        with self._collection_lock(collection_name, shared=True):
+            stats = [os.stat(path) for path in self._partitions(collection_name)]
+        if not stats:
+            return None
+        return (len(stats), sum(stat.st_size for stat in stats),
+                max(stat.st_mtime_ns for stat in stats))
+
+    @staticmethod
+    def _to_table(reviews: pd.DataFrame) -> pa.Table:
+        """Arrow table with the review columns in REVIEW_ARROW_TYPES."""
+        table = pa.Table.from_pandas(reviews, preserve_index=False)
+        schema = pa.schema([
+            pa.field(field.name, REVIEW_ARROW_TYPES.get(field.name, field.type))
+            for field in table.schema
+        ])
+        return table.cast(schema, safe=False)
+
+    def _write_partition(self, collection_name: str, reviews: pd.DataFrame) -> str:
+        directory = self._collection_dir(collection_name)
+        os.makedirs(directory, exist_ok=True)
+        # Time ordered names, partitions are read back in the order they were written
+        name = f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet"
+        path = os.path.join(directory, name)
+        pq.write_table(self._to_table(reviews), path + ".tmp", compression=LOCAL_STORE_COMPRESSION)
+        # Readers never see a partially written partition
+        os.replace(path + ".tmp", path)
+        return path
+
+    def write(self, collection_name: str, reviews: pd.DataFrame,
+              append: bool = False, incremental: bool = False) -> int:
+        with self._write_lock(collection_name), self._collection_lock(collection_name):
+            existing = self._partitions(collection_name)
+            if incremental and existing:
+                stored_keys = set(self._dataset(existing).to_table(
+                    columns=[REVIEW_KEY_COLUMN]).column(REVIEW_KEY_COLUMN).to_pylist())
+                reviews = reviews[~reviews[REVIEW_KEY_COLUMN].isin(stored_keys)]
+            if reviews.empty:
+                return 0
+
+            self._write_partition(collection_name, reviews)
+            if not (append or incremental):
+                # The new partition is in place before the old ones go
+                for path in existing:
+                    os.remove(path)
+            elif len(existing) + 1 > LOCAL_STORE_MAX_PARTITIONS:
+                self._compact(collection_name)
+            return len(reviews)
+
+    def _compact(self, collection_name: str):
+        """Merge the partitions of a collection into one."""
+        partitions = self._partitions(collection_name)
+        merged = self._dataset(partitions).to_table().to_pandas()
+        self._write_partition(collection_name, merged)
+        for path in partitions:
+            os.remove(path)
+
+    @staticmethod
+    def _dataset(partitions: list) -> ds.Dataset:
+        # Partitions may differ in their extra columns, read them all
+        schema = pa.unify_schemas([pq.read_schema(path) for path in partitions])
+        return ds.dataset(partitions, schema=schema, format="parquet")
+
+    def iter_reviews(self, collection_name: str, columns: list = None, limit: int = None,
+                     batch_size: int = REVIEW_READ_BATCH_SIZE, min_rating=None, max_rating=None,
+                     date_from=None, date_to=None, skip_duplicates: bool = False):
+        if not self._partitions(collection_name):
+            return
+        # The partitions are opened under the lock and read after releasing it.
+        # Open files outlive their removal, so writers neither wait for a slow
+        # or abandoned reader nor pull partitions from under it
+        with self._collection_lock(collection_name, shared=True):
+            files = [pa.memory_map(path) for path in self._partitions(collection_name)]
+        if not files:
+            return
+        try:
+            yield from self._scan(self._open_dataset(files), columns, limit, batch_size,
+                                  min_rating, max_rating, date_from, date_to, skip_duplicates)
+        finally:
+            for file in files:
+                file.close()
+
+    @staticmethod
+    def _open_dataset(files: list) -> ds.Dataset:
+        """Dataset of opened partitions, see _dataset."""
+        parquet_format = ds.ParquetFileFormat()
+        fragments = [parquet_format.make_fragment(file) for file in files]
+        schema = pa.unify_schemas([fragment.physical_schema for fragment in fragments])
+        return ds.FileSystemDataset(fragments, schema, parquet_format)
+
+    @staticmethod
+    def _scan(dataset: ds.Dataset, columns: list, limit: int, batch_size: int, min_rating,
+              max_rating, date_from, date_to, skip_duplicates: bool):
+        """Batches of the matching reviews of ``dataset``, see iter_reviews."""
+        names = set(dataset.schema.names)
+
+        predicate = None
+        bounds = [("Rating", ">=", min_rating), ("Rating", "<=", max_rating),
+                  ("Date", ">=", date_from), ("Date", "<=", date_to)]
+        for field, op, value in bounds:
+            if value is None or field not in names:
+                continue
+            if field == "Date":
+                value = pa.scalar(pd.Timestamp(value).to_pydatetime(), type=dataset.schema.field("Date").type)
+            expression = ds.field(field) >= value if op == ">=" else ds.field(field) <= value
+            predicate = expression if predicate is None else predicate & expression
+        if skip_duplicates and DUPLICATE_COLUMN in names:
+            expression = ds.field(DUPLICATE_COLUMN).is_null()
+            predicate = expression if predicate is None else predicate & expression
+
+        if columns is not None:
+            columns = [column for column in columns if column in names]
+        scanner = dataset.scanner(columns=columns, filter=predicate, batch_size=batch_size)
+
+        remaining = limit
+        for record_batch in scanner.to_batches():
+            if record_batch.num_rows == 0:
+                continue
+            batch = record_batch.to_pandas()
+            if remaining is not None:
+                batch = batch.head(remaining)
+                remaining -= len(batch)
+            yield batch
+            if remaining == 0:
+                return
@@ -0,0 +1,242 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+from src.constants import REVIEW_KEY_COLUMN, REVIEW_READ_BATCH_SIZE, SENTIMENT_COLUMN, DUPLICATE_COLUMN
+from src.data_report.summary import (NEGATIVE_RATING, POSITIVE_RATING, TOP_REVIEWS,
+                                     summaries_from_aggregation)
+from src.review_schema import to_records
+from src.storage.base import ReviewStore
+
+# Dates are stored as text in this format, which sorts chronologically
+SQL_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# SQL type of each known review column, other columns are added as they appear
+REVIEW_SQL_TYPES = {
+    REVIEW_KEY_COLUMN: "TEXT",
+    "Product Name": "TEXT",
+    "Over_All_Rating": "REAL",
+    "Price": "REAL",
+    "Date": "TEXT",
+    "Rating": "REAL",
+    "Name": "TEXT",
+    "Comment": "TEXT",
+    SENTIMENT_COLUMN: "REAL",
+    DUPLICATE_COLUMN: "TEXT",
+}
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SQLiteReviewStore(ReviewStore):
+    """
+    Review store in a single embedded SQLite database.
+
+    Reviews of every collection share one table, indexed by collection
+    together with product, rating and date, so filtered reads and the
+    dashboard aggregations run as indexed queries without any network round
+    trip. Reviews are upserted on their fingerprint like in MongoDB.
+    """
+
+    def __init__(self, root: str = None, path: str = None):
+        """
+        Args:
+            root: Directory of the store, see ReviewStore
+            path: Database file, defaults to reviews.sqlite in ``root``
+        """
+        super().__init__(root)
+        os.makedirs(self.root, exist_ok=True)
+        self.path = path or os.path.join(self.root, "reviews.sqlite")
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        # Readers on their own connections are not blocked by writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = ", ".join(f"{_quote(name)} {sql_type}" for name, sql_type in REVIEW_SQL_TYPES.items())
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS reviews (collection TEXT NOT NULL, {columns},"
+                f" PRIMARY KEY (collection, {_quote(REVIEW_KEY_COLUMN)}))"
+            )
+            for name, column in (("product", "Product Name"), ("rating", "Rating"), ("date", "Date")):
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS reviews_{name}"
+                                   f" ON reviews (collection, {_quote(column)})")
+            # One row per collection, bumped on every write
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS collections ("
+                " collection TEXT PRIMARY KEY,"
+                " reviews INTEGER NOT NULL,"
+                " updated_at INTEGER NOT NULL)"
+            )
+        self._columns = self._table_columns()
+
+    def _table_columns(self) -> list:
+        return [row[1] for row in self._conn.execute("PRAGMA table_info(reviews)")]
+
+    @contextmanager
+    def _reader(self):
+        """A connection of its own, so a slow read never holds the write lock."""
+        conn = sqlite3.connect(self.path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def exists(self, collection_name: str) -> bool:
+        return self.fingerprint(collection_name) is not None
+
+    def list_collections(self) -> list:
+        with self._reader() as conn:
+            return [row[0] for row in conn.execute(
+                "SELECT collection FROM collections WHERE reviews > 0 ORDER BY collection")]
+
+    def fingerprint(self, collection_name: str):
+        """Review count and time of the last write."""
+        with self._reader() as conn:
+            row = conn.execute("SELECT reviews, updated_at FROM collections WHERE collection = ?",
+                               (collection_name,)).fetchone()
+        if row is None or row[0] == 0:
+            return None
+        return row
+
+    def _add_columns(self, reviews: pd.DataFrame):
+        for column in reviews.columns:
+            if column in self._columns:
+                continue
+            if pd.api.types.is_bool_dtype(reviews[column]):
+                sql_type = "INTEGER"
+            elif pd.api.types.is_numeric_dtype(reviews[column]):
+                sql_type = "REAL"
+            else:
+                sql_type = "TEXT"
+            self._conn.execute(f"ALTER TABLE reviews ADD COLUMN {_quote(column)} {sql_type}")
+            self._columns.append(column)
+
+    def write(self, collection_name: str, reviews: pd.DataFrame,
+              append: bool = False, incremental: bool = False) -> int:
+        if "Date" in reviews and pd.api.types.is_datetime64_any_dtype(reviews["Date"]):
+            reviews = reviews.assign(Date=reviews["Date"].dt.strftime(SQL_DATE_FORMAT))
+        columns = list(reviews.columns)
+        names = ", ".join(["collection"] + [_quote(column) for column in columns])
+        placeholders = ", ".join(["?"] * (len(columns) + 1))
+        conflict = "NOTHING" if incremental else "UPDATE SET " + ", ".join(
+            f"{_quote(column)} = excluded.{_quote(column)}"
+            for column in columns if column != REVIEW_KEY_COLUMN)
+        rows = [(collection_name, *record.values()) for record in to_records(reviews)]
+
+        with self._lock, self._conn:
+            self._add_columns(reviews)
+            if not (append or incremental):
+                self._conn.execute("DELETE FROM reviews WHERE collection = ?", (collection_name,))
+            written = self._conn.executemany(
+                f"INSERT INTO reviews ({names}) VALUES ({placeholders})"
+                f" ON CONFLICT (collection, {_quote(REVIEW_KEY_COLUMN)}) DO {conflict}",
+                rows,
+            ).rowcount
+            count = self._conn.execute("SELECT COUNT(*) FROM reviews WHERE collection = ?",
+                                       (collection_name,)).fetchone()[0]
+            self._conn.execute("INSERT OR REPLACE INTO collections (collection, reviews, updated_at)"
+                               " VALUES (?, ?, ?)", (collection_name, count, time.time_ns()))
+        return written
+
+    def _where(self, collection_name: str, min_rating=None, max_rating=None,
+               date_from=None, date_to=None, skip_duplicates: bool = False) -> tuple:
+        conditions = ["collection = ?"]
+        params = [collection_name]
+        for column, op, value in (("Rating", ">=", min_rating), ("Rating", "<=", max_rating),
+                                  ("Date", ">=", date_from), ("Date", "<=", date_to)):
+            if value is None:
+                continue
+            if column == "Date":
+                value = pd.Timestamp(value).strftime(SQL_DATE_FORMAT)
+            conditions.append(f"{_quote(column)} {op} ?")
+            params.append(value)
+        if skip_duplicates:
+            conditions.append(f"{_quote(DUPLICATE_COLUMN)} IS NULL")
+        return " AND ".join(conditions), params
+
+    def iter_reviews(self, collection_name: str, columns: list = None, limit: int = None,
+                     batch_size: int = REVIEW_READ_BATCH_SIZE, min_rating=None, max_rating=None,
+                     date_from=None, date_to=None, skip_duplicates: bool = False):
+        stored = [column for column in self._table_columns() if column != "collection"]
+        if columns is not None:
+            stored = [column for column in columns if column in stored]
+        if not stored:
+            return
+
+        where, params = self._where(collection_name, min_rating, max_rating, date_from, date_to,
+                                    skip_duplicates)
+        sql = (f"SELECT {', '.join(_quote(column) for column in stored)} FROM reviews"
+               f" WHERE {where} ORDER BY rowid")
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._reader() as conn:
+            for batch in pd.read_sql_query(sql, conn, params=params, chunksize=batch_size):
+                if not batch.empty:
+                    yield batch
+
+    def known_keys(self, collection_name: str) -> set:
+        with self._reader() as conn:
+            return {row[0] for row in conn.execute(
+                f"SELECT {_quote(REVIEW_KEY_COLUMN)} FROM reviews WHERE collection = ?",
+                (collection_name,))}
+
+    def rating_counts(self, collection_name: str) -> tuple:
+        with self._reader() as conn:
+            counts = dict(conn.execute(
+                f"SELECT {_quote('Rating')}, COUNT(*) FROM reviews WHERE collection = ?"
+                f" GROUP BY {_quote('Rating')}", (collection_name,)).fetchall())
+        return sum(counts.values()), counts
+
+    def summaries(self, collection_name: str, min_rating=None, max_rating=None,
+                  top_k: int = TOP_REVIEWS, skip_duplicates: bool = False) -> list:
+        """Computed with SQL aggregations, in the format of summary_pipeline."""
+        where, params = self._where(collection_name, min_rating, max_rating,
+                                    skip_duplicates=skip_duplicates)
+        product, rating = _quote("Product Name"), _quote("Rating")
+
+        def top_reviews(conn, condition: str, order: str) -> dict:
+            reviews = {}
+            rows = conn.execute(
+                f"SELECT product, rating, comment FROM ("
+                f" SELECT {product} AS product, {rating} AS rating, {_quote('Comment')} AS comment,"
+                f"  ROW_NUMBER() OVER (PARTITION BY {product} ORDER BY {rating} {order}, rowid) AS rank"
+                f" FROM reviews WHERE {where} AND {rating} {condition})"
+                f" WHERE rank <= ? ORDER BY product, rank", params + [top_k])
+            for name, value, comment in rows:
+                reviews.setdefault(name, []).append({"Rating": value, "Comment": comment})
+            return reviews
+
+        with self._reader() as conn:
+            stats = conn.execute(
+                f"SELECT {product}, COUNT(*), AVG({_quote('Price')}), AVG({_quote('Over_All_Rating')})"
+                f" FROM reviews WHERE {where} GROUP BY {product} ORDER BY MIN(rowid)", params).fetchall()
+            histogram = conn.execute(
+                f"SELECT {product}, {rating}, COUNT(*) FROM reviews"
+                f" WHERE {where} AND {rating} IS NOT NULL GROUP BY {product}, {rating}", params).fetchall()
+            positive = top_reviews(conn, f">= {POSITIVE_RATING}", "DESC")
+            negative = top_reviews(conn, f"<= {NEGATIVE_RATING}", "ASC")
+
+        return summaries_from_aggregation({
+            "products": [
+                {"_id": name, "count": count, "avg_price": avg_price, "avg_rating": avg_rating,
+                 "positive": positive.get(name, []), "negative": negative.get(name, [])}
+                for name, count, avg_price, avg_rating in stats
+            ],
+            "ratings": [
+                {"_id": {"product": name, "rating": value}, "count": count}
+                for name, value, count in histogram
+            ],
+        })
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
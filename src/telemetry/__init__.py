@@ -0,0 +1,2 @@
+from src.telemetry.metrics import MetricsRegistry, get_metrics, inc, span, timed
+from src.telemetry.server import MetricsServer, start_metrics_server
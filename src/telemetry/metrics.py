@@ -0,0 +1,263 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from src.constants import (LOCAL_STORE_DIR, METRICS_LOG_MAX_BYTES, METRICS_PREFIX,
+                           METRICS_SPAN_BUCKETS)
+
+try:
+    import fcntl
+except ImportError:
+    # Windows has no flock, the log is then only locked within a process
+    fcntl = None
+
+# Histogram of every span, labelled with the stage it timed
+SPAN_METRIC = "stage_seconds"
+SPAN_ERRORS_METRIC = "stage_errors_total"
+
+
+def default_log_path():
+    """
+    metrics.jsonl in LOCAL_STORE_DIR, or the METRICS_LOG environment
+    variable. None when METRICS_LOG is set to an empty value.
+    """
+    path = os.getenv("METRICS_LOG")
+    if path is None:
+        return os.path.join(os.getcwd(), LOCAL_STORE_DIR, "metrics.jsonl")
+    return path or None
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class Histogram:
+    """Count, sum and cumulative bucket counts of observed durations."""
+
+    def __init__(self, buckets: tuple = METRICS_SPAN_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[index] += 1
+
+
+class MetricsRegistry:
+    """
+    Counters and span timings of the scrapes run in this process.
+
+    Spans time a stage of a scrape (page loads, scrolling, parsing, storage)
+    and are recorded in a histogram labelled with the stage. Every finished
+    span is also appended to a JSON lines log shared by all processes, so
+    the stages of background jobs can be followed and analysed too. The
+    current values can be exported in the Prometheus text format, see
+    start_metrics_server.
+    """
+
+    def __init__(self, log_path: str = None, prefix: str = METRICS_PREFIX):
+        """
+        Args:
+            log_path: JSON lines file finished spans are appended to, None
+                to keep no log
+            prefix: Prepended to the metric names in the Prometheus export
+        """
+        self.log_path = log_path
+        self.prefix = prefix
+        # (name, label key) -> value or Histogram
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """Add ``value`` to a counter, e.g. inc("pages_total", page_type="reviews")."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Record a duration in a histogram."""
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def span(self, stage: str, **labels):
+        """
+        Time the block as ``stage``.
+
+        Yields a dict whose items are added to the logged span, e.g. the
+        number of reviews the block produced. A block that raises is counted
+        in SPAN_ERRORS_METRIC and logged with its error.
+
+            with metrics.span("parse_reviews", backend="lxml") as fields:
+                fields["reviews"] = len(parse(page))
+        """
+        fields = {}
+        started_at = time.time()
+        started = time.perf_counter()
+        error = None
+        try:
+            yield fields
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            seconds = time.perf_counter() - started
+            self.observe(SPAN_METRIC, seconds, stage=stage, **labels)
+            if error is not None:
+                self.inc(SPAN_ERRORS_METRIC, stage=stage, **labels)
+            self._log({"time": started_at, "pid": os.getpid(), "span": stage,
+                       "seconds": round(seconds, 6), "status": "ok" if error is None else "error",
+                       **({"error": type(error).__name__} if error is not None else {}),
+                       **labels, **fields})
+
+    def _log(self, record: dict):
+        """
+        Append a record to the log. The app and the job workers share it: a
+        lock file next to the log serializes the size check, rotation and
+        write of every process, so no process appends to a file another one
+        just rotated away.
+        """
+        if not self.log_path:
+            return
+        line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+        with self._log_lock:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+                with open(self.log_path + ".lock", "a") as lock_file:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_EX)
+                    if os.path.exists(self.log_path) and os.path.getsize(self.log_path) > METRICS_LOG_MAX_BYTES:
+                        os.replace(self.log_path, self.log_path + ".1")
+                    # One write with O_APPEND, lines of concurrent writers never interleave
+                    fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                    try:
+                        os.write(fd, line)
+                    finally:
+                        os.close(fd)
+            except OSError as e:
+                # Instrumentation must never fail a scrape, stop logging instead
+                print(f"Could not write the metrics log {self.log_path}: {e}")
+                self.log_path = None
+
+    def snapshot(self) -> dict:
+        """
+        Totals over all labels: counter values by name, and the number of
+        spans and seconds spent by stage.
+        """
+        counters, stages = {}, {}
+        with self._lock:
+            for (name, _), value in self._counters.items():
+                counters[name] = counters.get(name, 0) + value
+            for (name, labels), histogram in self._histograms.items():
+                if name != SPAN_METRIC:
+                    continue
+                stage = dict(labels)["stage"]
+                totals = stages.setdefault(stage, {"count": 0, "seconds": 0.0})
+                totals["count"] += histogram.count
+                totals["seconds"] += histogram.sum
+        return {"counters": counters, "stages": stages}
+
+    def since(self, earlier: dict) -> dict:
+        """What was counted and timed since the ``earlier`` snapshot."""
+        current = self.snapshot()
+        counters = {name: value - earlier["counters"].get(name, 0)
+                    for name, value in current["counters"].items()}
+        stages = {}
+        for stage, totals in current["stages"].items():
+            before = earlier["stages"].get(stage, {"count": 0, "seconds": 0.0})
+            if totals["count"] > before["count"]:
+                stages[stage] = {"count": totals["count"] - before["count"],
+                                 "seconds": totals["seconds"] - before["seconds"]}
+        return {"counters": {name: value for name, value in counters.items() if value},
+                "stages": stages}
+
+    def to_prometheus(self) -> str:
+        """The metrics in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(((key, histogram.buckets, histogram.bucket_counts[:], histogram.count,
+                                  histogram.sum)
+                                 for key, histogram in self._histograms.items()),
+                                key=lambda item: item[0])
+
+        lines = []
+        declared = set()
+        for (name, labels), value in counters:
+            metric = f"{self.prefix}_{name}"
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric}{_format_labels(labels)} {value}")
+        for (name, labels), buckets, bucket_counts, count, total in histograms:
+            metric = f"{self.prefix}_{name}"
+            if metric not in declared:
+                declared.add(metric)
+                lines.append(f"# TYPE {metric} histogram")
+            for bound, bucket_count in zip(buckets, bucket_counts):
+                lines.append(f"{metric}_bucket{_format_labels(labels + (('le', str(bound)),))} {bucket_count}")
+            lines.append(f"{metric}_bucket{_format_labels(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{metric}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{metric}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for _, value in labels)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + "}"
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """Return the metrics registry of the process."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = MetricsRegistry(log_path=default_log_path())
+    return _registry
+
+
+def inc(name: str, value: float = 1, **labels):
+    """Add to a counter of the process registry, see MetricsRegistry.inc."""
+    get_metrics().inc(name, value, **labels)
+
+
+def span(stage: str, **labels):
+    """Time a block in the process registry, see MetricsRegistry.span."""
+    return get_metrics().span(stage, **labels)
+
+
+def timed(stage: str):
+    """Decorator timing every call of a function as a span of ``stage``."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,80 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.telemetry.metrics import MetricsRegistry, get_metrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsServer:
+    """Serve a registry at /metrics in the Prometheus text format, on a background thread."""
+
+    def __init__(self, port: int, host: str = "0.0.0.0", registry: MetricsRegistry = None):
+        """
+        Args:
+            port: Port to listen on, 0 picks a free one
+            host: Interface to listen on
+            registry: Registry to serve, defaults to the process registry
+        """
+        self.registry = registry or get_metrics()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = server.registry.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server",
+                                        daemon=True)
+        self._thread.start()
+        print(f"Serving metrics on port {self.port}")
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int = None, offset: int = 0):
+    """
+    Serve the process registry once per process.
+
+    Args:
+        port: Port to listen on, defaults to the METRICS_PORT environment variable
+        offset: Added to the port, so worker processes started with the same
+            environment each get their own
+
+    Returns:
+        MetricsServer: The running server, None when no port is configured or
+            it could not be bound
+    """
+    global _server
+    if port is None:
+        port = os.getenv("METRICS_PORT")
+        if not port:
+            return None
+    with _server_lock:
+        if _server is None:
+            try:
+                _server = MetricsServer(int(port) + offset)
+            except OSError as e:
+                # Metrics are optional, a taken port must not stop the app
+                print(f"Could not serve metrics on port {int(port) + offset}: {e}")
+    return _server
@@ -0,0 +1,2 @@
+from src.text_analytics.analysis import (SENTIMENT_LABELS, TextInsights, Tokens, add_sentiment,
+                                         analyze_reviews, sentiment_labels, sentiment_scores)
@@ -0,0 +1,263 @@
+import numpy as np
+import pandas as pd
+
+from src.constants import (KEYWORD_MIN_REVIEWS, KEYWORDS_PER_PRODUCT, NO_COMMENT,
+                           SENTIMENT_COLUMN, SENTIMENT_THRESHOLD)
+from src.text_analytics.lexicon import (ASPECTS, INTENSIFIERS, NEGATIONS, SENTIMENT_LEXICON,
+                                        STOPWORDS)
+
+TOKEN_PATTERN = r"[a-z]+"
+SENTIMENT_LABELS = ["negative", "neutral", "positive"]
+# Applied to a sentiment word following a negation or an intensifier
+NEGATION_FACTOR = -0.75
+INTENSIFIER_FACTOR = 1.5
+# Squashes the summed word weights into (-1, 1), larger values need more words
+# to reach the extremes
+NORMALIZATION_ALPHA = 15.0
+# Shorter words are never keywords
+KEYWORD_MIN_LENGTH = 3
+
+
+class Tokens:
+    """
+    The words of a column of comments, one entry per word in reading order.
+
+    Every distinct comment is tokenized once, reviews repeat each other a
+    lot ("Nice product"). Together ``rows`` and ``codes`` are the
+    coordinates of a sparse comment-by-word matrix over the distinct
+    comments, so statistics over all comments are computed with array
+    operations on the vocabulary instead of a loop per comment.
+    """
+
+    def __init__(self, comments: pd.Series):
+        """
+        Args:
+            comments: Review comments, missing ones and NO_COMMENT have no words
+        """
+        text = comments.reset_index(drop=True).astype("string")
+        text = text.mask(text == NO_COMMENT)
+        # Distinct comment of every review, -1 when it has none
+        self.comments, distinct = pd.factorize(text)
+        self.size = len(distinct)
+
+        words = (pd.Series(distinct, dtype="string").str.lower().str.replace("'", "", regex=False)
+                 .str.findall(TOKEN_PATTERN).explode().dropna())
+        # Distinct comment of each word
+        self.rows = words.index.to_numpy(dtype=np.int64)
+        codes, vocabulary = pd.factorize(words.to_numpy(dtype=object))
+        self.codes = codes
+        self.vocabulary = pd.Index(vocabulary)
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def has_text(self) -> np.ndarray:
+        """For every review, whether it has a comment."""
+        return self.comments >= 0
+
+    def vocabulary_flags(self, words) -> np.ndarray:
+        """For every word, whether it is in ``words``."""
+        return self.vocabulary.isin(list(words))[self.codes]
+
+    def preceded_by(self, flags: np.ndarray, distance: int = 1) -> np.ndarray:
+        """For every word, whether the word ``distance`` before it in its comment is flagged."""
+        result = np.zeros(len(self.rows), dtype=bool)
+        if len(self.rows) > distance:
+            result[distance:] = flags[:-distance] & (self.rows[distance:] == self.rows[:-distance])
+        return result
+
+    def review_counts(self, products: np.ndarray, scores: np.ndarray) -> pd.DataFrame:
+        """
+        Reviews of each product per distinct comment, with the sum of their
+        sentiment ``scores``.
+        """
+        reviews = pd.DataFrame({"product": products, "comment": self.comments, "score": scores})
+        return (reviews[self.has_text].groupby(["product", "comment"], sort=False)
+                .agg(reviews=("comment", "size"), score=("score", "sum")).reset_index())
+
+
+def _comment_scores(tokens: Tokens) -> np.ndarray:
+    """Sentiment of every distinct comment of ``tokens``."""
+    lexicon = pd.Series(SENTIMENT_LEXICON, dtype="float64")
+    weights = lexicon.reindex(tokens.vocabulary).fillna(0).to_numpy()[tokens.codes]
+
+    negation = tokens.vocabulary_flags(NEGATIONS)
+    intensified = tokens.preceded_by(tokens.vocabulary_flags(INTENSIFIERS), 1)
+    negated = tokens.preceded_by(negation, 1) | (intensified & tokens.preceded_by(negation, 2))
+    weights = weights * np.where(negated, NEGATION_FACTOR, 1.0) * np.where(intensified, INTENSIFIER_FACTOR, 1.0)
+
+    totals = np.bincount(tokens.rows, weights=weights, minlength=tokens.size)
+    return totals / np.sqrt(totals ** 2 + NORMALIZATION_ALPHA)
+
+
+def sentiment_scores(comments: pd.Series, tokens: Tokens = None) -> pd.Series:
+    """
+    Lexicon-based sentiment of every comment, from -1 (negative) to 1 (positive).
+
+    Words are weighted by SENTIMENT_LEXICON, flipped right after a negation
+    ("not good", "not very good") and strengthened after an intensifier
+    ("very good"). The summed weights of a comment are squashed into
+    (-1, 1) like VADER's compound score.
+
+    Args:
+        comments: Review comments
+        tokens: Tokens of ``comments``, when already computed
+
+    Returns:
+        pd.Series: float32 scores, NaN for missing comments
+    """
+    if tokens is None:
+        tokens = Tokens(comments)
+    # The extra slot is the score of reviews without a comment
+    scores = np.append(_comment_scores(tokens), np.nan)[tokens.comments]
+    return pd.Series(scores.astype("float32"), index=comments.index, name=SENTIMENT_COLUMN)
+
+
+def sentiment_labels(scores: pd.Series) -> pd.Series:
+    """"negative", "neutral" or "positive" for each score, see SENTIMENT_THRESHOLD."""
+    labels = np.select([scores < -SENTIMENT_THRESHOLD, scores > SENTIMENT_THRESHOLD],
+                       SENTIMENT_LABELS[::2], SENTIMENT_LABELS[1])
+    labels = pd.Series(pd.Categorical(labels, categories=SENTIMENT_LABELS), index=scores.index)
+    return labels.mask(scores.isna())
+
+
+def add_sentiment(reviews: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return a copy of ``reviews`` with the sentiment of their comments in
+    SENTIMENT_COLUMN. Scores already present are kept, so only reviews
+    stored before sentiment was computed are scored again.
+    """
+    if "Comment" not in reviews:
+        return reviews
+    reviews = reviews.copy()
+    if SENTIMENT_COLUMN in reviews:
+        missing = reviews[SENTIMENT_COLUMN].isna() & reviews["Comment"].notna()
+        if missing.any():
+            reviews.loc[missing, SENTIMENT_COLUMN] = sentiment_scores(reviews.loc[missing, "Comment"])
+        reviews[SENTIMENT_COLUMN] = reviews[SENTIMENT_COLUMN].astype("float32")
+    else:
+        reviews[SENTIMENT_COLUMN] = sentiment_scores(reviews["Comment"])
+    return reviews
+
+
+def _keywords(tokens: Tokens, counts: pd.DataFrame, product_names, top_k: int,
+              min_reviews: int) -> pd.DataFrame:
+    """Words and two-word phrases that characterize the reviews of each product."""
+    if not len(tokens):
+        return pd.DataFrame(columns=["Product Name", "Keyword", "Reviews", "Score"])
+    vocabulary = tokens.vocabulary
+    content = ~tokens.vocabulary_flags(STOPWORDS) & (vocabulary.str.len()[tokens.codes] >= KEYWORD_MIN_LENGTH)
+    words = np.asarray(vocabulary)[tokens.codes]
+
+    # Phrases of two neighbouring content words of the same comment
+    follows = tokens.preceded_by(content, 1) & content
+    second = np.flatnonzero(follows)
+    phrases = pd.Series(words[second - 1]) + " " + pd.Series(words[second])
+
+    terms = pd.DataFrame({
+        "comment": np.concatenate([tokens.rows[content], tokens.rows[second]]),
+        "term": np.concatenate([words[content], phrases.to_numpy(dtype=object)]),
+    }).drop_duplicates()
+    terms = terms.merge(counts[["product", "comment", "reviews"]], on="comment")
+
+    # TF-IDF over reviews: frequent in a product, rare across all reviews
+    reviews_with_text = max(int(counts["reviews"].sum()), 1)
+    document_frequency = terms.groupby("term", sort=False)["reviews"].sum()
+    scored = terms.groupby(["product", "term"], sort=False)["reviews"].sum().rename("Reviews").reset_index()
+    scored = scored[scored["Reviews"] >= min_reviews]
+    scored["Score"] = scored["Reviews"] * np.log(
+        (1 + reviews_with_text) / (1 + scored["term"].map(document_frequency)) + 1)
+
+    top = (scored.sort_values(["product", "Score"], ascending=[True, False])
+           .groupby("product", sort=False).head(top_k))
+    return pd.DataFrame({
+        "Product Name": np.asarray(product_names, dtype=object)[top["product"].to_numpy()],
+        "Keyword": top["term"].to_numpy(),
+        "Reviews": top["Reviews"].to_numpy(),
+        "Score": top["Score"].to_numpy(),
+    })
+
+
+def _aspects(tokens: Tokens, counts: pd.DataFrame, product_names) -> pd.DataFrame:
+    """How often each product's reviews mention each aspect, and how they feel about it."""
+    aspect_words = pd.DataFrame([(word, aspect) for aspect, words in ASPECTS.items() for word in words],
+                                columns=["word", "Aspect"])
+    word_codes = tokens.vocabulary.get_indexer(aspect_words["word"])
+    aspect_words = aspect_words[word_codes >= 0].assign(code=word_codes[word_codes >= 0])
+
+    mentions = pd.DataFrame({"comment": tokens.rows, "code": tokens.codes}).merge(
+        aspect_words[["code", "Aspect"]], on="code")
+    mentions = mentions[["comment", "Aspect"]].drop_duplicates().merge(counts, on="comment")
+
+    reviews_per_product = counts.groupby("product")["reviews"].sum()
+    aspects = mentions.groupby(["product", "Aspect"]).agg(
+        Reviews=("reviews", "sum"), score=("score", "sum")).reset_index()
+    aspects["Sentiment"] = aspects["score"] / aspects["Reviews"]
+    aspects["Share"] = aspects["Reviews"] / aspects["product"].map(reviews_per_product)
+    aspects.insert(0, "Product Name", np.asarray(product_names, dtype=object)[aspects["product"].to_numpy()])
+    return (aspects.sort_values(["Product Name", "Reviews"], ascending=[True, False])
+            .reset_index(drop=True)[["Product Name", "Aspect", "Reviews", "Share", "Sentiment"]])
+
+
+class TextInsights:
+    """What the comments of a set of reviews say, per product."""
+
+    def __init__(self, sentiment: pd.DataFrame, keywords: pd.DataFrame, aspects: pd.DataFrame):
+        """
+        Args:
+            sentiment: Reviews with a comment, average sentiment and the share
+                of each of SENTIMENT_LABELS per product
+            keywords: Top keywords of each product, with the number of
+                reviews using them and their TF-IDF score
+            aspects: Aspects mentioned by each product's reviews, with the
+                share of reviews mentioning them and their average sentiment
+        """
+        self.sentiment = sentiment
+        self.keywords = keywords
+        self.aspects = aspects
+
+
+def analyze_reviews(reviews: pd.DataFrame, top_k: int = KEYWORDS_PER_PRODUCT,
+                    min_reviews: int = KEYWORD_MIN_REVIEWS) -> TextInsights:
+    """
+    Sentiment, keywords and aspects of the reviews of each product.
+
+    Comments are tokenized once for all products. The stored sentiment of
+    each review is used, reviews stored without one are scored.
+
+    Args:
+        reviews: Reviews with Product Name and Comment, and SENTIMENT_COLUMN
+            when they were stored with it
+        top_k: Keywords per product
+        min_reviews: Reviews a keyword must appear in
+
+    Returns:
+        TextInsights: The analysis
+    """
+    reviews = reviews.reset_index(drop=True)
+    tokens = Tokens(reviews["Comment"])
+    if SENTIMENT_COLUMN in reviews:
+        scores = reviews[SENTIMENT_COLUMN].astype("float32")
+        missing = scores.isna() & tokens.has_text
+        if missing.any():
+            scores = scores.where(~missing, sentiment_scores(reviews["Comment"], tokens))
+    else:
+        scores = sentiment_scores(reviews["Comment"], tokens)
+
+    products, product_names = pd.factorize(reviews["Product Name"].astype(object), use_na_sentinel=False)
+
+    labels = sentiment_labels(scores)
+    shares = pd.crosstab(products, labels, normalize="index").reindex(columns=SENTIMENT_LABELS, fill_value=0.0)
+    sentiment = pd.DataFrame({
+        "Product Name": np.asarray(product_names, dtype=object)[shares.index.to_numpy()],
+        "Reviews": labels.notna().groupby(products).sum().reindex(shares.index).to_numpy(),
+        "Sentiment": scores.groupby(products).mean().reindex(shares.index).to_numpy(),
+    })
+    for label in SENTIMENT_LABELS:
+        sentiment[label.capitalize()] = shares[label].to_numpy()
+
+    counts = tokens.review_counts(products, scores.to_numpy(dtype="float64"))
+    return TextInsights(sentiment=sentiment,
+                        keywords=_keywords(tokens, counts, product_names, top_k, min_reviews),
+                        aspects=_aspects(tokens, counts, product_names))
@@ -0,0 +1,93 @@
+"""
+Word lists of the text analytics, written for product reviews.
+
+Sentiment weights range from -3 (very negative) to 3 (very positive) and
+are looked up on lowercased tokens, with apostrophes removed ("don't" is
+"dont").
+"""
+
+SENTIMENT_LEXICON = {
+    # Positive
+    "amazing": 3, "awesome": 3, "excellent": 3, "fantastic": 3, "outstanding": 3,
+    "perfect": 3, "superb": 3, "wonderful": 3, "brilliant": 3, "best": 3, "loved": 3,
+    "love": 3, "lovely": 2.5, "great": 2.5, "beautiful": 2.5, "gorgeous": 2.5,
+    "impressive": 2.5, "recommended": 2, "recommend": 2, "good": 2, "nice": 2,
+    "happy": 2, "satisfied": 2, "comfortable": 2, "comfy": 2, "soft": 1.5,
+    "worth": 2, "value": 1, "quality": 0.5, "genuine": 2, "authentic": 2,
+    "effective": 2, "works": 1.5, "worked": 1.5, "glowing": 2, "glow": 1.5,
+    "smooth": 1.5, "fresh": 1.5, "pleasant": 2, "elegant": 2, "stylish": 2,
+    "classy": 2, "cute": 2, "pretty": 2, "fine": 1, "decent": 1, "okay": 0.5,
+    "ok": 0.5, "fits": 1, "fit": 0.5, "fast": 1.5, "quick": 1.5, "ontime": 1.5,
+    "affordable": 1.5, "reasonable": 1.5, "durable": 2, "sturdy": 2, "premium": 2,
+    "fabulous": 3, "thanks": 1.5, "thank": 1.5, "like": 1, "liked": 1.5,
+    "useful": 1.5, "helpful": 1.5, "gentle": 1.5, "hydrating": 1.5, "moisturizing": 1.5,
+    "lightweight": 1, "light": 0.5, "clean": 1, "improved": 2, "better": 1.5,
+    "flawless": 3, "favourite": 2.5, "favorite": 2.5, "must": 1, "wow": 2.5,
+    # Negative
+    "bad": -2.5, "worst": -3, "terrible": -3, "horrible": -3, "awful": -3,
+    "pathetic": -3, "useless": -2.5, "waste": -2.5, "poor": -2.5, "cheap": -1,
+    "disappointed": -2.5, "disappointing": -2.5, "disappointment": -2.5,
+    "fake": -3, "duplicate": -2.5, "damaged": -2.5, "defective": -2.5, "broken": -2.5,
+    "torn": -2, "faded": -2, "fade": -1.5, "shrunk": -2, "shrink": -1.5, "shrinks": -1.5,
+    "loose": -1, "tight": -1, "small": -0.5, "big": -0.5, "itchy": -2, "rough": -1.5,
+    "irritation": -2.5, "irritating": -2.5, "rash": -2.5, "rashes": -2.5, "burning": -2.5,
+    "breakout": -2.5, "breakouts": -2.5, "pimples": -2, "acne": -1, "sticky": -1.5,
+    "greasy": -1.5, "oily": -1, "dull": -1.5, "smell": -0.5, "smells": -0.5,
+    "stinks": -2.5, "late": -1.5, "delayed": -1.5, "delay": -1.5, "slow": -1.5,
+    "expensive": -1.5, "overpriced": -2, "costly": -1.5, "return": -1, "returned": -1.5,
+    "refund": -1.5, "wrong": -2, "different": -1, "mismatch": -2, "problem": -1.5,
+    "issue": -1.5, "issues": -1.5, "complaint": -2, "hate": -3, "hated": -3,
+    "dislike": -2, "unhappy": -2, "uncomfortable": -2, "worse": -2,
+    "ugly": -2.5, "thin": -1, "transparent": -1, "bleeding": -2, "stain": -1.5,
+    "stains": -1.5, "allergic": -2.5, "allergy": -2, "dry": -0.5, "harsh": -2,
+    "nothing": -0.5, "avoid": -2.5, "regret": -2.5, "scam": -3,
+}
+
+# Flip the sentiment of the word that follows them
+NEGATIONS = frozenset({
+    "not", "no", "never", "dont", "doesnt", "didnt", "isnt", "wasnt", "arent",
+    "werent", "cant", "cannot", "couldnt", "wont", "wouldnt", "neither", "nor",
+    "without", "hardly",
+})
+
+# Strengthen the sentiment of the word that follows them
+INTENSIFIERS = frozenset({
+    "very", "really", "so", "too", "extremely", "super", "totally", "absolutely",
+    "highly", "truly", "completely", "most", "quite",
+})
+
+STOPWORDS = frozenset({
+    "a", "an", "the", "and", "or", "but", "if", "then", "so", "to", "of", "in", "on",
+    "at", "for", "with", "by", "from", "up", "as", "is", "are", "was", "were", "be",
+    "been", "being", "am", "it", "its", "this", "that", "these", "those", "i", "me",
+    "my", "we", "our", "you", "your", "he", "she", "they", "them", "their", "his",
+    "her", "him", "what", "which", "who", "whom", "there", "here", "when", "where",
+    "why", "how", "all", "any", "both", "each", "few", "more", "some", "such", "only",
+    "own", "same", "than", "also", "just", "can", "will", "would", "should", "could",
+    "do", "does", "did", "doing", "have", "has", "had", "having", "after", "before",
+    "about", "into", "over", "under", "again", "once", "other", "very", "really", "too",
+    "much", "many", "one", "get", "got", "im", "ive", "even", "use", "used",
+    "using", "product", "products", "item", "buy", "bought", "purchase", "purchased",
+    "order", "ordered", "myntra", "comment", "given", "while",
+    "because", "still", "well", "like", "dont", "not", "no",
+})
+
+# Aspects reviews talk about, and the words that mention each of them
+ASPECTS = {
+    "Quality": ("quality", "durable", "sturdy", "stitching", "stitch", "build", "finish"),
+    "Fit & size": ("fit", "fits", "fitting", "size", "sizes", "sizing", "tight", "loose",
+                   "small", "large", "length"),
+    "Price & value": ("price", "cost", "costly", "value", "worth", "money", "expensive",
+                      "cheap", "affordable", "overpriced"),
+    "Delivery & packaging": ("delivery", "delivered", "packaging", "packed", "package",
+                             "shipping", "arrived", "courier", "late", "delayed"),
+    "Material": ("material", "fabric", "cotton", "cloth", "polyester", "thin", "thick",
+                 "soft", "rough", "transparent"),
+    "Colour & look": ("color", "colour", "colors", "colours", "shade", "faded", "fade",
+                      "look", "looks", "design", "print", "style", "stylish"),
+    "Comfort": ("comfort", "comfortable", "comfy", "uncomfortable", "itchy", "breathable"),
+    "Skin & fragrance": ("skin", "acne", "pimples", "breakout", "breakouts", "oily", "dry",
+                         "glow", "glowing", "texture", "smell", "smells", "fragrance",
+                         "scent", "irritation", "rash", "rashes", "sticky", "greasy"),
+    "Authenticity": ("genuine", "original", "authentic", "fake", "duplicate"),
+}
@@ -0,0 +1,89 @@
+import threading
+from urllib.parse import urlsplit
+
+import mongomock
+import pytest
+
+from benchmarks.fixture_site import RECORDED_FIXTURES_DIR, load_pages
+from src.constants import MONGO_DATABASE_NAME
+from src.database_connect import MongoConnectionManager, mongo_operation
+from src.scrapper import browser
+from src.scrapper.browser import BrowserPool
+from src.scrapper.parser import ReviewPageParser
+
+
+@pytest.fixture(autouse=True)
+def offline(monkeypatch, tmp_path):
+    """Every test runs offline, without writing metrics or stores to the working directory."""
+    monkeypatch.delenv("MONGO_DB_URL", raising=False)
+    monkeypatch.delenv("REVIEW_STORE_BACKEND", raising=False)
+    monkeypatch.setenv("METRICS_LOG", "")
+    monkeypatch.chdir(tmp_path)
+
+
+MONGO_URL = "mongodb://mongo.test:27017"
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    """mongo_operation on an in-memory mongomock server, also used by MongoIO with MONGO_URL."""
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(MongoConnectionManager, "_create_client", lambda self: client)
+    monkeypatch.setattr(MongoConnectionManager, "_managers", {})
+    return mongo_operation(MONGO_URL, MONGO_DATABASE_NAME)
+
+
+@pytest.fixture(scope="session")
+def recorded_pages():
+    """URL path -> HTML of the pages in benchmarks/fixtures, and the search page."""
+    return load_pages(RECORDED_FIXTURES_DIR)
+
+
+class FakeDriver:
+    """Serves the recorded pages instead of loading them in Chrome."""
+
+    def __init__(self, pages: dict, search_page: str):
+        self.pages = pages
+        self.search_page = search_page
+        self.page_source = ""
+        self.visited = []
+        self.quit_called = False
+
+    def get(self, url: str):
+        path = urlsplit(url).path
+        self.visited.append(path)
+        self.page_source = self.pages.get(path, self.search_page)
+
+    def set_window_size(self, width: int, height: int):
+        pass
+
+    def execute_script(self, script: str, *args):
+        # Incremental scrapes read the loaded reviews, none is reported as stored
+        if "user-review-left" in script:
+            return []
+        # Otherwise only the review card count is read, the recorded pages hold every review
+        if "querySelectorAll" in script:
+            return len(ReviewPageParser().parse(self.page_source))
+        return None
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def fake_pool(monkeypatch, recorded_pages):
+    pages, search_page = recorded_pages
+    drivers = []
+    lock = threading.Lock()
+
+    def create_driver(**kwargs):
+        driver = FakeDriver(pages, search_page)
+        with lock:
+            drivers.append(driver)
+        return driver
+
+    monkeypatch.setattr(browser, "create_driver", create_driver)
+    pool = BrowserPool(size=2)
+    pool.drivers = drivers
+    yield pool
+    pool.close()
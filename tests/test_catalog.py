@@ -0,0 +1,102 @@
+import pandas as pd
+import pytest
+
+from src.cloud_io import MongoIO
+from src.cloud_io.catalog import MongoCatalog
+from src.review_schema import add_review_keys, normalize_reviews
+from src.storage.catalog import LocalCatalog, catalog_entry
+from tests.conftest import MONGO_URL
+
+
+def make_reviews(ratings: list, start: int = 0) -> pd.DataFrame:
+    return normalize_reviews(add_review_keys(pd.DataFrame({
+        "Product Name": "Derma Co Serum", "Over_All_Rating": 4.2, "Price": 438,
+        "Date": "1 Jan 2025", "Rating": ratings,
+        "Name": [f"reviewer {i}" for i in range(start, start + len(ratings))],
+        "Comment": [f"comment {i}" for i in range(start, start + len(ratings))],
+    })))
+
+
+def counted(catalog: MongoCatalog, collection_name: str) -> tuple:
+    """rating_counts computed client side, mongomock does not run $convert."""
+    ratings = pd.Series([document["Rating"] for document in catalog.mongo_ins.find(collection_name)])
+    counts = ratings.dropna().value_counts()
+    return len(ratings), {float(rating): int(count) for rating, count in counts.items()}
+
+
+def test_catalog_entry():
+    entry = catalog_entry("Derma Co", "derma_co", 4, {5.0: 2, 4.0: 1, 3.5: 1, None: 1})
+
+    assert entry["search_key"] == "derma co"
+    assert entry["rating_counts"] == {"5": 2, "4": 1, "3.5": 1}
+    assert entry["avg_rating"] == pytest.approx(4.375)
+
+
+def test_local_catalog_search(tmp_path):
+    catalog = LocalCatalog(str(tmp_path))
+    for name in ["Derma Co Serum", "derma  co sunscreen", "Nike Shoes"]:
+        catalog.update(catalog_entry(name, name.replace(" ", "_"), 1, {5.0: 1}))
+
+    assert [entry["product_name"] for entry in catalog.search("DERMA co")] == \
+        ["Derma Co Serum", "derma  co sunscreen"]
+    assert catalog.get("Nike_Shoes")["rating_counts"] == {"5": 1}
+    assert len(catalog) == 3
+    catalog.close()
+
+
+def test_add_reviews_increments_the_entry(mongo):
+    catalog = MongoCatalog(mongo)
+    assert not catalog.add_reviews("derma", make_reviews([5, 4]))
+    catalog.update(catalog_entry("derma co", "derma", 2, {5.0: 1, 4.0: 1}))
+
+    assert catalog.add_reviews("derma", make_reviews([5, 1, None]), product_name="Derma Co")
+
+    entry = catalog.get("derma")
+    assert (entry["product_name"], entry["search_key"], entry["review_count"]) == ("Derma Co", "derma co", 5)
+    assert entry["rating_counts"] == {"5": 2, "4": 1, "1": 1}
+    assert entry["avg_rating"] == pytest.approx(15 / 4)
+
+
+def test_fractional_ratings_are_counted_instead(mongo):
+    catalog = MongoCatalog(mongo)
+    catalog.update(catalog_entry("derma co", "derma", 1, {5.0: 1}))
+
+    # "4.5" cannot be a field name, the caller counts the collection again
+    assert not catalog.add_reviews("derma", make_reviews([4.5]))
+    assert catalog.get("derma")["review_count"] == 1
+
+
+@pytest.fixture
+def mongo_io(mongo, monkeypatch):
+    monkeypatch.setenv("MONGO_DB_URL", MONGO_URL)
+    mongo_io = MongoIO()
+    recounts = []
+
+    def rating_counts(collection_name: str) -> tuple:
+        recounts.append(collection_name)
+        return counted(mongo_io.catalog, collection_name)
+
+    monkeypatch.setattr(mongo_io.catalog, "rating_counts", rating_counts)
+    mongo_io.recounts = recounts
+    yield mongo_io
+    mongo_io.dedup_index.close()
+    mongo_io.local_store.close()
+    mongo_io.journal.close()
+
+
+def test_writes_count_only_new_reviews(mongo_io):
+    mongo_io.store_reviews(product_name="derma co", reviews=make_reviews([5, 4, 3]))
+    # The first write has no entry to add to yet
+    assert mongo_io.recounts == ["derma_co"]
+
+    # New reviews come first, mongomock misnumbers upserts that follow an update
+    again = pd.concat([make_reviews([1, 5], start=3), make_reviews([5, 4, 3])], ignore_index=True)
+    mongo_io.store_reviews(product_name="derma co", reviews=again, append=True)
+
+    assert mongo_io.recounts == ["derma_co"]
+    entry = mongo_io.get_catalog_entry("derma co")
+    review_count, rating_counts = counted(mongo_io.catalog, "derma_co")
+    assert entry["review_count"] == review_count == 5
+    assert entry["rating_counts"] == catalog_entry("derma co", "derma_co", review_count,
+                                                   rating_counts)["rating_counts"]
+    assert entry["avg_rating"] == pytest.approx(18 / 5)
@@ -0,0 +1,134 @@
+import time
+
+import pandas as pd
+import pytest
+from pymongo.errors import AutoReconnect, OperationFailure, ServerSelectionTimeoutError
+
+import src.database_connect
+from src.constants import MONGO_BREAKER_FAILURE_THRESHOLD, REVIEW_KEY_COLUMN
+from src.database_connect import BulkWriteReport, MongoConnectionManager, MongoUnavailableError
+
+RESET_SECONDS = 0.05
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(src.database_connect, "MONGO_BREAKER_RESET_SECONDS", RESET_SECONDS)
+    return MongoConnectionManager("mongodb://mongo.test:27017")
+
+
+def fail(manager, error: Exception = AutoReconnect("connection reset")):
+    with pytest.raises(type(error)):
+        with manager.guard():
+            raise error
+
+
+def test_breaker_opens_after_the_threshold(manager):
+    for _ in range(MONGO_BREAKER_FAILURE_THRESHOLD - 1):
+        fail(manager)
+        assert manager.is_available()
+
+    fail(manager)
+    assert not manager.is_available()
+    with pytest.raises(MongoUnavailableError):
+        with manager.guard():
+            pytest.fail("The call reached the server while the breaker was open")
+
+
+def test_server_errors_do_not_open_the_breaker(manager):
+    for _ in range(MONGO_BREAKER_FAILURE_THRESHOLD):
+        fail(manager, OperationFailure("duplicate key"))
+
+    assert manager.is_available()
+
+
+def test_unreachable_cluster_opens_the_breaker_at_once(manager):
+    fail(manager, ServerSelectionTimeoutError("No servers found"))
+
+    assert not manager.is_available()
+
+
+def test_one_trial_call_after_the_reset(manager):
+    for _ in range(MONGO_BREAKER_FAILURE_THRESHOLD):
+        fail(manager)
+    time.sleep(RESET_SECONDS * 2)
+
+    with manager.guard():
+        # Other calls fail fast while the trial runs
+        with pytest.raises(MongoUnavailableError):
+            with manager.guard():
+                pass
+    assert manager.is_available()
+
+
+def test_failed_trial_opens_the_breaker_again(manager):
+    for _ in range(MONGO_BREAKER_FAILURE_THRESHOLD):
+        fail(manager)
+    time.sleep(RESET_SECONDS * 2)
+
+    fail(manager)
+
+    assert not manager.is_available()
+
+
+def test_fingerprint_changes_with_every_write(mongo):
+    assert mongo.fingerprint("derma") == (0, None, 0)
+    reviews = pd.DataFrame({REVIEW_KEY_COLUMN: ["a", "b"], "Rating": [5, 4]})
+
+    mongo.bulk_insert(reviews, "derma", upsert_key=REVIEW_KEY_COLUMN)
+    inserted = mongo.fingerprint("derma")
+    assert inserted[0] == 2 and inserted[2] == 1
+
+    # Updating stored reviews keeps the count and newest id
+    mongo.bulk_insert(reviews.assign(Rating=1), "derma", upsert_key=REVIEW_KEY_COLUMN)
+    updated = mongo.fingerprint("derma")
+    assert updated[:2] == inserted[:2] and updated != inserted
+
+
+def test_bulk_insert_writes_in_chunks(mongo):
+    reviews = pd.DataFrame({REVIEW_KEY_COLUMN: [f"key-{i}" for i in range(25)], "Rating": 5})
+
+    report = mongo.bulk_insert(reviews, "derma", chunk_size=10, upsert_key=REVIEW_KEY_COLUMN)
+
+    assert [chunk["records"] for chunk in report.chunks] == [10, 10, 5]
+    assert (report.written, report.inserted, report.failed) == (25, 25, 0)
+    assert report.new_positions == list(range(25))
+    assert mongo.db["derma"].count_documents({}) == 25
+
+
+def test_bulk_insert_upserts_on_the_key(mongo):
+    reviews = pd.DataFrame({REVIEW_KEY_COLUMN: [f"key-{i}" for i in range(10)], "Rating": 5})
+    mongo.bulk_insert(reviews, "derma", chunk_size=4, upsert_key=REVIEW_KEY_COLUMN)
+
+    again = pd.DataFrame({REVIEW_KEY_COLUMN: [f"key-{i}" for i in range(5, 15)], "Rating": 1})
+    report = mongo.bulk_insert(again, "derma", chunk_size=4, upsert_key=REVIEW_KEY_COLUMN)
+
+    assert (report.written, report.inserted) == (10, 5)
+    assert mongo.db["derma"].count_documents({}) == 15
+    assert mongo.db["derma"].count_documents({"Rating": 1}) == 10
+
+
+def test_bulk_insert_reports_rejected_documents(mongo):
+    mongo.db["derma"].create_index(REVIEW_KEY_COLUMN, unique=True)
+    reviews = pd.DataFrame({REVIEW_KEY_COLUMN: ["a", "b", "a", "c"], "Rating": 5})
+
+    report = mongo.bulk_insert(reviews, "derma", chunk_size=2)
+
+    # Unordered writes go on past the duplicate
+    assert (report.written, report.inserted, report.failed) == (3, 3, 1)
+    assert report.new_positions == [0, 1, 3]
+    assert len(report.chunks[1]["errors"]) == 1
+
+
+def test_bulk_write_report_counts():
+    report = BulkWriteReport("derma")
+    report.add_chunk({"nInserted": 0, "nUpserted": 2, "nMatched": 1,
+                      "upserted": [{"index": 0}, {"index": 2}]}, records=3, seconds=0.5)
+    report.add_chunk({"nInserted": 2, "writeErrors": [{"index": 1, "errmsg": "duplicate key"}]},
+                     records=3, seconds=0.0, start=3)
+
+    assert (report.written, report.inserted, report.failed) == (5, 4, 1)
+    assert report.new_positions == [0, 2, 3, 5]
+    assert report.chunks[0]["docs_per_second"] == 6
+    assert report.chunks[1]["errors"] == ["duplicate key"]
+    assert repr(report) == "BulkWriteReport('derma', chunks=2, written=5, inserted=4, failed=1)"
@@ -0,0 +1,146 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.fixture_site import SAMPLE_DATA_PATH
+from src.cloud_io import MongoIO
+from src.constants import DUPLICATE_COLUMN, REVIEW_COLUMNS, REVIEW_KEY_COLUMN
+from src.dedup import DedupIndex
+from src.dedup.minhash import minhash_signatures, normalize_comments, similarities
+from src.review_schema import add_review_keys, normalize_reviews
+from tests.conftest import MONGO_URL
+
+LONG_COMMENT = "The serum absorbs quickly and my pigmentation faded within a month"
+
+
+def make_reviews(names: list, comments: list, dates: list = None) -> pd.DataFrame:
+    dates = dates or [f"{day + 1} Jan 2025" for day in range(len(names))]
+    return normalize_reviews(add_review_keys(pd.DataFrame({
+        "Product Name": "Derma Co Serum", "Over_All_Rating": 4.2, "Price": 438,
+        "Date": dates, "Rating": 5, "Name": names, "Comment": comments,
+    })))
+
+
+def flags(reviews: pd.DataFrame) -> list:
+    return [None if pd.isna(key) else key for key in reviews[DUPLICATE_COLUMN]]
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = DedupIndex(str(tmp_path))
+    yield index
+    index.close()
+
+
+def test_short_common_reviews_are_all_kept(index):
+    # Distinct reviews that only share the default name and a one word comment
+    reviews = make_reviews(["Myntra Customer"] * 5, ["Good"] * 5)
+
+    flagged, fingerprints = index.flag("derma", reviews)
+
+    assert len(flagged) == 5
+    assert flagged[DUPLICATE_COLUMN].isna().all()
+    index.add("derma", fingerprints)
+    flagged, _ = index.flag("derma", make_reviews(["Myntra Customer"] * 5, ["Good"] * 5,
+                                                  dates=[f"{day + 1} Feb 2025" for day in range(5)]))
+    assert len(flagged) == 5
+    assert flagged[DUPLICATE_COLUMN].isna().all()
+
+
+def test_only_repeated_review_keys_are_dropped(index):
+    reviews = make_reviews(["Asha", "Ravi"], ["Good", LONG_COMMENT])
+
+    flagged, _ = index.flag("derma", pd.concat([reviews, reviews], ignore_index=True))
+
+    assert flagged[REVIEW_KEY_COLUMN].tolist() == reviews[REVIEW_KEY_COLUMN].tolist()
+
+
+def test_repeated_and_copied_comments_are_flagged(index):
+    original = make_reviews(["Asha"], [LONG_COMMENT])
+    flagged, fingerprints = index.flag("derma", original)
+    index.add("derma", fingerprints)
+    original_key = original[REVIEW_KEY_COLUMN].iloc[0]
+
+    again = make_reviews(["Asha", "Bot", "Ravi"],
+                         [LONG_COMMENT, LONG_COMMENT + " !!", "Delivery was late and the box was damaged"],
+                         dates=["3 Mar 2025"] * 3)
+    flagged, _ = index.flag("derma", again)
+
+    # The same review scraped with another date and a near copy point to the original
+    assert flags(flagged) == [original_key, original_key, None]
+
+
+def test_stored_reviews_keep_their_flag(index):
+    reviews = make_reviews(["Asha", "Bot"], [LONG_COMMENT, LONG_COMMENT + " really"])
+    flagged, fingerprints = index.flag("derma", reviews)
+    index.add("derma", fingerprints)
+
+    again, _ = index.flag("derma", reviews)
+
+    assert flags(again) == flags(flagged)
+    assert flags(flagged) == [None, reviews[REVIEW_KEY_COLUMN].iloc[0]]
+
+
+def test_minhash_estimates_similarity():
+    text = normalize_comments(pd.Series([LONG_COMMENT, LONG_COMMENT + " !!", "Terrible fit, returned it"]))
+    signatures = minhash_signatures(text)
+
+    assert similarities(signatures[:1], signatures[1:2])[0] > 0.8
+    assert similarities(signatures[:1], signatures[2:3])[0] < 0.2
+    np.testing.assert_array_equal(minhash_signatures(text), signatures)
+
+
+@pytest.fixture
+def mongo_io():
+    mongo_io = MongoIO()
+    yield mongo_io
+    mongo_io.dedup_index.close()
+    mongo_io.local_store.close()
+
+
+def test_store_keeps_distinct_myntra_customer_reviews(mongo_io):
+    reviews = make_reviews(["Myntra Customer"] * 5, ["Good"] * 5)
+
+    mongo_io.store_reviews(product_name="derma", reviews=reviews)
+
+    assert len(mongo_io.get_reviews("derma")) == 5
+
+
+def test_failed_write_is_not_indexed(mongo_io, monkeypatch, tmp_path):
+    reviews = normalize_reviews(add_review_keys(pd.read_csv(SAMPLE_DATA_PATH)))
+    fresh = DedupIndex(str(tmp_path / "fresh"))
+    expected, _ = fresh.flag("derma", reviews)
+    fresh.close()
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(mongo_io.local_store, "write", fail)
+        mongo_io.store_reviews(product_name="derma", reviews=reviews)
+    assert not mongo_io.dedup_index.indexed("derma")
+    mongo_io.store_reviews(product_name="derma", reviews=reviews)
+
+    # The retry is flagged like a first write, not as a copy of the write that failed
+    stored = mongo_io.get_reviews("derma", columns=REVIEW_COLUMNS + [DUPLICATE_COLUMN])
+    assert len(stored) == len(reviews)
+    assert stored[DUPLICATE_COLUMN].notna().sum() == expected[DUPLICATE_COLUMN].notna().sum()
+
+
+def test_reviews_stored_without_keys_are_recognized(mongo, monkeypatch):
+    monkeypatch.setenv("MONGO_DB_URL", MONGO_URL)
+    scraped = pd.DataFrame({"Product Name": "Derma Co Serum", "Over_All_Rating": "4.2", "Price": "₹438",
+                            "Date": ["7 Sept 2024", "22 July 2025"], "Rating": "5",
+                            "Name": ["Asha", "Ravi"], "Comment": [LONG_COMMENT, "Good"]})
+    # Stored as scraped by versions without review keys
+    mongo.db["derma"].insert_many(scraped.to_dict("records"))
+    mongo_io = MongoIO()
+
+    mongo_io.store_reviews(product_name="derma", reviews=add_review_keys(scraped))
+
+    # Scraped again, not flagged as copies of themselves
+    stored = mongo.db["derma"].find({REVIEW_KEY_COLUMN: {"$exists": True}})
+    assert [document.get(DUPLICATE_COLUMN) for document in stored] == [None, None]
+    mongo_io.dedup_index.close()
+    mongo_io.local_store.close()
+    mongo_io.journal.close()
@@ -0,0 +1,101 @@
+import asyncio
+import socket
+
+import pytest
+
+from benchmarks.fixture_site import FixtureSite
+from src.constants import REVIEW_CARD_CLASS
+from src.scrapper.fetch import HttpFetchEngine, is_server_rendered
+from src.scrapper.scrape import ScrapeReviews
+from src.telemetry import get_metrics
+
+# Review cards in the HTML of a fixture review page, the rest load on scroll
+PAGE_SIZE = 10
+
+
+@pytest.fixture(scope="module")
+def site():
+    with FixtureSite(no_of_products=4, review_page_size=PAGE_SIZE) as site:
+        yield site
+
+
+@pytest.fixture
+def http():
+    http = HttpFetchEngine(pool_size=4, timeout=5, retries=0)
+    yield http
+    http.close()
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_fetch(site, http):
+    product = site.products[0]
+
+    page = http.fetch(site.base_url + product["slug"])
+
+    assert page == site.pages["/" + product["slug"]]
+
+
+def test_fetch_failure_returns_none(http):
+    assert http.fetch(f"http://127.0.0.1:{free_port()}/") is None
+
+
+def test_fetch_many_keeps_the_order(site, http):
+    paths = sorted(site.pages)
+    urls = [site.base_url + path.lstrip("/") for path in paths]
+
+    assert http.fetch_many(urls) == [site.pages[path] for path in paths]
+    assert asyncio.run(http.afetch_many(urls)) == [site.pages[path] for path in paths]
+
+
+def test_is_server_rendered():
+    page = f'<div class="{REVIEW_CARD_CLASS}"></div>' * 3
+
+    assert is_server_rendered(page)
+    assert is_server_rendered(page, REVIEW_CARD_CLASS, min_count=3)
+    assert not is_server_rendered(page, REVIEW_CARD_CLASS, min_count=4)
+    assert not is_server_rendered(page, "pdp-price")
+    assert not is_server_rendered("", REVIEW_CARD_CLASS)
+    assert not is_server_rendered(None)
+    # Cards a script inserts later are not in the page yet
+    script = f'<script>var pending = ["<div class=\\"{REVIEW_CARD_CLASS}\\"></div>"];</script>'
+    assert not is_server_rendered(page + script, REVIEW_CARD_CLASS, min_count=4)
+
+
+def scrape(site, pool, fetch_engine: str, max_reviews: int):
+    scraper = ScrapeReviews(product_name="derma co", no_of_products=2, max_workers=2,
+                            base_url=site.base_url, max_reviews_per_product=max_reviews,
+                            fetch_engine=fetch_engine, browser_pool=pool, use_cache=False)
+    return scraper.get_review_data()
+
+
+def test_http_engine_never_starts_a_browser(site, fake_pool):
+    data = scrape(site, fake_pool, "http", max_reviews=None)
+
+    assert data["Product Name"].nunique() == 2
+    # Without a browser only the server-rendered first page of reviews is read
+    assert len(data) == 2 * PAGE_SIZE
+    assert fake_pool.drivers == []
+
+
+def test_auto_uses_http_when_the_page_holds_the_reviews(site, fake_pool):
+    data = scrape(site, fake_pool, "auto", max_reviews=5)
+
+    assert len(data) == 2 * 5
+    assert fake_pool.drivers == []
+
+
+def test_auto_falls_back_to_the_browser(site, fake_pool):
+    before = get_metrics().snapshot()["counters"].get("browser_fallbacks_total", 0)
+
+    data = scrape(site, fake_pool, "auto", max_reviews=PAGE_SIZE + 5)
+
+    # The review lists need scrolling, only they are loaded in the browser
+    assert len(data) == 2 * (PAGE_SIZE + 5)
+    visited = [path for driver in fake_pool.drivers for path in driver.visited]
+    assert sorted(visited) == sorted(f"/reviews/{product['id']}" for product in site.products[:2])
+    assert get_metrics().snapshot()["counters"]["browser_fallbacks_total"] - before == 2
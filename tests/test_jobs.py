@@ -0,0 +1,170 @@
+import pytest
+
+import src.cloud_io
+from benchmarks.fixture_site import FixtureSite
+from src.cloud_io import MongoIO
+from src.jobs.queue import JobQueue
+from src.jobs.worker import ScrapeWorker
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"), max_attempts=2)
+    yield queue
+    queue.close()
+
+
+def test_submit_and_claim_in_order(queue):
+    first = queue.submit("derma co", 2, fetch_engine="http")
+    second = queue.submit("nike shoes", 1)
+
+    job = queue.claim("worker-1")
+    assert (job.job_id, job.status, job.attempts, job.worker) == (first, "running", 1, "worker-1")
+    assert job.options == {"fetch_engine": "http"}
+    assert queue.claim("worker-2").job_id == second
+    assert queue.claim("worker-3") is None
+    assert queue.counts() == {"running": 2}
+
+
+def test_submit_validation(queue):
+    with pytest.raises(ValueError):
+        queue.submit(" ", 1)
+    with pytest.raises(ValueError):
+        queue.submit("derma co", 0)
+
+
+def test_expired_lease_is_claimed_again(queue):
+    job_id = queue.submit("derma co", 2)
+    queue.claim("worker-1", lease_seconds=60)
+    assert queue.claim("worker-2") is None
+
+    # The worker stops renewing its lease
+    queue.progress(job_id, 1, 10, lease_seconds=-1)
+    job = queue.claim("worker-2")
+
+    assert (job.job_id, job.worker, job.attempts) == (job_id, "worker-2", 2)
+    # Progress starts over with the new run
+    assert (job.products_done, job.reviews_scraped) == (0, 0)
+
+
+def test_jobs_killing_their_worker_fail_after_max_attempts(queue):
+    job_id = queue.submit("derma co", 2)
+    for _ in range(queue.max_attempts):
+        assert queue.claim("worker", lease_seconds=-1).job_id == job_id
+
+    assert queue.claim("worker") is None
+    job = queue.get(job_id)
+    assert job.status == "failed"
+    assert job.error == "The worker running the job stopped"
+    assert job.finished_at is not None
+
+
+def test_fail_requeues_until_max_attempts(queue):
+    job_id = queue.submit("derma co", 2)
+    queue.claim("worker")
+    queue.fail(job_id, "timeout")
+    assert queue.get(job_id).status == "queued"
+
+    queue.claim("worker")
+    queue.fail(job_id, "timeout again")
+    job = queue.get(job_id)
+    assert (job.status, job.error, job.attempts) == ("failed", "timeout again", 2)
+    assert queue.claim("worker") is None
+
+
+def test_progress_and_finish(queue):
+    job_id = queue.submit("derma co", 4)
+    queue.claim("worker")
+
+    assert queue.progress(job_id, 1, 25)
+    job = queue.get(job_id)
+    assert (job.products_done, job.reviews_scraped, job.progress) == (1, 25, 0.25)
+
+    queue.finish(job_id)
+    job = queue.get(job_id)
+    assert (job.status, job.progress) == ("done", 1.0)
+    # A finished job takes no more progress
+    assert not queue.progress(job_id, 2, 50)
+
+
+def test_cancel(queue):
+    queued = queue.submit("derma co", 2)
+    running = queue.submit("nike shoes", 2)
+    assert queue.cancel(queued)
+    assert queue.claim("worker").job_id == running
+
+    assert queue.cancel(running)
+    # The worker learns it with its next progress update
+    assert not queue.progress(running, 1, 10)
+    assert queue.get(running).status == "cancelled"
+    assert not queue.cancel(running)
+    assert queue.claim("worker") is None
+
+
+def test_queue_is_shared_between_connections(tmp_path):
+    path = str(tmp_path / "jobs.sqlite")
+    app, worker = JobQueue(path), JobQueue(path)
+    job_id = app.submit("derma co", 1)
+
+    assert worker.claim("worker").job_id == job_id
+    worker.progress(job_id, 1, 5)
+    assert app.get(job_id).reviews_scraped == 5
+    app.close()
+    worker.close()
+
+
+@pytest.fixture
+def site():
+    with FixtureSite(no_of_products=3, review_page_size=10) as site:
+        yield site
+
+
+@pytest.fixture
+def mongo_io(monkeypatch):
+    mongo_io = MongoIO()
+    monkeypatch.setattr(src.cloud_io, "get_mongo_io", lambda: mongo_io)
+    yield mongo_io
+    mongo_io.dedup_index.close()
+    mongo_io.local_store.close()
+
+
+def run_job(queue, site, no_of_products: int = 3):
+    job_id = queue.submit("derma co", no_of_products, fetch_engine="http", use_cache=False)
+    worker = ScrapeWorker(queue, worker_id="worker", base_url=site.base_url)
+    try:
+        worker.run_job(queue.claim("worker"))
+    finally:
+        worker.close()
+    return queue.get(job_id)
+
+
+def test_worker_runs_a_job(queue, site, mongo_io):
+    job = run_job(queue, site)
+
+    assert (job.status, job.products_done, job.reviews_scraped) == ("done", 3, 30)
+    assert len(mongo_io.get_reviews("derma co")) == 30
+
+
+def test_worker_stops_a_cancelled_job(queue, site, mongo_io, monkeypatch):
+    progress = queue.progress
+
+    def cancel_after_first_product(job_id, products_done, reviews_scraped):
+        queue.cancel(job_id)
+        return progress(job_id, products_done, reviews_scraped)
+
+    monkeypatch.setattr(queue, "progress", cancel_after_first_product)
+    job = run_job(queue, site)
+
+    assert job.status == "cancelled"
+    assert len(mongo_io.get_reviews("derma co")) == 10
+
+
+def test_worker_requeues_a_failed_job(queue, site, mongo_io, monkeypatch):
+    def fail(**kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(mongo_io, "store_reviews", fail)
+    job = run_job(queue, site)
+
+    assert (job.status, job.attempts) == ("queued", 1)
+    assert "disk full" in job.error
@@ -0,0 +1,132 @@
+import time
+
+import pandas as pd
+import pytest
+
+from src.cloud_io.sync import SyncWorker
+from src.constants import REVIEW_KEY_COLUMN
+from src.storage.journal import WriteJournal
+
+
+def make_reviews(count: int, start: int = 0) -> pd.DataFrame:
+    return pd.DataFrame({"Name": [f"reviewer {i}" for i in range(start, start + count)],
+                         "Rating": [5.0] * count,
+                         REVIEW_KEY_COLUMN: [f"key-{i}" for i in range(start, start + count)]})
+
+
+class WriteResult:
+    def __init__(self, written: int):
+        self.written = written
+        self.failed = 0
+        self.new_positions = list(range(written))
+
+
+class FakeMongo:
+    """Records the bulk writes of a sync, or fails them while ``available`` is False."""
+
+    def __init__(self):
+        self.available = True
+        self.writes = []
+
+    def bulk_insert(self, reviews: pd.DataFrame, collection_name: str, upsert_key: str = None):
+        if not self.available:
+            raise ConnectionError("MongoDB is unavailable")
+        self.writes.append((collection_name, reviews))
+        return WriteResult(len(reviews))
+
+
+class FakeMongoIO:
+    def __init__(self):
+        self.mongo_ins = FakeMongo()
+        self.catalog_updates = []
+
+    def reconnect(self) -> bool:
+        return True
+
+    def update_catalog(self, collection_name: str, product_name: str = None, online: bool = False,
+                       last_scraped=None, new_reviews=None):
+        self.catalog_updates.append((collection_name, product_name))
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = WriteJournal(str(tmp_path / "journal.sqlite"))
+    yield journal
+    journal.close()
+
+
+def test_entries_survive_a_restart(tmp_path):
+    path = str(tmp_path / "journal.sqlite")
+    journal = WriteJournal(path)
+    journal.append("derma", make_reviews(3), product_name="derma co")
+    journal.close()
+
+    journal = WriteJournal(path)
+    entry, = journal.claim(10)
+    assert (entry.collection_name, entry.product_name, entry.attempts) == ("derma", "derma co", 1)
+    pd.testing.assert_frame_equal(entry.reviews, make_reviews(3))
+    assert journal.pending() == (1, 3)
+    journal.close()
+
+
+def test_claimed_entries_are_leased(journal):
+    first = journal.append("derma", make_reviews(2))
+    second = journal.append("derma", make_reviews(2, start=2))
+
+    assert [entry.entry_id for entry in journal.claim(1, lease_seconds=60)] == [first]
+    # Leased entries are skipped by other workers
+    assert [entry.entry_id for entry in journal.claim(10, lease_seconds=60)] == [second]
+    assert journal.claim(10) == []
+
+
+def test_expired_leases_are_claimed_again(journal):
+    journal.append("derma", make_reviews(2))
+    journal.claim(10, lease_seconds=0.05)
+    time.sleep(0.1)
+
+    entry, = journal.claim(10)
+    assert entry.attempts == 2
+
+
+def test_ack_and_release(journal):
+    acked = journal.append("derma", make_reviews(2))
+    released = journal.append("derma", make_reviews(2, start=2))
+    journal.claim(10, lease_seconds=60)
+
+    journal.ack([acked])
+    journal.release([released])
+    assert journal.pending() == (1, 2)
+    assert [entry.entry_id for entry in journal.claim(10)] == [released]
+
+
+def test_sync_replays_entries_per_collection(journal):
+    journal.append("derma", make_reviews(2), product_name="derma co")
+    journal.append("shoes", make_reviews(1, start=2), product_name="shoes")
+    journal.append("derma", make_reviews(3, start=3), product_name="derma co")
+    mongo_io = FakeMongoIO()
+
+    assert SyncWorker(mongo_io, journal).sync_once() == 3
+
+    writes = {collection_name: reviews for collection_name, reviews in mongo_io.mongo_ins.writes}
+    assert len(mongo_io.mongo_ins.writes) == 2
+    assert writes["derma"][REVIEW_KEY_COLUMN].tolist() == [f"key-{i}" for i in (0, 1, 3, 4, 5)]
+    assert writes["shoes"][REVIEW_KEY_COLUMN].tolist() == ["key-2"]
+    assert sorted(mongo_io.catalog_updates) == [("derma", "derma co"), ("shoes", "shoes")]
+    assert journal.pending() == (0, 0)
+
+
+def test_failed_sync_releases_its_entries(journal):
+    journal.append("derma", make_reviews(2))
+    mongo_io = FakeMongoIO()
+    mongo_io.mongo_ins.available = False
+    worker = SyncWorker(mongo_io, journal)
+
+    with pytest.raises(ConnectionError):
+        worker.sync_once()
+    # Retried by the next round instead of waiting for the lease
+    assert journal.pending() == (1, 2)
+
+    mongo_io.mongo_ins.available = True
+    assert worker.sync_once() == 1
+    assert worker.synced == 2
+    assert journal.pending() == (0, 0)
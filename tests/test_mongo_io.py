@@ -0,0 +1,94 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from src.cloud_io import MongoIO
+from src.constants import DUPLICATE_COLUMN
+from tests.conftest import MONGO_URL
+
+# Ratings as numbers once converted on the server
+RATING = {"$convert": {"input": "$Rating", "to": "double", "onError": None, "onNull": None}}
+
+DOCUMENTS = [
+    {"Name": "Asha", "Rating": 5.0, "Date": datetime(2025, 3, 21)},
+    # Stored as scraped by earlier versions
+    {"Name": "Ravi", "Rating": "4", "Date": "7 Sept 2024"},
+    {"Name": "Meera", "Rating": 2.0, "Date": datetime(2025, 7, 22)},
+]
+
+
+@pytest.fixture
+def mongo_io(mongo, monkeypatch):
+    monkeypatch.setenv("MONGO_DB_URL", MONGO_URL)
+    mongo_io = MongoIO()
+    calls = []
+
+    def iter_batches(collection_name: str, query: dict = None, fields: list = None,
+                     limit: int = None, batch_size: int = 1000):
+        calls.append({"collection": collection_name, "query": query, "fields": fields, "limit": limit})
+        documents = [{field: document[field] for field in fields or document if field in document}
+                     for document in DOCUMENTS]
+        yield documents[:limit] if limit else documents
+
+    monkeypatch.setattr(mongo_io.mongo_ins, "iter_batches", iter_batches)
+    mongo_io.calls = calls
+    yield mongo_io
+    mongo_io.dedup_index.close()
+    mongo_io.local_store.close()
+    mongo_io.journal.close()
+
+
+def test_without_filters(mongo_io):
+    reviews = mongo_io.get_reviews("derma co", columns=["Name"], limit=2)
+
+    assert mongo_io.calls == [{"collection": "derma_co", "query": {}, "fields": ["Name"], "limit": 2}]
+    assert reviews["Name"].tolist() == ["Asha", "Ravi"]
+
+
+def test_rating_filter_runs_on_the_server(mongo_io):
+    mongo_io.get_reviews("derma co", min_rating=3, max_rating=5, limit=10)
+    mongo_io.get_reviews("derma co", max_rating=3)
+
+    assert mongo_io.calls[0]["query"] == {"$expr": {"$and": [{"$gte": [RATING, 3]}, {"$lte": [RATING, 5]}]}}
+    assert mongo_io.calls[0]["limit"] == 10
+    assert mongo_io.calls[1]["query"] == {"$expr": {"$and": [{"$lte": [RATING, 3]}]}}
+
+
+def test_skip_duplicates(mongo_io):
+    mongo_io.get_reviews("derma co", skip_duplicates=True)
+    mongo_io.get_reviews("derma co", min_rating=4, skip_duplicates=True)
+
+    assert mongo_io.calls[0]["query"] == {DUPLICATE_COLUMN: None}
+    assert mongo_io.calls[1]["query"] == {"$and": [{"$expr": {"$and": [{"$gte": [RATING, 4]}]}},
+                                                   {DUPLICATE_COLUMN: None}]}
+
+
+def test_date_filter_lets_text_dates_through_to_the_client(mongo_io):
+    reviews = mongo_io.get_reviews("derma co", columns=["Name"], date_from="2025-01-01", limit=1)
+
+    call, = mongo_io.calls
+    assert call["query"] == {"$or": [{"Date": {"$gte": datetime(2025, 1, 1)}},
+                                     {"Date": {"$type": "string"}}]}
+    # The limit and the text dates are applied once loaded, which needs the dates
+    assert (call["fields"], call["limit"]) == (["Name", "Date"], None)
+    assert reviews.columns.tolist() == ["Name"]
+    assert reviews["Name"].tolist() == ["Asha"]
+
+    reviews = mongo_io.get_reviews("derma co", date_from="2024-09-01", date_to="2025-06-30")
+    assert reviews["Name"].tolist() == ["Asha", "Ravi"]
+    assert mongo_io.calls[-1]["query"]["$or"][0] == {
+        "Date": {"$gte": datetime(2024, 9, 1), "$lte": datetime(2025, 6, 30)}}
+
+
+def test_reviews_are_normalized(mongo_io):
+    reviews = mongo_io.get_reviews("derma co")
+
+    assert reviews["Rating"].tolist() == [5.0, 4.0, 2.0]
+    assert reviews["Date"].tolist() == [pd.Timestamp(2025, 3, 21), pd.Timestamp(2024, 9, 7),
+                                        pd.Timestamp(2025, 7, 22)]
+
+
+def test_empty_product_name_is_rejected(mongo_io):
+    with pytest.raises(Exception, match="Product name cannot be empty"):
+        mongo_io.get_reviews(" ")
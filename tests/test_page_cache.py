@@ -0,0 +1,95 @@
+import sqlite3
+import zlib
+
+import pytest
+
+import src.scrapper.cache
+from src.scrapper.cache import PageCache, get_page_cache
+
+
+class Clock:
+    """Stands in for the time module, moved forward by the tests."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(src.scrapper.cache, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = PageCache(str(tmp_path), ttl={"search": 60, "reviews": 10})
+    yield cache
+    cache.close()
+
+
+def stored(cache: PageCache) -> dict:
+    """URL -> compressed body, read from the cache file."""
+    with sqlite3.connect(cache.path) as conn:
+        return dict(conn.execute("SELECT url, body FROM pages"))
+
+
+def test_pages_round_trip_compressed(cache):
+    page = "<html>" + "<div class='user-review'>Très bon ₹438</div>" * 200 + "</html>"
+
+    cache.put("http://site/reviews/1", "reviews", page)
+
+    assert cache.get("http://site/reviews/1", "reviews") == page
+    body = stored(cache)["http://site/reviews/1"]
+    assert len(body) < len(page.encode("utf-8")) / 10
+    assert zlib.decompress(body).decode("utf-8") == page
+
+
+def test_pages_expire_after_the_ttl_of_their_type(cache, clock):
+    cache.put("http://site/search", "search", "search page")
+    cache.put("http://site/reviews/1", "reviews", "review page")
+
+    clock.now += 10
+    assert cache.get("http://site/reviews/1", "reviews") == "review page"
+    clock.now += 1
+    assert cache.get("http://site/reviews/1", "reviews") is None
+    assert cache.get("http://site/search", "search") == "search page"
+    # Expired pages are dropped
+    assert list(stored(cache)) == ["http://site/search"]
+
+
+def test_least_recently_used_pages_are_evicted(tmp_path, clock):
+    pages = {f"http://site/{number}": f"page {number} " + "x" * 50 for number in range(3)}
+    size = len(zlib.compress(pages["http://site/0"].encode("utf-8")))
+    cache = PageCache(str(tmp_path), max_bytes=2 * size, ttl={"reviews": 60})
+    for url, page in pages.items():
+        if url == "http://site/2":
+            # Reading a page makes it recently used
+            clock.now += 1
+            cache.get("http://site/0", "reviews")
+        clock.now += 1
+        cache.put(url, "reviews", page)
+
+    assert sorted(stored(cache)) == ["http://site/0", "http://site/2"]
+    assert cache.get("http://site/1", "reviews") is None
+    cache.close()
+
+
+def test_invalidate_and_clear(cache):
+    cache.put("http://site/search", "search", "search page")
+    cache.put("http://site/reviews/1", "reviews", "review page")
+
+    cache.invalidate("http://site/search")
+    assert cache.get("http://site/search", "search") is None
+    assert cache.get("http://site/reviews/1", "reviews") == "review page"
+    cache.clear()
+    assert stored(cache) == {}
+
+
+def test_shared_cache_per_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(src.scrapper.cache, "_shared_caches", {})
+    assert get_page_cache(str(tmp_path)) is get_page_cache(str(tmp_path / "."))
+    assert get_page_cache(str(tmp_path)) is not get_page_cache(str(tmp_path / "other"))
@@ -0,0 +1,76 @@
+import pandas as pd
+import pytest
+
+from benchmarks.fixture_site import SAMPLE_DATA_PATH
+from src.constants import NO_COMMENT, NO_DATE, NO_RATING
+from src.scrapper.parser import PARSER_BACKENDS, REVIEW_FIELDS, ReviewPageParser
+
+try:
+    import lxml
+except ImportError:
+    lxml = None
+
+BACKENDS = [pytest.param(backend, marks=pytest.mark.skipif(
+    backend == "lxml" and lxml is None, reason="lxml is not installed")) for backend in PARSER_BACKENDS]
+REVIEW_PAGE = "/reviews/29237734"
+
+
+@pytest.fixture(scope="module")
+def sample_reviews():
+    """The reviews the fixture pages were recorded from, rendered as text."""
+    return pd.read_csv(SAMPLE_DATA_PATH)[REVIEW_FIELDS].map(str).to_dict("records")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_parses_every_recorded_review(backend, recorded_pages, sample_reviews):
+    pages, _ = recorded_pages
+
+    assert ReviewPageParser(backend).parse(pages[REVIEW_PAGE]) == sample_reviews
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_limit(backend, recorded_pages, sample_reviews):
+    pages, _ = recorded_pages
+
+    assert ReviewPageParser(backend).parse(pages[REVIEW_PAGE], limit=3) == sample_reviews[:3]
+
+
+def test_backends_agree(recorded_pages):
+    if lxml is None:
+        pytest.skip("lxml is not installed")
+    pages, _ = recorded_pages
+    for path, page in pages.items():
+        assert ReviewPageParser("lxml").parse(page) == ReviewPageParser("html.parser").parse(page), path
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_missing_fields_keep_reviews_aligned(backend):
+    page = (
+        '<div class="detailed-reviews-userReviewsContainer">'
+        '<div class="user-review-userReviewWrapper">'
+        '<div class="user-review-footer"><div class="user-review-left"><span>Asha</span></div></div>'
+        '</div>'
+        '<div class="user-review-userReviewWrapper">'
+        '<span class="user-review-starRating">4</span>'
+        '<div class="user-review-reviewTextWrapper">Nice fit</div>'
+        '<div class="user-review-left"><span>Ravi</span><span>2 Jan 2025</span></div>'
+        '</div></div>'
+    )
+
+    assert ReviewPageParser(backend).parse(page) == [
+        {"Date": NO_DATE, "Rating": NO_RATING, "Name": "Asha", "Comment": NO_COMMENT},
+        {"Date": "2 Jan 2025", "Rating": "4", "Name": "Ravi", "Comment": "Nice fit"},
+    ]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_pages_without_reviews(backend, recorded_pages):
+    _, search_page = recorded_pages
+
+    assert ReviewPageParser(backend).parse(search_page) == []
+    assert ReviewPageParser(backend).parse("") == []
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        ReviewPageParser("html5lib")
@@ -0,0 +1,144 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.data_report.cache import DashboardCache
+from src.data_report.summary import summaries_from_aggregation, summaries_from_frame, summary_pipeline
+
+
+class Compute:
+    """Counts the calls of a computation."""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+def test_cache_reuses_values_while_the_fingerprint_holds():
+    cache = DashboardCache()
+    compute = Compute("summary")
+
+    assert cache.get_or_compute("derma", ("summary",), (3, "id"), compute) == "summary"
+    assert cache.get_or_compute("derma", ("summary",), (3, "id"), compute) == "summary"
+    assert (compute.calls, cache.hits, cache.misses) == (1, 1, 1)
+
+    # New reviews change the fingerprint
+    cache.get_or_compute("derma", ("summary",), (4, "id2"), compute)
+    assert compute.calls == 2
+    assert len(cache) == 1
+
+
+def test_cache_without_fingerprint_always_computes():
+    cache = DashboardCache()
+    compute = Compute("summary")
+
+    cache.get_or_compute("derma", ("summary",), None, compute)
+    cache.get_or_compute("derma", ("summary",), None, compute)
+
+    assert compute.calls == 2
+    assert len(cache) == 0
+
+
+def test_cache_evicts_the_least_recently_used_entry():
+    cache = DashboardCache(max_entries=2)
+    for product in ["derma", "nike"]:
+        cache.get_or_compute(product, ("reviews",), 1, Compute(product))
+    cache.get_or_compute("derma", ("reviews",), 1, Compute("derma"))
+
+    cache.get_or_compute("puma", ("reviews",), 1, Compute("puma"))
+
+    compute = Compute("nike")
+    cache.get_or_compute("nike", ("reviews",), 1, compute)
+    assert compute.calls == 1
+    compute = Compute("puma")
+    cache.get_or_compute("puma", ("reviews",), 1, compute)
+    assert compute.calls == 0
+
+
+def test_invalidate():
+    cache = DashboardCache()
+    for product in ["derma", "nike"]:
+        for key in [("reviews",), ("summary",)]:
+            cache.get_or_compute(product, key, 1, Compute(product))
+
+    cache.invalidate("derma")
+    assert len(cache) == 2
+    compute = Compute("derma")
+    cache.get_or_compute("derma", ("summary",), 1, compute)
+    assert compute.calls == 1
+
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+# Reviews as scraped, with text prices and ratings and an unrated review
+REVIEWS = pd.DataFrame({
+    "Product Name": ["Serum"] * 5 + ["Shirt"] * 2,
+    "Over_All_Rating": ["4.2"] * 5 + ["3.9"] * 2,
+    "Price": ["₹1,299", "₹438", "₹438", "₹438", "₹438", "₹999", "₹999"],
+    "Rating": ["5", "4", "1", "2", None, "5", "3"],
+    "Comment": ["Love it", "Good", "Rash", "Sticky", "No rating", "Great fit", "Okay"],
+})
+
+# What summary_pipeline(top_k=2) returns for REVIEWS
+AGGREGATION = {
+    "products": [
+        {"_id": "Serum", "order": 0, "count": 5, "avg_price": (1299 + 4 * 438) / 5, "avg_rating": 4.2,
+         "positive": [{"Rating": 5.0, "Comment": "Love it"}, {"Rating": 4.0, "Comment": "Good"}],
+         "negative": [{"Rating": 1.0, "Comment": "Rash"}, {"Rating": 2.0, "Comment": "Sticky"}]},
+        {"_id": "Shirt", "order": 5, "count": 2, "avg_price": 999.0, "avg_rating": 3.9,
+         "positive": [{"Rating": 5.0, "Comment": "Great fit"}, {"Rating": 3.0, "Comment": "Okay"}],
+         "negative": [{"Rating": 3.0, "Comment": "Okay"}, {"Rating": 5.0, "Comment": "Great fit"}]},
+    ],
+    "ratings": [{"_id": {"product": product, "rating": rating}, "count": 1}
+                for product, rating in [("Serum", 5.0), ("Serum", 1.0), ("Serum", 4.0), ("Serum", 2.0),
+                                        ("Shirt", 3.0), ("Shirt", 5.0)]],
+}
+
+
+def summary_fields(summaries: list) -> list:
+    return [{**vars(summary), "avg_price": pytest.approx(summary.avg_price),
+             "avg_rating": pytest.approx(summary.avg_rating)} for summary in summaries]
+
+
+def test_frame_and_aggregation_summaries_match():
+    from_frame = summaries_from_frame(REVIEWS, top_k=2)
+
+    assert summary_fields(summaries_from_aggregation(AGGREGATION)) == summary_fields(from_frame)
+    serum = from_frame[0]
+    assert (serum.product_name, serum.review_count) == ("Serum", 5)
+    assert list(serum.rating_counts.items()) == [(5, 1), (4, 1), (2, 1), (1, 1)]
+    assert serum.positive_reviews == [{"Rating": 5, "Comment": "Love it"}]
+    assert serum.negative_reviews == [{"Rating": 1, "Comment": "Rash"}, {"Rating": 2, "Comment": "Sticky"}]
+    assert from_frame[1].negative_reviews == []
+
+
+def test_summary_pipeline_filters_first():
+    pipeline = summary_pipeline({"Rating": {"$gte": 4}}, top_k=3)
+
+    assert pipeline[0] == {"$match": {"Rating": {"$gte": 4}}}
+    group = pipeline[-1]["$facet"]["products"][0]["$group"]
+    assert group["positive"]["$topN"]["n"] == group["negative"]["$topN"]["n"] == 3
+    assert "$match" not in summary_pipeline()[0]
+
+
+@pytest.mark.skipif(not os.getenv("MONGO_TEST_URL"), reason="needs a MongoDB 5.2+ server in MONGO_TEST_URL")
+def test_summary_pipeline_matches_the_frame_on_mongodb():
+    from pymongo import MongoClient
+
+    client = MongoClient(os.environ["MONGO_TEST_URL"])
+    collection = client["myntra-reviews-test"]["summary_parity"]
+    collection.drop()
+    collection.insert_many(REVIEWS.astype(object).where(REVIEWS.notna(), None).to_dict("records"))
+    try:
+        result, = collection.aggregate(summary_pipeline(top_k=2))
+        assert summary_fields(summaries_from_aggregation(result)) == \
+            summary_fields(summaries_from_frame(REVIEWS, top_k=2))
+    finally:
+        collection.drop()
+        client.close()
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from src.constants import REVIEW_KEY_COLUMN
+from src.review_schema import (add_review_keys, normalize_reviews, parse_numbers, parse_review_dates,
+                               review_key, to_records)
+
+
+def test_parse_review_dates():
+    dates = pd.Series(["21 Mar 2025", "7 Sept 2024", "22 July 2025", "1 June 2024",
+                       "2025-03-21", "2024-09-07 00:00:00", "yesterday", None])
+
+    parsed = parse_review_dates(dates)
+
+    assert parsed.tolist()[:6] == [pd.Timestamp(2025, 3, 21), pd.Timestamp(2024, 9, 7),
+                                   pd.Timestamp(2025, 7, 22), pd.Timestamp(2024, 6, 1),
+                                   pd.Timestamp(2025, 3, 21), pd.Timestamp(2024, 9, 7)]
+    assert parsed.iloc[6:].isna().all()
+
+
+def test_parsed_dates_pass_through():
+    dates = pd.Series(pd.to_datetime(["2025-03-21"]))
+
+    assert parse_review_dates(dates) is dates
+
+
+def test_parse_numbers():
+    numbers = parse_numbers(pd.Series(["₹1,299", " 4.4 ", "438", "", "N/A", None]))
+
+    assert numbers.dtype == "float32"
+    assert numbers.iloc[:3].tolist() == [1299.0, np.float32(4.4), 438.0]
+    assert numbers.iloc[3:].isna().all()
+    assert parse_numbers(pd.Series([5, 4])).dtype == "float32"
+
+
+def test_normalize_reviews():
+    reviews = pd.DataFrame({"Product Name": ["Serum", "Serum"], "Price": ["₹438", "bad price"],
+                            "Rating": ["5", None], "Date": ["7 Sept 2024", "someday"],
+                            "Name": ["Asha", "Ravi"]})
+
+    normalized = normalize_reviews(reviews)
+
+    assert normalized[["Product Name", "Price", "Rating"]].dtypes.astype(str).tolist() == [
+        "category", "float32", "float32"]
+    assert pd.api.types.is_datetime64_any_dtype(normalized["Date"])
+    assert normalized["Name"].dtype == reviews["Name"].dtype
+    assert normalized["Price"].isna().tolist() == [False, True]
+    assert normalized["Date"].isna().tolist() == [False, True]
+    # The input is left as it is, and normalizing twice changes nothing
+    assert reviews["Price"].tolist() == ["₹438", "bad price"]
+    pd.testing.assert_frame_equal(normalize_reviews(normalized), normalized)
+
+
+def test_review_keys_use_the_dates_as_scraped():
+    reviews = pd.DataFrame({"Product Name": ["Serum"], "Date": ["7 Sept 2024"], "Name": ["Asha"],
+                            "Comment": ["Good"]})
+
+    keyed = normalize_reviews(add_review_keys(reviews))
+
+    assert keyed[REVIEW_KEY_COLUMN].iloc[0] == review_key("Serum", "7 Sept 2024", "Asha", "Good")
+    # Keys are kept once computed, parsed dates would give another one
+    assert add_review_keys(keyed)[REVIEW_KEY_COLUMN].iloc[0] == keyed[REVIEW_KEY_COLUMN].iloc[0]
+    assert review_key("Serum", keyed["Date"].iloc[0], "Asha", "Good") != keyed[REVIEW_KEY_COLUMN].iloc[0]
+
+
+def test_to_records():
+    reviews = normalize_reviews(pd.DataFrame({"Rating": ["4.4", None], "Date": ["7 Sept 2024", None]}))
+
+    assert to_records(reviews) == [{"Rating": 4.4, "Date": pd.Timestamp(2024, 9, 7)},
+                                   {"Rating": None, "Date": None}]
@@ -0,0 +1,195 @@
+import threading
+import time
+
+from src.constants import REVIEW_CARD_CLASS
+from src.scrapper import browser
+from src.scrapper.browser import BrowserPool
+from src.scrapper.cache import PageCache
+from src.scrapper.scrape import ScrapeReviews
+
+BASE_URL = "http://fixtures.test/"
+REVIEWS_PER_PRODUCT = 5
+
+
+def scrape(pool: BrowserPool, max_workers: int, no_of_products: int = 4):
+    scraper = ScrapeReviews(product_name="derma co", no_of_products=no_of_products,
+                            max_workers=max_workers, base_url=BASE_URL,
+                            max_reviews_per_product=REVIEWS_PER_PRODUCT,
+                            browser_pool=pool, use_cache=False)
+    return scraper.get_review_data()
+
+
+def test_concurrent_scrape_matches_sequential(fake_pool):
+    sequential = scrape(fake_pool, max_workers=1)
+    concurrent = scrape(fake_pool, max_workers=4)
+
+    assert len(concurrent) == 4 * REVIEWS_PER_PRODUCT
+    # Products come back in search order whatever order the workers finish in
+    assert (concurrent["Product Name"].astype(str).tolist()
+            == sequential["Product Name"].astype(str).tolist())
+    assert concurrent["Comment"].tolist() == sequential["Comment"].tolist()
+
+
+def test_concurrent_scrape_stays_within_the_pool(fake_pool):
+    data = scrape(fake_pool, max_workers=4)
+
+    assert data["Product Name"].nunique() == 4
+    assert len(fake_pool.drivers) <= fake_pool.size
+    # Every product and review page was loaded once, each on a pooled browser
+    visited = [path for driver in fake_pool.drivers for path in driver.visited]
+    assert sum(path.startswith("/reviews/") for path in visited) == 4
+    assert fake_pool.stats()["running"] == len(fake_pool.drivers)
+    assert not any(driver.quit_called for driver in fake_pool.drivers)
+
+
+def test_concurrent_scrape_stops_at_the_requested_products(fake_pool):
+    data = scrape(fake_pool, max_workers=2, no_of_products=3)
+
+    assert data["Product Name"].nunique() == 3
+    assert len(data) == 3 * REVIEWS_PER_PRODUCT
+
+
+def test_closed_pool_wakes_waiting_checkouts(fake_pool):
+    drivers = [fake_pool.checkout() for _ in range(fake_pool.size)]
+    errors = []
+
+    def wait_for_driver():
+        try:
+            fake_pool.checkout()
+        except RuntimeError as e:
+            errors.append(e)
+
+    waiters = [threading.Thread(target=wait_for_driver) for _ in range(3)]
+    for waiter in waiters:
+        waiter.start()
+    while fake_pool._waiting < len(waiters):
+        threading.Event().wait(0.01)
+    fake_pool.close()
+    for waiter in waiters:
+        waiter.join(timeout=5)
+
+    assert len(errors) == len(waiters)
+    # Checked out browsers are only quit once they are handed back
+    assert not any(driver.quit_called for driver in drivers)
+    for driver in drivers:
+        fake_pool.release(driver)
+    assert all(driver.quit_called for driver in drivers)
+
+
+def test_shared_pool_grows_to_the_requested_workers(fake_pool, monkeypatch):
+    monkeypatch.setattr(browser, "_shared_pool", None)
+
+    pool = browser.get_browser_pool(2)
+    assert pool.size == 2
+    assert browser.get_browser_pool(1) is pool and pool.size == 2
+    assert browser.get_browser_pool(4).size == 4
+    # Never past BROWSER_POOL_SIZE
+    assert browser.get_browser_pool(browser.BROWSER_POOL_SIZE + 1).size == browser.BROWSER_POOL_SIZE
+    browser.close_browser_pool()
+    assert browser.get_browser_pool(1) is not pool
+    browser.close_browser_pool()
+
+
+def test_growing_wakes_waiting_checkouts(fake_pool):
+    pool = BrowserPool(size=1)
+    pool.checkout()
+    checked_out = []
+    waiter = threading.Thread(target=lambda: checked_out.append(pool.checkout()))
+    waiter.start()
+    waiter.join(timeout=0.2)
+    assert waiter.is_alive()
+
+    pool.grow(2)
+    waiter.join(timeout=5)
+    assert not waiter.is_alive()
+    assert pool.stats()["running"] == 2
+    pool.close()
+
+
+def test_warm_starts_browsers_ahead(fake_pool):
+    fake_pool.warm()
+
+    assert fake_pool.stats() == {"running": 2, "started": 2, "recycled": 0}
+    # Scrapes take the warm browsers instead of starting new ones
+    scrape(fake_pool, max_workers=2)
+    assert fake_pool.started == 2
+
+
+def test_incremental_scrapes_skip_cached_review_lists(fake_pool, tmp_path):
+    cache = PageCache(str(tmp_path))
+    scraper = ScrapeReviews(product_name="derma co", no_of_products=1, base_url=BASE_URL,
+                            max_reviews_per_product=REVIEWS_PER_PRODUCT, browser_pool=fake_pool,
+                            page_cache=cache, known_review_keys={"stored-review"})
+    url = BASE_URL + "reviews/29237734"
+    cache.put(f"{url}#max_reviews={REVIEWS_PER_PRODUCT}", "reviews", "<html>older reviews</html>")
+
+    page = scraper.load_page(url, "reviews", ready_marker=REVIEW_CARD_CLASS, scroll=True)
+
+    assert page == fake_pool.drivers[0].page_source
+    # Nor is their partly loaded list cached for full scrapes
+    assert cache.get(f"{url}#max_reviews={REVIEWS_PER_PRODUCT}", "reviews") == "<html>older reviews</html>"
+    scraper.close()
+    cache.close()
+
+
+class ScrollingDriver:
+    """A review list loading ``step`` more cards ``delay`` seconds after each scroll, up to ``total``."""
+
+    def __init__(self, step: int, delay: float, total: int = None):
+        self.step = step
+        self.delay = delay
+        self.total = total
+        self.loaded = step
+        self.scrolls = 0
+        self._loads_at = None
+
+    def set_window_size(self, width: int, height: int):
+        pass
+
+    def execute_script(self, script: str, *args):
+        now = time.monotonic()
+        if self._loads_at is not None and now >= self._loads_at:
+            self._loads_at = None
+            self.loaded += self.step
+            if self.total is not None:
+                self.loaded = min(self.loaded, self.total)
+        if "scrollTo" in script:
+            self.scrolls += 1
+            if self._loads_at is None:
+                self._loads_at = now + self.delay
+            return None
+        return self.loaded
+
+
+def scroll(driver: ScrollingDriver, **limits) -> tuple:
+    scraper = ScrapeReviews(product_name="derma co", no_of_products=1, driver=driver)
+    started = time.monotonic()
+    loaded = scraper.scroll_to_load_reviews(poll_interval=0.01, **limits)
+    return loaded, time.monotonic() - started, scraper.review_load_steps
+
+
+def test_scrolling_stops_once_no_reviews_arrive():
+    loaded, seconds, steps = scroll(ScrollingDriver(step=10, delay=0.01, total=35),
+                                    idle_timeout=0.2, max_seconds=10)
+
+    assert loaded == 35
+    assert steps == [10, 10, 5]
+    # Only the last step waited for the idle timeout
+    assert 0.2 <= seconds < 1
+
+
+def test_scrolling_stops_at_the_total_timeout():
+    # Reviews keep coming, every step well within the idle timeout
+    loaded, seconds, steps = scroll(ScrollingDriver(step=10, delay=0.05),
+                                    idle_timeout=1, max_seconds=0.3)
+
+    assert 0.3 <= seconds < 0.6
+    assert loaded == 10 + sum(steps) and len(steps) >= 3
+
+
+def test_scrolling_stops_at_max_reviews():
+    driver = ScrollingDriver(step=10, delay=0.01)
+
+    loaded, _, steps = scroll(driver, max_reviews=25, idle_timeout=1, max_seconds=10)
+
+    assert (loaded, steps, driver.scrolls) == (30, [10, 10], 2)
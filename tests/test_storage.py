@@ -0,0 +1,163 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from benchmarks.fixture_site import SAMPLE_DATA_PATH
+from src.constants import REVIEW_KEY_COLUMN
+from src.review_schema import add_review_keys, normalize_reviews
+from src.storage import create_review_store
+from src.storage.base import CSV_MIGRATION_MARKER, ReviewStore
+from src.storage.parquet import ParquetReviewStore
+from src.storage.sqlite import SQLiteReviewStore
+
+
+@pytest.fixture(params=[ParquetReviewStore, SQLiteReviewStore], ids=["parquet", "sqlite"])
+def store(request, tmp_path):
+    store = request.param(root=str(tmp_path / "store"))
+    yield store
+    store.close()
+
+
+@pytest.fixture(scope="module")
+def reviews():
+    return normalize_reviews(add_review_keys(pd.read_csv(SAMPLE_DATA_PATH)))
+
+
+def read(store: ReviewStore, collection_name: str = "derma", **filters) -> pd.DataFrame:
+    batches = list(store.iter_reviews(collection_name, **filters))
+    if not batches:
+        return pd.DataFrame()
+    stored = pd.concat(batches, ignore_index=True)
+    if REVIEW_KEY_COLUMN not in stored:
+        return stored
+    return stored.sort_values(REVIEW_KEY_COLUMN, ignore_index=True)
+
+
+def test_round_trip(store, reviews):
+    assert store.write("derma", reviews) == len(reviews)
+
+    stored = read(store)
+    expected = reviews.sort_values(REVIEW_KEY_COLUMN, ignore_index=True)
+    assert store.exists("derma")
+    assert store.list_collections() == ["derma"]
+    assert len(stored) == len(reviews)
+    for column in ["Name", "Comment", REVIEW_KEY_COLUMN]:
+        assert stored[column].astype(object).tolist() == expected[column].astype(object).tolist()
+    assert stored["Rating"].tolist() == expected["Rating"].tolist()
+    assert (pd.to_datetime(stored["Date"]) == expected["Date"]).all()
+
+
+def test_missing_collection(store):
+    assert not store.exists("missing")
+    assert store.fingerprint("missing") is None
+    assert read(store, "missing").empty
+
+
+def test_columns_limit_and_filters(store, reviews):
+    store.write("derma", reviews)
+
+    stored = read(store, columns=["Rating", "Unknown"], limit=10)
+    assert list(stored.columns) == ["Rating"]
+    assert len(stored) == 10
+    assert len(read(store, min_rating=4)) == (reviews["Rating"] >= 4).sum()
+    assert len(read(store, max_rating=2)) == (reviews["Rating"] <= 2).sum()
+    since = reviews["Date"].sort_values().iloc[len(reviews) // 2]
+    assert len(read(store, date_from=since)) == (reviews["Date"] >= since).sum()
+
+
+def test_replace_append_and_incremental(store, reviews):
+    first, rest = reviews.iloc[:40], reviews.iloc[40:]
+    store.write("derma", reviews)
+    store.write("derma", first)
+    assert len(read(store)) == len(first)
+
+    store.write("derma", rest, append=True)
+    assert len(read(store)) == len(reviews)
+
+    # Only the reviews that are not stored yet are added
+    assert store.write("derma", reviews, incremental=True) == 0
+    assert len(read(store)) == len(reviews)
+    assert store.known_keys("derma") == set(reviews[REVIEW_KEY_COLUMN])
+
+
+def test_fingerprint_changes_on_write(store, reviews):
+    store.write("derma", reviews.iloc[:10])
+    before = store.fingerprint("derma")
+    store.write("derma", reviews.iloc[10:20], append=True)
+
+    assert store.fingerprint("derma") != before
+
+
+def test_sqlite_upserts_by_review_key(tmp_path, reviews):
+    store = SQLiteReviewStore(root=str(tmp_path))
+    store.write("derma", reviews)
+    rerated = reviews.iloc[:5].assign(Rating=1.0)
+
+    assert store.write("derma", rerated, append=True) == len(rerated)
+    stored = read(store)
+    assert len(stored) == len(reviews)
+    assert (stored.set_index(REVIEW_KEY_COLUMN).loc[rerated[REVIEW_KEY_COLUMN], "Rating"] == 1).all()
+    store.close()
+
+
+def test_rating_counts_and_summaries(store, reviews):
+    store.write("derma", reviews)
+
+    count, ratings = store.rating_counts("derma")
+    assert count == len(reviews)
+    assert ratings == {float(rating): int(n) for rating, n in reviews["Rating"].value_counts().items()}
+    summary, = store.summaries("derma")
+    assert summary.review_count == len(reviews)
+
+
+def test_csv_migration_runs_once(tmp_path, reviews):
+    root = tmp_path / "store"
+    root.mkdir()
+    pd.read_csv(SAMPLE_DATA_PATH).to_csv(root / "derma.csv", index=False)
+    store = create_review_store("parquet", root=str(root))
+
+    store.migrate_csv()
+    assert len(read(store)) == len(reviews)
+    assert (root / "derma.csv.migrated").exists()
+    assert (root / CSV_MIGRATION_MARKER).exists()
+
+    # Later backups are left alone once the store was migrated
+    pd.read_csv(SAMPLE_DATA_PATH).to_csv(root / "other.csv", index=False)
+    store.migrate_csv()
+    assert not store.exists("other")
+
+
+def test_review_store_is_abstract():
+    with pytest.raises(TypeError):
+        ReviewStore()
+
+
+def test_parquet_writer_does_not_wait_for_readers(tmp_path, reviews):
+    store = ParquetReviewStore(root=str(tmp_path))
+    store.write("derma", reviews)
+    batches = store.iter_reviews("derma", batch_size=10)
+    next(batches)
+
+    # A replacing write removes the partitions being read
+    writer = threading.Thread(target=store.write, args=("derma", reviews.iloc[:10]))
+    writer.start()
+    writer.join(timeout=5)
+    assert not writer.is_alive()
+
+    # The reader goes on with the reviews it opened
+    assert sum(len(batch) for batch in batches) == len(reviews) - 10
+    assert len(read(store)) == 10
+
+
+def test_parquet_writes_lock_their_collection_only(tmp_path, reviews):
+    store = ParquetReviewStore(root=str(tmp_path))
+    other = ParquetReviewStore(root=str(tmp_path))
+    assert store._write_lock("derma") is other._write_lock("derma")
+
+    with store._write_lock("derma"):
+        writer = threading.Thread(target=store.write, args=("nike", reviews))
+        writer.start()
+        writer.join(timeout=5)
+        assert not writer.is_alive()
+    assert len(read(store, "nike")) == len(reviews)
@@ -0,0 +1,134 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+import src.telemetry.metrics
+from src.constants import METRICS_SPAN_BUCKETS
+from src.telemetry import MetricsRegistry, MetricsServer
+from src.telemetry.metrics import SPAN_ERRORS_METRIC, SPAN_METRIC, timed
+
+
+def read_log(path) -> list:
+    with open(path) as log:
+        return [json.loads(line) for line in log]
+
+
+def test_counters_add_up_per_label():
+    metrics = MetricsRegistry(prefix="test")
+    metrics.inc("pages_total", page_type="reviews", source="site")
+    metrics.inc("pages_total", 2, source="site", page_type="reviews")
+    metrics.inc("pages_total", page_type="search", source="cache")
+
+    assert metrics.snapshot()["counters"] == {"pages_total": 4}
+    assert metrics.to_prometheus() == (
+        "# TYPE test_pages_total counter\n"
+        'test_pages_total{page_type="reviews",source="site"} 3\n'
+        'test_pages_total{page_type="search",source="cache"} 1\n'
+    )
+
+
+def test_histograms_in_prometheus_format():
+    metrics = MetricsRegistry(prefix="test")
+    metrics.observe("stage_seconds", 0.07, stage="parse")
+    metrics.observe("stage_seconds", 3.0, stage="parse")
+
+    lines = metrics.to_prometheus().splitlines()
+
+    assert lines[0] == "# TYPE test_stage_seconds histogram"
+    buckets = {line.split("le=")[1].split("}")[0].strip('"'): int(line.split()[-1])
+               for line in lines if "_bucket" in line}
+    assert list(buckets) == [str(bound) for bound in METRICS_SPAN_BUCKETS] + ["+Inf"]
+    # Buckets count every value up to their bound
+    assert (buckets["0.05"], buckets["0.1"], buckets["2.5"], buckets["5.0"], buckets["+Inf"]) == (0, 1, 1, 2, 2)
+    assert 'test_stage_seconds_bucket{stage="parse",le="0.1"} 1' in lines
+    assert lines[-2:] == ['test_stage_seconds_sum{stage="parse"} 3.07',
+                          'test_stage_seconds_count{stage="parse"} 2']
+
+
+def test_label_values_are_escaped():
+    metrics = MetricsRegistry(prefix="test")
+    metrics.inc("errors_total", error='Bad "quote"\\\n')
+
+    assert metrics.to_prometheus().splitlines()[1] == 'test_errors_total{error="Bad \\"quote\\"\\\\\\n"} 1'
+
+
+def test_spans_are_timed_and_logged(tmp_path):
+    metrics = MetricsRegistry(log_path=str(tmp_path / "metrics.jsonl"))
+    with metrics.span("parse_reviews", backend="lxml") as fields:
+        fields["reviews"] = 10
+    with pytest.raises(ValueError):
+        with metrics.span("parse_reviews", backend="lxml"):
+            raise ValueError("bad page")
+
+    assert metrics.snapshot()["stages"]["parse_reviews"]["count"] == 2
+    assert metrics.snapshot()["counters"] == {SPAN_ERRORS_METRIC: 1}
+    ok, error = read_log(tmp_path / "metrics.jsonl")
+    assert (ok["span"], ok["status"], ok["backend"], ok["reviews"]) == ("parse_reviews", "ok", "lxml", 10)
+    assert (error["status"], error["error"]) == ("error", "ValueError")
+    assert ok["seconds"] >= 0
+
+
+def test_since_reports_the_difference():
+    metrics = MetricsRegistry()
+    metrics.inc("pages_total")
+    metrics.observe(SPAN_METRIC, 1.0, stage="scroll")
+    earlier = metrics.snapshot()
+    metrics.inc("pages_total", 2)
+    metrics.observe(SPAN_METRIC, 0.5, stage="parse")
+
+    assert metrics.since(earlier) == {"counters": {"pages_total": 2},
+                                      "stages": {"parse": {"count": 1, "seconds": 0.5}}}
+
+
+def test_timed_records_into_the_process_registry():
+    @timed("test_timed_stage")
+    def work():
+        return "done"
+
+    metrics = src.telemetry.metrics.get_metrics()
+    before = metrics.snapshot()["stages"].get("test_timed_stage", {"count": 0})["count"]
+    assert work() == "done"
+    assert metrics.snapshot()["stages"]["test_timed_stage"]["count"] == before + 1
+
+
+def test_log_is_rotated(tmp_path, monkeypatch):
+    monkeypatch.setattr(src.telemetry.metrics, "METRICS_LOG_MAX_BYTES", 200)
+    path = tmp_path / "metrics.jsonl"
+    metrics = MetricsRegistry(log_path=str(path))
+
+    for _ in range(5):
+        with metrics.span("fetch_page", page_type="reviews"):
+            pass
+
+    rotated = read_log(str(path) + ".1")
+    current = read_log(path)
+    assert len(rotated) + len(current) <= 5 and current
+    assert path.stat().st_size <= 200 + len(json.dumps(current[-1])) + 1
+
+
+def test_unwritable_log_stops_logging(tmp_path):
+    (tmp_path / "file").write_text("")
+    metrics = MetricsRegistry(log_path=str(tmp_path / "file" / "metrics.jsonl"))
+
+    with metrics.span("fetch_page"):
+        pass
+
+    assert metrics.log_path is None
+    assert metrics.snapshot()["stages"]["fetch_page"]["count"] == 1
+
+
+def test_server_exposes_the_registry():
+    metrics = MetricsRegistry(prefix="test")
+    metrics.inc("pages_total", source="site")
+    server = MetricsServer(0, host="127.0.0.1", registry=metrics)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert response.read().decode("utf-8") == metrics.to_prometheus()
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"http://127.0.0.1:{server.port}/other", timeout=5)
+        assert error.value.code == 404
+    finally:
+        server.close()
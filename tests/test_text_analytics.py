@@ -0,0 +1,114 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.constants import NO_COMMENT, SENTIMENT_COLUMN
+from src.text_analytics import add_sentiment, analyze_reviews, sentiment_labels, sentiment_scores
+
+
+def squashed(total: float) -> float:
+    """The score of a comment whose word weights add up to ``total``."""
+    return total / math.sqrt(total ** 2 + 15)
+
+
+@pytest.mark.parametrize("comment, total", [
+    ("Good", 2),
+    ("good, GOOD", 4),
+    ("Not good", -1.5),
+    ("very good", 3),
+    ("not very good", -2.25),
+    ("Don't like it", -0.75),
+    ("Good but the delivery was late", 0.5),
+    ("The box arrived on Monday", 0),
+    ("", 0),
+])
+def test_sentiment_scores(comment, total):
+    assert sentiment_scores(pd.Series([comment]))[0] == pytest.approx(squashed(total), abs=1e-6)
+
+
+def test_missing_comments_have_no_score():
+    scores = sentiment_scores(pd.Series(["Good", None, NO_COMMENT, "Good"], index=[5, 6, 7, 8]))
+
+    assert scores.index.tolist() == [5, 6, 7, 8]
+    assert scores.dtype == "float32" and scores.name == SENTIMENT_COLUMN
+    assert scores.isna().tolist() == [False, True, True, False]
+    assert scores[5] == scores[8]
+
+
+def test_sentiment_labels():
+    labels = sentiment_labels(pd.Series([-0.5, 0.0, 0.05, 0.5, np.nan]))
+
+    assert labels.tolist()[:4] == ["negative", "neutral", "neutral", "positive"]
+    assert pd.isna(labels.iloc[4])
+
+
+def test_add_sentiment_keeps_stored_scores():
+    reviews = pd.DataFrame({"Comment": ["Good", "Not good", None],
+                            SENTIMENT_COLUMN: [0.9, np.nan, np.nan]})
+
+    scored = add_sentiment(reviews)
+
+    assert scored[SENTIMENT_COLUMN].dtype == "float32"
+    assert scored[SENTIMENT_COLUMN].iloc[0] == pytest.approx(0.9)
+    assert scored[SENTIMENT_COLUMN].iloc[1] == pytest.approx(squashed(-1.5))
+    assert pd.isna(scored[SENTIMENT_COLUMN].iloc[2])
+    assert reviews[SENTIMENT_COLUMN].isna().tolist() == [False, True, True]
+    assert add_sentiment(pd.DataFrame({"Rating": [5]})).columns.tolist() == ["Rating"]
+
+
+@pytest.fixture
+def insights():
+    reviews = pd.DataFrame({
+        "Product Name": ["Shirt"] * 4 + ["Serum"] * 3,
+        "Comment": ["Soft fabric"] * 3 + ["Great fit"] + ["Fast delivery"] * 2 + [NO_COMMENT],
+    })
+    return analyze_reviews(reviews, top_k=10, min_reviews=2)
+
+
+def test_sentiment_per_product(insights):
+    sentiment = insights.sentiment.set_index("Product Name")
+
+    assert sentiment["Reviews"].to_dict() == {"Shirt": 4, "Serum": 2}
+    assert sentiment.loc["Shirt", "Sentiment"] == pytest.approx((3 * squashed(1.5) + squashed(3)) / 4, abs=1e-6)
+    assert sentiment.loc["Serum", "Sentiment"] == pytest.approx(squashed(1.5), abs=1e-6)
+    assert sentiment[["Negative", "Neutral", "Positive"]].to_numpy().tolist() == [[0, 0, 1], [0, 0, 1]]
+
+
+def test_keywords(insights):
+    keywords = {(row["Product Name"], row["Keyword"]): (row["Reviews"], row["Score"])
+                for _, row in insights.keywords.iterrows()}
+
+    # Words and phrases of fewer than min_reviews reviews are left out
+    assert sorted(keywords) == [("Serum", "delivery"), ("Serum", "fast"), ("Serum", "fast delivery"),
+                                ("Shirt", "fabric"), ("Shirt", "soft"), ("Shirt", "soft fabric")]
+    # TF-IDF over the 6 reviews with a comment
+    assert keywords[("Shirt", "soft fabric")] == (3, pytest.approx(3 * math.log(7 / 4 + 1)))
+    assert keywords[("Serum", "fast")] == (2, pytest.approx(2 * math.log(7 / 3 + 1)))
+
+
+def test_keywords_skip_stopwords_and_short_words():
+    reviews = pd.DataFrame({"Product Name": "Shirt", "Comment": ["It is ok for the price"] * 2})
+
+    keywords = analyze_reviews(reviews, min_reviews=1).keywords
+
+    assert keywords["Keyword"].tolist() == ["price"]
+
+
+def test_aspects(insights):
+    aspects = {(row["Product Name"], row["Aspect"]): (row["Reviews"], row["Share"])
+               for _, row in insights.aspects.iterrows()}
+
+    assert aspects == {("Serum", "Delivery & packaging"): (2, 1.0),
+                       ("Shirt", "Material"): (3, 0.75),
+                       ("Shirt", "Fit & size"): (1, 0.25)}
+
+
+def test_no_comments():
+    reviews = pd.DataFrame({"Product Name": ["Shirt", "Shirt"], "Comment": [NO_COMMENT, None]})
+
+    insights = analyze_reviews(reviews)
+
+    assert insights.keywords.empty
+    assert insights.aspects.empty